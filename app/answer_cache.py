@@ -0,0 +1,166 @@
+"""
+Semantic Answer Cache
+강의 질문의 최종 답변을 저장하고, 의미가 같은 질문(paraphrase)이 오면 그래프 실행 없이 바로 응답
+
+- 질문 임베딩은 기존 공유 임베더 + 쿼리 임베딩 LRU 사용
+- 강의 색인 버전(manifest fingerprint + 컬렉션 버전)별로 분리 → 자료가 바뀌면 이전 답변은 사용되지 않음
+- 대화 첫 질문이면서 rag_search만 사용한 답변만 저장 (시간/계산/개인 메모리 답변은 재사용하면 안 됨)
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
+from app.settings import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_TOOLS,
+)
+
+
+def lecture_index_scope() -> str:
+    """현재 강의 색인 버전 (캐시 항목의 유효 범위)"""
+    from app.resources import get_collection_version
+    from app.rag.manifest import get_index_manifest
+    from app.rag.store import COLLECTION_NAME
+
+    return f"{get_index_manifest().fingerprint()}:{get_collection_version(COLLECTION_NAME)}"
+
+
+def first_turn_question(messages: List) -> Optional[str]:
+    """대화의 첫 질문이면 질문 텍스트 반환 (이전 대화에 의존하는 질문은 캐시하지 않음)"""
+    human_messages = [m for m in messages if isinstance(m, HumanMessage)]
+    if len(human_messages) != 1 or not isinstance(human_messages[0].content, str):
+        return None
+    return human_messages[0].content.strip() or None
+
+
+class SemanticAnswerCache:
+    """질문 임베딩 → 최종 답변 캐시 (코사인 유사도 threshold 이상이면 hit)"""
+
+    def __init__(self, threshold: float = ANSWER_CACHE_THRESHOLD, max_entries: int = ANSWER_CACHE_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # question → {"scope", "vector", "answer", "latency_ms"}
+        self._entries: OrderedDict = OrderedDict()
+        self.stats = {"lookups": 0, "hits": 0, "latency_saved_ms": 0.0}
+
+    def _embed(self, question: str) -> np.ndarray:
+        from app.query_cache import encode_query
+        from app.resources import get_embedder
+
+        vector = np.asarray(encode_query(get_embedder(), question), dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._entries
+
+    def lookup(self, question: str) -> Optional[Dict]:
+        """
+        의미가 같은 이전 질문의 답변 조회
+
+        Returns:
+            {"answer", "similarity", "matched_question", "latency_ms"} 또는 None
+        """
+        # 비교할 항목이 없으면 질문 임베딩(모델 forward pass)을 계산하지 않음
+        with self._lock:
+            self.stats["lookups"] += 1
+            if not self._entries:
+                return None
+        scope = lecture_index_scope()
+        with self._lock:
+            if not any(e["scope"] == scope for e in self._entries.values()):
+                return None
+
+        vector = self._embed(question)
+
+        with self._lock:
+            candidates = [(q, e) for q, e in self._entries.items() if e["scope"] == scope]
+            if not candidates:
+                return None
+
+            similarities = np.stack([e["vector"] for _, e in candidates]) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            matched_question, entry = candidates[best]
+            self._entries.move_to_end(matched_question)
+            self.stats["hits"] += 1
+            self.stats["latency_saved_ms"] += entry["latency_ms"]
+
+        return {
+            "answer": entry["answer"],
+            "similarity": float(similarities[best]),
+            "matched_question": matched_question,
+            "latency_ms": entry["latency_ms"],
+        }
+
+    def store(self, question: str, answer: str, latency_ms: float):
+        """답변 저장 (가장 오래 사용되지 않은 항목부터 제거)"""
+        scope = lecture_index_scope()
+        vector = self._embed(question)
+        with self._lock:
+            self._entries[question] = {
+                "scope": scope,
+                "vector": vector,
+                "answer": answer,
+                "latency_ms": latency_ms,
+            }
+            self._entries.move_to_end(question)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def store_from_messages(self, messages: List, latency_ms: float) -> bool:
+        """
+        완료된 대화에서 캐시 가능한 답변이면 저장
+        조건: 첫 질문 + 최종 답변 존재 + 사용한 Tool이 ANSWER_CACHE_TOOLS뿐이고 하나 이상 사용
+        """
+        question = first_turn_question(messages)
+        final = messages[-1] if messages else None
+        if question is None or not isinstance(final, AIMessage) or final.tool_calls or not final.content:
+            return False
+
+        used_tools = {
+            tool_call["name"]
+            for m in messages if isinstance(m, AIMessage)
+            for tool_call in m.tool_calls or []
+        }
+        if not used_tools or not used_tools <= set(ANSWER_CACHE_TOOLS):
+            return False
+
+        self.store(question, final.content, latency_ms)
+        return True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["lookups"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[SemanticAnswerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """공유 답변 캐시 (ANSWER_CACHE_ENABLED가 아니면 None)"""
+    global _cache
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticAnswerCache()
+    return _cache
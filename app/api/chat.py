@@ -0,0 +1,101 @@
+"""
+Chat API
+Gradio 없이 컴파일된 그래프를 직접 실행하는 SSE 스트리밍 채팅 엔드포인트 (LMS 연동 / 로드밸런서용)
+
+POST /v1/chat  {"message": str, "session_id": str | null, "reset": bool}
+
+SSE 이벤트:
+- session      {"session_id"}                  첫 이벤트 (session_id를 생략했으면 새로 발급)
+- token        {"content"}                     답변 delta
+- tool_call    {"tools"}                       Tool 실행 시작
+- tool_result  {"tools"}                       Tool 실행 완료
+- done         {"answer"}                      최종 답변 (마지막 LLM 응답, Tool 호출 전 문장 제외)
+- error        {"error"}
+클라이언트 연결이 끊기면 그래프 실행을 취소합니다 (Tool/LLM 대기 중에도 CHAT_DISCONNECT_POLL_SECONDS마다 확인).
+"""
+import asyncio
+import json
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from app.settings import CHAT_DISCONNECT_POLL_SECONDS
+
+router = APIRouter(prefix="/v1", tags=["chat"])
+
+
+class ChatRequest(BaseModel):
+    message: str = Field(..., min_length=1, description="사용자 메시지")
+    session_id: Optional[str] = Field(None, description="대화 세션 ID (없으면 새 세션)")
+    reset: bool = Field(False, description="True이면 세션의 이전 대화를 지우고 시작")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _pump_events(events, queue: asyncio.Queue):
+    """그래프 이벤트를 큐로 전달 (끝나면 None, 실패하면 예외 객체)"""
+    try:
+        async for event in events:
+            await queue.put(event)
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+    finally:
+        # 중단된 경우 그래프 실행(astream)까지 정리
+        await events.aclose()
+
+
+async def _chat_events(request: Request, body: ChatRequest, session_id: str):
+    # 그래프 모듈은 워밍업 단계에서 로드 (라우터 import를 가볍게 유지)
+    from app.graph.runner import stream_agent
+
+    yield _sse("session", {"session_id": session_id})
+
+    # 그래프는 별도 task에서 실행하고, 이벤트가 없는 동안(Tool 실행, LLM 첫 토큰 대기)에도 연결 종료를 확인
+    queue: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.create_task(_pump_events(stream_agent(body.message, session_id, reset=body.reset), queue))
+    answer_parts = []
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=CHAT_DISCONNECT_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    print(f"⚠️ 클라이언트 연결 종료, 실행 취소 (session: {session_id})")
+                    return
+                continue
+
+            if event is None:
+                break
+            if isinstance(event, Exception):
+                raise event
+
+            event_type = event.pop("type")
+            if event_type == "token":
+                answer_parts.append(event["content"])
+            elif event_type == "tool_call":
+                # Tool 호출 전에 스트리밍된 문장은 최종 답변이 아님
+                answer_parts.clear()
+            yield _sse(event_type, event)
+
+        yield _sse("done", {"answer": "".join(answer_parts)})
+    except Exception as e:
+        print(f"❌ 채팅 API 실행 오류: {e}")
+        yield _sse("error", {"error": str(e)})
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+@router.post("/chat")
+async def chat(request: Request, body: ChatRequest):
+    """에이전트 한 턴 실행 (SSE 스트리밍)"""
+    session_id = body.session_id or uuid.uuid4().hex
+    return StreamingResponse(
+        _chat_events(request, body, session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,73 @@
+"""
+Index API
+강의 PDF 업로드 → 백그라운드 색인 작업 등록, 작업 진행 상황 조회
+
+POST /v1/index              multipart "file" (PDF)  → 202 + 작업 상태 (같은 파일이 진행 중이면 기존 작업)
+GET  /v1/index/jobs         보관 중인 작업 목록
+GET  /v1/index/jobs/{id}    작업 상태 (pages_done / pages_total / chunks_done / chunks_embedded / eta_seconds)
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from app.rag.jobs import get_index_job_queue
+from app.settings import INDEX_UPLOAD_DIR
+
+router = APIRouter(prefix="/v1/index", tags=["index"])
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _save_upload(file: UploadFile) -> str:
+    """
+    업로드 파일을 INDEX_UPLOAD_DIR/<내용 해시>/<파일 이름> 에 저장
+    (색인 source는 파일 이름이고, 같은 내용의 재업로드는 같은 경로를 덮어씀)
+    """
+    filename = Path(file.filename or "").name
+    if not filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="PDF 파일만 업로드할 수 있습니다.")
+
+    os.makedirs(INDEX_UPLOAD_DIR, exist_ok=True)
+    tmp_path = os.path.join(INDEX_UPLOAD_DIR, f"{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, "wb") as f:
+            while block := await file.read(UPLOAD_CHUNK_SIZE):
+                digest.update(block)
+                f.write(block)
+
+        target_dir = os.path.join(INDEX_UPLOAD_DIR, digest.hexdigest()[:16])
+        os.makedirs(target_dir, exist_ok=True)
+        target_path = os.path.join(target_dir, filename)
+        os.replace(tmp_path, target_path)
+        return target_path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@router.post("", status_code=202)
+async def submit_index_job(file: UploadFile = File(...), force: bool = False):
+    """PDF 업로드 후 색인 작업 등록 (작업 ID를 바로 반환)"""
+    pdf_path = await _save_upload(file)
+    # 파일 해시 계산은 블로킹 I/O이므로 스레드에서 실행
+    job = await run_in_threadpool(get_index_job_queue().submit, pdf_path, force)
+    return JSONResponse(status_code=202, content=job)
+
+
+@router.get("/jobs")
+async def list_index_jobs():
+    """보관 중인 색인 작업 목록 (최근 작업부터)"""
+    return {"jobs": get_index_job_queue().list_jobs()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_index_job(job_id: str):
+    """색인 작업 상태 / 진행률 / ETA"""
+    job = get_index_job_queue().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="색인 작업을 찾을 수 없습니다.")
+    return job
@@ -0,0 +1,134 @@
+"""
+Micro-batching Embedder
+여러 스레드에서 동시에 들어오는 encode 요청을 모아 한 번의 forward pass로 처리
+
+- 첫 요청이 도착하면 최대 max_wait_ms 동안 (또는 max_batch_size개 텍스트가 찰 때까지) 요청을 모음
+- 모인 텍스트를 한 번에 임베딩한 뒤 요청별 Future에 결과를 나눠 전달
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+import numpy as np
+from app.settings import EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS
+
+_STOP = object()
+
+
+class BatchingEmbedder:
+    """
+    임베딩 모델 앞단의 micro-batching 서비스
+    SharedEmbedder / OnnxEmbedder와 같은 인터페이스(model_name, dimension, encode)를 제공합니다.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS,
+    ):
+        self.embedder = embedder
+        self.model_name = embedder.model_name
+        self.dimension = embedder.dimension
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        # forward pass 횟수 / 처리한 요청 수 (평균 배치 크기 확인용)
+        self.stats = {"batches": 0, "requests": 0, "texts": 0}
+
+        self._queue: queue.Queue = queue.Queue()
+        self._pending = None  # 이전 배치에 들어가지 못한 요청
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        임베딩 요청 (즉시 Future 반환)
+
+        Returns:
+            Future - 결과는 numpy 배열 (len(texts) x dim)
+        """
+        future = Future()
+        if not self._thread.is_alive():
+            future.set_exception(RuntimeError("임베딩 배치 서비스가 종료되었습니다."))
+            return future
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts: List[str], **kwargs):
+        """
+        텍스트 임베딩 (동시 요청과 묶어서 처리)
+        옵션이 있거나 이미 배치 크기 이상인 호출(색인 등)은 모델을 직접 호출
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        if kwargs or len(texts) >= self.max_batch_size:
+            return self.embedder.encode(texts, **kwargs)
+        return self.submit(texts).result()
+
+    def _next_batch(self):
+        """첫 요청을 기다린 뒤 max_wait 동안 max_batch_size까지 요청을 모음"""
+        first = self._pending if self._pending is not None else self._queue.get()
+        self._pending = None
+        if first is _STOP:
+            return None
+
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP or size + len(item[0]) > self.max_batch_size:
+                self._pending = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                embeddings = np.asarray(self.embedder.encode(texts))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, future in batch:
+                future.set_result(embeddings[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(batch)
+            self.stats["texts"] += len(texts)
+
+    def close(self):
+        """배치 스레드 종료 (대기 중인 요청은 처리 후 종료) 및 모델 해제"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+        # 종료 직전에 들어온 요청은 실패 처리
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError("임베딩 배치 서비스가 종료되었습니다."))
+        close = getattr(self.embedder, "close", None)
+        if close:
+            close()
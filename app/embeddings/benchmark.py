@@ -0,0 +1,130 @@
+"""
+Embedding Backend Benchmark
+PyTorch(SentenceTransformer)와 ONNX Runtime(int8) 임베더의 처리량 / 지연 / recall 비교
+
+사용법:
+    python -m app.embeddings.benchmark [PDF|디렉토리|glob ...] [--limit N] [--batch-size N] [--top-k K] [--threads N]
+
+PDF를 지정하지 않으면 현재 색인된 강의 자료 청크를 사용합니다.
+recall@k는 PyTorch 임베딩으로 찾은 top-k 이웃을 정답으로 보고, ONNX 임베딩 검색이 몇 개를 맞혔는지 측정합니다.
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List
+import numpy as np
+from app.settings import EMBEDDING_MODEL, ONNX_INTRA_OP_THREADS
+
+
+def load_corpus(inputs: List[str], limit: int) -> List[str]:
+    """벤치마크용 청크 텍스트 (PDF 또는 색인된 강의 자료)"""
+    if inputs:
+        import PyPDF2
+        from pathlib import Path
+        from app.rag.bulk import resolve_pdf_paths
+        from app.rag.indexer import PDFIndexer
+
+        indexer = PDFIndexer()
+        texts = []
+        for pdf_path in resolve_pdf_paths(inputs):
+            with open(pdf_path, "rb") as file:
+                pages = indexer.iter_pages(PyPDF2.PdfReader(file))
+                texts.extend(doc["content"] for doc in indexer.iter_chunks(pages, Path(pdf_path).name))
+            if len(texts) >= limit:
+                break
+    else:
+        from app.resources import get_collection
+        from app.rag.store import COLLECTION_NAME
+
+        texts = get_collection(COLLECTION_NAME).get(include=["documents"])["documents"]
+
+    return texts[:limit]
+
+
+def measure(embedder, corpus: List[str], queries: List[str], batch_size: int) -> Dict:
+    """배치 처리량과 단건(쿼리) 지연 측정"""
+    embedder.encode(corpus[:batch_size])  # warm-up
+
+    start = time.perf_counter()
+    corpus_vectors = np.asarray(embedder.encode(corpus, batch_size=batch_size), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+
+    latencies = []
+    query_vectors = []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(np.asarray(embedder.encode([query]), dtype=np.float32)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "throughput": len(corpus) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "corpus": corpus_vectors,
+        "queries": np.stack(query_vectors),
+    }
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def _top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    similarities = _normalize(queries) @ _normalize(corpus).T
+    return np.argsort(-similarities, axis=1)[:, :k]
+
+
+def recall_at_k(reference: Dict, candidate: Dict, k: int) -> float:
+    """reference 임베딩 기준 top-k 이웃 중 candidate 임베딩 검색이 찾은 비율"""
+    expected = _top_k(reference["corpus"], reference["queries"], k)
+    found = _top_k(candidate["corpus"], candidate["queries"], k)
+    hits = sum(len(set(e) & set(f)) for e, f in zip(expected, found))
+    return hits / expected.size
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크 (PyTorch vs ONNX int8)")
+    parser.add_argument("inputs", nargs="*", help="PDF 파일 / 디렉토리 / glob (생략 시 색인된 강의 자료)")
+    parser.add_argument("--limit", type=int, default=1000, help="사용할 최대 청크 수")
+    parser.add_argument("--queries", type=int, default=100, help="지연/recall 측정용 쿼리 수")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=ONNX_INTRA_OP_THREADS, help="ONNX intra-op 스레드 수")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.inputs, args.limit)
+    if len(corpus) <= args.top_k:
+        print("❌ 벤치마크할 청크가 부족합니다. PDF를 지정하거나 먼저 강의 자료를 색인하세요.")
+        return 1
+
+    # 쿼리: 청크 앞부분 (실제 질문처럼 짧은 텍스트)
+    step = max(1, len(corpus) // args.queries)
+    queries = [text[:80] for text in corpus[::step][:args.queries]]
+    print(f"📚 청크 {len(corpus)}개, 쿼리 {len(queries)}개 ({EMBEDDING_MODEL})")
+
+    from app.resources import SharedEmbedder
+    from app.embeddings.onnx_backend import OnnxEmbedder
+
+    results = {}
+    for name, factory in (
+        ("torch", lambda: SharedEmbedder(EMBEDDING_MODEL)),
+        ("onnx-fp32", lambda: OnnxEmbedder(EMBEDDING_MODEL, quantize=False, intra_op_threads=args.threads)),
+        ("onnx-int8", lambda: OnnxEmbedder(EMBEDDING_MODEL, quantize=True, intra_op_threads=args.threads)),
+    ):
+        print(f"⏱️  {name} 측정 중...")
+        results[name] = measure(factory(), corpus, queries, args.batch_size)
+
+    reference = results["torch"]
+    print(f"\n{'backend':<10} {'texts/s':>9} {'p50 ms':>8} {'p95 ms':>8} {f'recall@{args.top_k}':>10} {'cos(torch)':>11}")
+    for name, result in results.items():
+        recall = recall_at_k(reference, result, args.top_k)
+        cosine = float(np.mean(np.sum(_normalize(reference["corpus"]) * _normalize(result["corpus"]), axis=1)))
+        print(
+            f"{name:<10} {result['throughput']:>9.1f} {result['p50_ms']:>8.2f} "
+            f"{result['p95_ms']:>8.2f} {recall:>10.3f} {cosine:>11.4f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+Embedding Cache
+(모델 이름, 텍스트 해시)로 키를 잡는 디스크 임베딩 캐시
+
+- vectors.f32: capacity x dim float32 memory-mapped 배열
+- tags.bin: 슬롯마다 저장된 키의 해시 태그 (읽은 벡터가 요청한 키의 것인지 확인)
+  슬롯을 재사용할 때 태그 비우기 → 벡터 쓰기 → 새 태그 순서로 기록하고,
+  읽을 때는 벡터 복사 전후의 태그가 모두 키와 같을 때만 사용
+  (다른 프로세스가 쓰는 중이거나, 벡터를 쓴 뒤 트랜잭션이 ROLLBACK된 슬롯은 miss로 처리)
+- index.sqlite: 키 → 슬롯 번호, 마지막 사용 시각 (LRU 제거용)
+  조회 시각 갱신은 메모리에 모았다가 주기적으로 / 슬롯 재사용(제거) 전에 / 종료 시 한 번에 기록
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List
+import numpy as np
+from app.settings import (
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_TOUCH_FLUSH_SECONDS,
+    EMBEDDING_CACHE_TOUCH_FLUSH_SIZE,
+)
+
+
+TAG_BYTES = 8
+_EMPTY_TAG = bytes(TAG_BYTES)
+
+
+def text_key(text: str) -> str:
+    """텍스트 해시 키"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _key_tag(key: str) -> bytes:
+    """슬롯에 함께 저장하는 키 태그 (빈 태그와 겹치지 않음)"""
+    tag = hashlib.blake2b(key.encode("utf-8"), digest_size=TAG_BYTES).digest()
+    return tag if tag != _EMPTY_TAG else b"\x01" + tag[1:]
+
+
+class EmbeddingCache:
+    """모델 하나에 대한 디스크 임베딩 캐시 (크기 제한 + LRU 제거)"""
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        cache_dir: str = EMBEDDING_CACHE_DIR,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        self.model_name = model_name
+        self.dim = dim
+        self.capacity = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}  # 아직 기록하지 않은 조회 시각 (key → last_used)
+        self._last_touch_flush = time.monotonic()
+
+        # 모델마다 별도 디렉토리 (모델 이름이 키의 일부)
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.path = os.path.join(cache_dir, safe_name)
+        os.makedirs(self.path, exist_ok=True)
+
+        self._db = sqlite3.connect(
+            os.path.join(self.path, "index.sqlite"),
+            check_same_thread=False,
+            isolation_level=None,  # 트랜잭션은 직접 관리
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, slot INTEGER UNIQUE NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+        self._vectors, self._tags = self._open_vectors()
+
+    def _open_vectors(self):
+        """벡터 / 태그 파일 열기 (모델/차원/용량이 바뀌었으면 캐시 초기화)"""
+        vectors_path = os.path.join(self.path, "vectors.f32")
+        tags_path = os.path.join(self.path, "tags.bin")
+        expected = {"model": self.model_name, "dim": str(self.dim), "capacity": str(self.capacity)}
+        meta = dict(self._db.execute("SELECT name, value FROM meta").fetchall())
+
+        if (
+            all(meta.get(k) == v for k, v in expected.items())
+            and os.path.exists(vectors_path)
+            and os.path.exists(tags_path)
+        ):
+            return (
+                np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim)),
+                np.memmap(tags_path, dtype=np.uint8, mode="r+", shape=(self.capacity, TAG_BYTES)),
+            )
+
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute("DELETE FROM entries")
+        self._db.execute("DELETE FROM meta")
+        self._db.executemany(
+            "INSERT INTO meta (name, value) VALUES (?, ?)",
+            list(expected.items()) + [("next_slot", "0")],
+        )
+        vectors = np.memmap(vectors_path, dtype=np.float32, mode="w+", shape=(self.capacity, self.dim))
+        tags = np.memmap(tags_path, dtype=np.uint8, mode="w+", shape=(self.capacity, TAG_BYTES))
+        self._db.execute("COMMIT")
+        return vectors, tags
+
+    def _read_slot(self, slot: int, key: str):
+        """슬롯의 벡터 복사본 (태그가 키와 다르거나 읽는 중 바뀌었으면 None)"""
+        tag = _key_tag(key)
+        if self._tags[slot].tobytes() != tag:
+            return None
+        vector = np.array(self._vectors[slot])
+        if self._tags[slot].tobytes() != tag:
+            return None
+        return vector
+
+    def _write_slot(self, slot: int, key: str, vector: np.ndarray):
+        """
+        슬롯에 벡터 기록 (쓰는 동안 다른 읽기가 이전 키로 이 벡터를 읽지 않도록 태그를 먼저 비움)
+        공유 memmap이라 다른 프로세스에는 바로 보이며, 디스크 flush는 호출자가 한 번에 수행
+        """
+        self._tags[slot] = np.frombuffer(_EMPTY_TAG, dtype=np.uint8)
+        self._vectors[slot] = vector
+        self._tags[slot] = np.frombuffer(_key_tag(key), dtype=np.uint8)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        캐시 조회
+
+        Args:
+            keys: text_key 목록
+
+        Returns:
+            {key: vector} (캐시에 있는 항목만)
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        with self._lock:
+            found = {}
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._db.execute(
+                    f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", part
+                ).fetchall()
+                for key, slot in rows:
+                    vector = self._read_slot(slot, key)
+                    if vector is not None:
+                        found[key] = vector
+
+            if found:
+                now = time.time()
+                self._touched.update((key, now) for key in found)
+                self._maybe_flush_touches()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """
+        캐시 저장 (가득 차면 가장 오래 사용되지 않은 항목의 슬롯을 재사용)
+
+        Args:
+            items: {key: vector}
+        """
+        # 용량보다 많으면 마지막 capacity개만 저장
+        items = list(items.items())[-self.capacity:]
+        if not items:
+            return
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                keys = [key for key, _ in items]
+                placeholders = ",".join("?" * len(keys))
+                existing = dict(self._db.execute(
+                    f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", keys
+                ).fetchall())
+                new_items = [(key, vec) for key, vec in items if key not in existing]
+                # 태그가 맞지 않는 기존 항목(ROLLBACK된 쓰기로 덮인 슬롯)은 같은 슬롯에 다시 기록
+                stale_items = [
+                    (key, vec) for key, vec in items
+                    if key in existing and self._tags[existing[key]].tobytes() != _key_tag(key)
+                ]
+
+                # 제거 대상을 정하기 전에 최근 조회 시각 반영
+                self._flush_touches()
+                slots = self._allocate_slots(len(new_items))
+                now = time.time()
+                for key, vec in stale_items:
+                    self._write_slot(existing[key], key, vec)
+                for (key, vec), slot in zip(new_items, slots):
+                    self._write_slot(slot, key, vec)
+                self._vectors.flush()
+                self._tags.flush()
+
+                self._db.executemany(
+                    "INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                    [(key, slot, now) for (key, _), slot in zip(new_items, slots)],
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _flush_touches(self):
+        """모아 둔 조회 시각 기록 (lock / 트랜잭션 안에서 호출)"""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()],
+            )
+            self._touched.clear()
+        self._last_touch_flush = time.monotonic()
+
+    def _maybe_flush_touches(self, force: bool = False):
+        """조회 시각이 충분히 모였거나 간격이 지났으면 한 트랜잭션으로 기록 (lock 안에서 호출)"""
+        if not self._touched:
+            return
+        if not force and (
+            len(self._touched) < EMBEDDING_CACHE_TOUCH_FLUSH_SIZE
+            and time.monotonic() - self._last_touch_flush < EMBEDDING_CACHE_TOUCH_FLUSH_SECONDS
+        ):
+            return
+        self._db.execute("BEGIN IMMEDIATE")
+        with self._db:
+            self._flush_touches()
+
+    def _allocate_slots(self, count: int) -> List[int]:
+        """빈 슬롯 할당, 부족하면 LRU 항목 제거 (트랜잭션 안에서 호출)"""
+        next_slot = int(self._db.execute(
+            "SELECT value FROM meta WHERE name = 'next_slot'"
+        ).fetchone()[0])
+
+        fresh = min(count, self.capacity - next_slot)
+        slots = list(range(next_slot, next_slot + fresh))
+        if fresh:
+            self._db.execute(
+                "UPDATE meta SET value = ? WHERE name = 'next_slot'", (str(next_slot + fresh),)
+            )
+
+        evict = count - fresh
+        if evict:
+            rows = self._db.execute(
+                "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (evict,)
+            ).fetchall()
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in rows])
+            slots.extend(slot for _, slot in rows)
+
+        return slots
+
+    def stats(self) -> Dict:
+        """캐시 통계 (hit/miss, 항목 수)"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": entries,
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._maybe_flush_touches(force=True)
+            self._vectors.flush()
+            self._tags.flush()
+            self._db.close()
+
+
+class CachedEmbedder:
+    """
+    임베딩 모델 앞단의 디스크 캐시
+    ChromaStore / MemoryStore의 embedder.encode 호출을 그대로 대체합니다.
+    """
+
+    def __init__(self, embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.model_name = embedder.model_name
+        self.cache = cache
+
+    def encode(self, texts: List[str], **kwargs):
+        """
+        텍스트 임베딩 (캐시에 없는 텍스트만 모델로 계산)
+
+        Returns:
+            numpy 배열 (len(texts) x dim)
+        """
+        # 기본 옵션이 아닌 호출(정규화 등)은 캐시를 거치지 않음
+        if kwargs:
+            return self.embedder.encode(texts, **kwargs)
+
+        keys = [text_key(text) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            computed = self.embedder.encode(list(missing.values()))
+            new_vectors = dict(zip(missing.keys(), np.asarray(computed, dtype=np.float32)))
+            self.cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+
+        if not keys:
+            return np.zeros((0, self.cache.dim), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def close(self):
+        self.cache.close()
+        close = getattr(self.embedder, "close", None)
+        if close:
+            close()
@@ -0,0 +1,183 @@
+"""
+ONNX Runtime Embedder
+SentenceTransformer 모델을 ONNX로 내보내고 dynamic int8 양자화하여 CPU에서 실행
+
+- 최초 실행 시 ONNX_MODEL_DIR/<모델 이름>/ 에 model.onnx(+ model_int8.onnx)와 토크나이저 저장
+- 이후에는 PyTorch 없이 onnxruntime + 토크나이저만으로 임베딩
+- Pooling은 paraphrase-multilingual-MiniLM 계열과 동일한 mean pooling
+"""
+import json
+import os
+import re
+import threading
+from typing import List
+import numpy as np
+from app.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_SECONDS, observe
+from app.settings import ONNX_MODEL_DIR, ONNX_QUANTIZE, ONNX_INTRA_OP_THREADS
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool = True) -> str:
+    """
+    SentenceTransformer 모델을 ONNX로 내보내기 (필요하면 int8 양자화)
+
+    Returns:
+        실행할 ONNX 파일 경로
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    int8_path = os.path.join(output_dir, "model_int8.onnx")
+
+    if not os.path.exists(fp32_path):
+        print(f"📦 ONNX 모델 내보내는 중: {model_name}")
+        st_model = SentenceTransformer(model_name, device="cpu")
+        transformer = st_model[0].auto_model.eval()
+        tokenizer = st_model[0].tokenizer
+
+        class _Encoder(torch.nn.Module):
+            """(input_ids, attention_mask) → last_hidden_state"""
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+        dummy = tokenizer(["임베딩 내보내기"], return_tensors="pt")
+        with torch.no_grad():
+            torch.onnx.export(
+                _Encoder(transformer),
+                (dummy["input_ids"], dummy["attention_mask"]),
+                fp32_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["last_hidden_state"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "last_hidden_state": {0: "batch", 1: "sequence"},
+                },
+                opset_version=14,
+            )
+
+        tokenizer.save_pretrained(output_dir)
+        with open(os.path.join(output_dir, "embedder_config.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "model_name": model_name,
+                    "max_seq_length": st_model.max_seq_length,
+                    "dimension": st_model.get_sentence_embedding_dimension(),
+                },
+                f,
+            )
+
+    if not quantize:
+        return fp32_path
+
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print("📦 ONNX 모델 int8 양자화 중")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxEmbedder:
+    """
+    SharedEmbedder와 같은 인터페이스(model_name, dimension, encode)의 ONNX Runtime 임베더
+    model_name에 백엔드가 포함되므로 디스크/쿼리 캐시가 PyTorch 임베딩과 섞이지 않습니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_dir: str = ONNX_MODEL_DIR,
+        quantize: bool = ONNX_QUANTIZE,
+        intra_op_threads: int = ONNX_INTRA_OP_THREADS,
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        output_dir = os.path.join(model_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+        model_path = export_onnx_model(model_name, output_dir, quantize)
+
+        with open(os.path.join(output_dir, "embedder_config.json"), "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        self.model_name = f"{model_name}@onnx-{'int8' if quantize else 'fp32'}"
+        self.dimension = config["dimension"]
+        self.max_seq_length = config["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(output_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._lock = threading.Lock()
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        attention_mask = encoded["attention_mask"].astype(np.int64)
+        hidden = self.session.run(
+            ["last_hidden_state"],
+            {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": attention_mask,
+            },
+        )[0]
+
+        # Mean pooling (padding 토큰 제외)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ):
+        """
+        텍스트 임베딩 (thread-safe)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            batch_size: 한 번에 실행할 텍스트 수
+
+        Returns:
+            numpy 배열 (len(texts) x dim)
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        # 길이순으로 묶어 padding 낭비를 줄이고, 결과는 원래 순서로 복원
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+
+        EMBEDDING_BATCH_SIZE.labels(backend="onnx").observe(len(texts))
+        with self._lock, observe(EMBEDDING_SECONDS, backend="onnx"):
+            for start in range(0, len(texts), batch_size):
+                indices = order[start:start + batch_size]
+                embeddings[indices] = self._embed_batch([texts[i] for i in indices])
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings
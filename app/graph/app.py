@@ -1,21 +1,40 @@
 from langgraph.graph import StateGraph, END
 from app.graph.state import AgentState
-from app.graph.nodes import llm_node, tool_node, reflection_node, should_continue
+from app.metrics import timed_node
+from app.graph.nodes import (
+    answer_cache_node,
+    llm_node,
+    tool_node,
+    reflection_node,
+    should_continue,
+    route_after_answer_cache,
+)
 
-def create_agent_graph():
+def create_agent_graph(checkpointer=None):
     """
     Agent의 전체 ReAct + Reflection 파이프라인을 LangGraph로 정의하고 컴파일합니다.
+    checkpointer를 주면 thread_id(세션)별로 대화 상태가 서버에 저장되어,
+    호출자는 매 턴 새 HumanMessage만 보내면 됩니다.
     """
     # 1. StateGraph 초기화
     workflow = StateGraph(AgentState)
     
-    # 2. Node 추가
-    workflow.add_node("llm_node", llm_node)
-    workflow.add_node("tool_node", tool_node)
-    workflow.add_node("reflection_node", reflection_node)
+    # 2. Node 추가 (노드별 실행 시간은 /metrics의 agent_graph_node_seconds로 기록)
+    workflow.add_node("answer_cache_node", timed_node("answer_cache_node", answer_cache_node))
+    workflow.add_node("llm_node", timed_node("llm_node", llm_node))
+    workflow.add_node("tool_node", timed_node("tool_node", tool_node))
+    workflow.add_node("reflection_node", timed_node("reflection_node", reflection_node))
     
-    # 3. Entry Point 설정
-    workflow.set_entry_point("llm_node")
+    # 3. Entry Point 설정 (반복 질문은 답변 캐시에서 바로 종료)
+    workflow.set_entry_point("answer_cache_node")
+    workflow.add_conditional_edges(
+        "answer_cache_node",
+        route_after_answer_cache,
+        {
+            "llm_node": "llm_node",
+            "end": END,
+        },
+    )
     
     # 4. Edge 및 Conditional Edge 설계 (ReAct 루프 + Reflection)
     workflow.add_conditional_edges(
@@ -31,7 +50,7 @@ def create_agent_graph():
     workflow.add_edge("reflection_node", END)
     
     # 5. 그래프 컴파일
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
     
     print("LangGraph Agent 파이프라인 컴파일 완료.")
     
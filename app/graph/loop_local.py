@@ -0,0 +1,30 @@
+"""
+Loop-local asyncio Primitives
+asyncio.Lock / Semaphore는 처음 대기한 이벤트 루프에 묶이므로 모듈 전역에 하나만 두면
+다른 루프(pytest, uvicorn reload, 별도 스레드의 루프)에서 경합할 때 오류가 나거나 멈춤
+→ 실행 중인 루프마다 따로 만들어 사용
+"""
+import asyncio
+import threading
+import weakref
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """실행 중인 이벤트 루프별 asyncio 객체 (루프가 사라지면 함께 정리)"""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """현재 루프의 객체 (없으면 생성, 코루틴 안에서 호출)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            instance = self._instances.get(loop)
+            if instance is None:
+                instance = self._instances[loop] = self._factory()
+            return instance
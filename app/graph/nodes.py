@@ -1,34 +1,151 @@
+import asyncio
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
-from langchain_core.messages import ToolMessage
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.config import get_stream_writer
+from app.answer_cache import first_turn_question, get_answer_cache
+from app.graph.loop_local import LoopLocal
 from app.graph.state import AgentState
-from app.llm_client import llm_with_tools, llm_for_reflection # A 역할
+from app.metrics import ANSWER_CACHE_LOOKUPS, ANSWER_CACHE_SAVED_SECONDS, TOOL_CALLS
+from app.llm_client import llm_with_tools # A 역할
+from app.memory.reflection_queue import get_reflection_queue
 from app.tools import run_tool # A 역할
+from app.tools.budget import ToolBudget
+from app.settings import TOOL_MAX_WORKERS, TOOL_MAX_ABANDONED, TOOL_TIMEOUT_SECONDS, TOOL_TIMEOUTS, TOOL_TIMEOUT_GRACE_SECONDS
 
 # A 역할이 제공할 것으로 예상되는 Tool 이름 목록
 AVAILABLE_TOOLS = ["google_search", "calculator", "time", "rag_search", "read_memory", "write_memory"]
 
-def llm_node(state: AgentState) -> AgentState:
+# Tool 실행 전용 스레드 풀
+# 동시에 실행되는 Tool 개수는 _tool_slots(이벤트 루프별 Semaphore)로 제한하고, 타임아웃으로 포기한 호출의 스레드는
+# 끝날 때까지 풀을 점유하므로 TOOL_MAX_ABANDONED개만큼 여유 스레드를 둠
+_tool_executor = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS + TOOL_MAX_ABANDONED, thread_name_prefix="tool")
+_tool_slots = LoopLocal(lambda: asyncio.Semaphore(TOOL_MAX_WORKERS))
+
+async def answer_cache_node(state: AgentState) -> AgentState:
+    """
+    그래프 진입 노드: 대화 첫 질문이면 의미가 같은 이전 질문의 답변을 찾아 바로 반환합니다.
+    hit이면 LLM/Tool/Reflection을 모두 건너뛰고 종료합니다.
+    """
+    print("--- Answer Cache Node 실행 ---")
+    started_at = time.perf_counter()
+    miss = {"turn_started_at": started_at, "answer_cache_hit": False}
+    
+    # 캐시 대상(첫 질문)이 아니거나 저장된 답변이 없으면 임베딩 계산 없이 바로 진행
+    cache = get_answer_cache()
+    question = first_turn_question(state["messages"]) if cache else None
+    if question is None:
+        return miss
+    if cache.is_empty():
+        ANSWER_CACHE_LOOKUPS.labels(result="miss").inc()
+        return miss
+    
+    try:
+        hit = await asyncio.to_thread(cache.lookup, question)
+    except Exception as e:
+        print(f"⚠️ 답변 캐시 조회 실패: {e}")
+        return miss
+    if hit is None:
+        ANSWER_CACHE_LOOKUPS.labels(result="miss").inc()
+        return miss
+    
+    ANSWER_CACHE_LOOKUPS.labels(result="hit").inc()
+    ANSWER_CACHE_SAVED_SECONDS.inc(hit["latency_ms"] / 1000)
+    print(f"💾 답변 캐시 hit (유사도 {hit['similarity']:.3f}, 약 {hit['latency_ms']:.0f}ms 절약)")
+    
+    # 스트리밍 구독자(UI)에게는 일반 답변과 같은 방식으로 전달
+    get_stream_writer()({"llm_token": hit["answer"]})
+    return {
+        "messages": [AIMessage(content=hit["answer"])],
+        "turn_started_at": started_at,
+        "answer_cache_hit": True,
+    }
+
+def route_after_answer_cache(state: AgentState) -> Literal["llm_node", "end"]:
+    """답변 캐시 hit이면 종료, 아니면 LLM Node로 이동"""
+    return "end" if state.get("answer_cache_hit") else "llm_node"
+
+async def llm_node(state: AgentState) -> AgentState:
     """
     LLM을 호출하여 답변을 생성하거나 Tool 사용을 결정하는 노드 (Think).
+    비동기로 호출하여 LLM 응답 대기 중에도 다른 세션이 진행될 수 있게 합니다.
     """
     print("--- LLM Node 실행 (Think) ---")
     messages = state["messages"]
     
+    # 토큰 단위 스트리밍: stream_mode="custom"으로 구독 중인 호출자(UI)에게 전달
+    writer = get_stream_writer()
+    
     # 1. LLM 호출 (A 역할이 구현한 클라이언트 사용)
-    # LangChain Runnable의 invoke 결과를 가져옴
-    response = llm_with_tools.invoke(
+    # LangChain Runnable의 ainvoke 결과를 가져옴 (tool_calls가 조립된 AIMessage)
+    response = await llm_with_tools.ainvoke(
         {"messages": messages},
-        config={"tools": AVAILABLE_TOOLS}
+        config={
+            "tools": AVAILABLE_TOOLS,
+            "on_token": lambda token: writer({"llm_token": token}),
+        }
     )
     
     # 2. 결과 처리
     # LLM 응답은 자동으로 State의 messages 리스트에 추가됩니다.
     return {"messages": [response]}
 
-def tool_node(state: AgentState) -> AgentState:
+async def _run_tool_call(tool_call: dict) -> ToolMessage:
+    """
+    단일 Tool Call을 스레드 풀에서 실행하고 ToolMessage로 변환합니다.
+    Tool은 deadline(ToolBudget)을 받아 단계 사이에서 스스로 중단하고(협력적 타임아웃),
+    그래도 끝나지 않으면 유예 시간 뒤 결과를 버리고 에러 메시지를 반환합니다.
+    """
+    tool_name = tool_call["name"]
+    tool_args = tool_call["args"]
+    tool_call_id = tool_call["id"]
+    timeout = TOOL_TIMEOUTS.get(tool_name, TOOL_TIMEOUT_SECONDS)
+    
+    print(f"Tool 호출: {tool_name} with args: {tool_args}")
+    
+    # 1. A 역할이 제공하는 run_tool 함수 호출 (핵심 협업 인터페이스)
+    async with _tool_slots.get():
+        budget = ToolBudget(timeout)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_tool_executor, run_tool, tool_name, tool_args, budget)
+        try:
+            # 스레드에서 이미 실행 중인 Tool은 멈출 수 없으므로 wait_for는 기다리기만 중단함
+            # (시간 초과는 Tool이 deadline 확인으로 처리하고, 이것은 응답하지 않는 Tool에 대한 안전장치)
+            result_dict = await asyncio.wait_for(future, timeout=timeout + TOOL_TIMEOUT_GRACE_SECONDS)
+            # 텍스트 결과는 그대로 전달 (JSON으로 다시 감싸면 줄바꿈/따옴표 escape로 토큰만 늘어남)
+            if not result_dict.get("error") and isinstance(result_dict.get("result"), str):
+                result = result_dict["result"]
+            else:
+                result = json.dumps(result_dict, ensure_ascii=False)
+        except asyncio.TimeoutError:
+            # 스레드는 계속 실행되지만 슬롯은 반납 (이후 결과와 메트릭은 버림)
+            budget.abandoned = True
+            TOOL_CALLS.labels(tool=tool_name, status="timeout").inc()
+            result = f"Error: Tool execution timed out for {tool_name} after {timeout}s."
+            print(result)
+        except asyncio.CancelledError:
+            # 턴 취소 (클라이언트 연결 종료 등): 아직 시작되지 않은 호출은 실행되지 않고, 실행 중이면 다음 확인 지점에서 중단
+            budget.abandoned = True
+            raise
+        except Exception as e:
+            TOOL_CALLS.labels(tool=tool_name, status="error").inc()
+            result = f"Error: Tool execution failed for {tool_name}. Details: {e}"
+            print(result)
+
+    # 2. ToolMessage 생성
+    return ToolMessage(
+        content=result,
+        tool_call_id=tool_call_id,
+        name=tool_name,
+    )
+
+
+async def tool_node(state: AgentState) -> AgentState:
     """
     Tool 호출을 실행하고 그 결과를 메시지로 State에 추가하는 노드 (Act & Observe).
+    한 턴에 여러 Tool Call이 있으면 동시에 실행하고, 결과는 원래 순서대로 추가합니다.
     """
     print("--- Tool Node 실행 (Act & Observe) ---")
     messages = state["messages"]
@@ -39,73 +156,35 @@ def tool_node(state: AgentState) -> AgentState:
         print("경고: Tool Node에 진입했으나 Tool Call이 없습니다.")
         return state # Tool Call이 없으면 상태 변경 없이 반환
 
-    # 추출된 Tool Calls 실행
-    tool_results = []
-    for tool_call in last_message.tool_calls:
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-        tool_call_id = tool_call["id"]
-        
-        print(f"Tool 호출: {tool_name} with args: {tool_args}")
-        
-        # 1. A 역할이 제공하는 run_tool 함수 호출 (핵심 협업 인터페이스)
-        try:
-            result_dict = run_tool(tool_name, tool_args)
-            result = json.dumps(result_dict, ensure_ascii=False)
-        except Exception as e:
-            result = f"Error: Tool execution failed for {tool_name}. Details: {e}"
-            print(result)
-
-        # 2. ToolMessage 생성 및 결과 저장
-        tool_results.append(
-            ToolMessage(
-                content=result,
-                tool_call_id=tool_call_id,
-                name=tool_name,
-            )
-        )
+    # 추출된 Tool Calls 동시 실행 (gather는 입력 순서대로 결과를 반환)
+    tool_results = await asyncio.gather(
+        *(_run_tool_call(tool_call) for tool_call in last_message.tool_calls)
+    )
         
     # Tool 실행 결과 메시지를 State에 추가하여 LLM이 다음 턴에 볼 수 있게 함
-    return {"messages": tool_results}
+    return {"messages": list(tool_results)}
 
 
-def reflection_node(state: AgentState) -> AgentState:
+async def reflection_node(state: AgentState) -> AgentState:
     """
-    대화가 완료된 후, 장기 메모리 저장을 위해 Reflection을 수행하는 노드.
-    이 노드에서 'write_memory' Tool을 호출하는 LLM을 사용합니다.
+    대화가 완료된 후, 장기 메모리 저장을 위한 Reflection을 예약하는 노드.
+    Reflection LLM 호출과 'write_memory' 저장은 백그라운드 Reflection 큐에서 처리되므로
+    사용자 응답 지연은 최종 답변에서 끝납니다.
     """
-    print("--- Reflection Node 실행 ---")
+    print("--- Reflection Node 실행 (백그라운드 큐에 등록) ---")
     messages = state["messages"]
     
-    # 1. LLM 호출: 전체 대화 내용을 기반으로 저장할 메모리 요약을 생성하도록 요청 (A 역할 프롬프트 사용)
-    # A 역할이 구현한 LLM 클라이언트 사용
-    reflection_response = llm_for_reflection.invoke({"messages": messages})
-
-    # 2. Tool Calls 확인 (Reflection LLM은 반드시 'write_memory' Tool을 호출해야 함)
-    tool_calls = reflection_response.tool_calls
-    
-    if tool_calls and tool_calls[0]["name"] == "write_memory":
-        tool_call = tool_calls[0]
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-        tool_call_id = tool_call["id"]
-        
-        print(f"Reflection Tool 호출: {tool_name} with args: {tool_args}")
-
-        # 3. 'write_memory' Tool 실행
+    # 첫 질문에 대한 강의 자료 답변이면 답변 캐시에 저장 (전체 실행 시간 = hit 시 절약되는 지연)
+    cache = get_answer_cache()
+    if cache and state.get("turn_started_at"):
+        latency_ms = (time.perf_counter() - state["turn_started_at"]) * 1000
         try:
-            result_dict = run_tool(tool_name, tool_args)
-            result = json.dumps(result_dict, ensure_ascii=False)
+            await asyncio.to_thread(cache.store_from_messages, messages, latency_ms)
         except Exception as e:
-            result = f"Error: write_memory execution failed. Details: {e}"
-            print(result)
-
-        # Reflection 결과를 LLM에게 다시 전달할 필요는 없으므로,
-        # 여기서는 상태에 ToolMessage를 추가하지 않고 로그만 남깁니다.
-        # 성공적으로 실행되었다고 가정하고 다음 상태로 넘어갑니다.
-        
-    else:
-        print("Reflection LLM이 'write_memory' Tool을 호출하지 않았습니다. 메모리 저장을 건너뜁니다.")
+            print(f"⚠️ 답변 캐시 저장 실패: {e}")
+    
+    # 전체 대화 기록을 Reflection 큐에 등록 (큐가 가득 차면 잠시 대기 후 드롭)
+    await get_reflection_queue().submit(messages)
 
     # Reflection 후 상태 변경 없이 다음 단계 (Graph 종료)로 넘어갑니다.
     return state
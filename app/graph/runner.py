@@ -0,0 +1,81 @@
+"""
+Agent Runner
+컴파일된 그래프를 세션(thread_id) 단위로 실행하고 UI/API 공통 이벤트로 변환
+
+이벤트:
+- {"type": "token", "content": str}          답변 토큰 (llm_node 스트리밍 / 답변 캐시)
+- {"type": "tool_call", "tools": [str]}      LLM이 Tool 실행을 결정함
+- {"type": "tool_result", "tools": [str]}    Tool 실행 완료
+"""
+import asyncio
+from typing import AsyncIterator, Dict
+from langchain_core.messages import HumanMessage
+from app.graph.app import create_agent_graph
+from app.graph.loop_local import LoopLocal
+from app.graph.sessions import get_session_store
+from app.graph.state import AgentState
+
+# 에이전트 그래프를 한 번만 초기화하는 전역 변수 (지연 초기화)
+_agent_app = None
+_agent_app_lock = LoopLocal(asyncio.Lock)
+
+async def get_agent_app():
+    """
+    에이전트 그래프를 초기화하고 반환합니다.
+    세션 체크포인터(SQLite)와 함께 컴파일하므로 대화 상태는 thread_id별로 서버에 저장됩니다.
+    """
+    global _agent_app
+    if _agent_app is None:
+        async with _agent_app_lock.get():
+            if _agent_app is None:
+                session_store = await get_session_store()
+                _agent_app = create_agent_graph(checkpointer=session_store.checkpointer)
+    return _agent_app
+
+
+async def stream_agent(message: str, thread_id: str, reset: bool = False) -> AsyncIterator[Dict]:
+    """
+    새 사용자 메시지로 세션의 다음 턴을 실행하고 이벤트를 순서대로 반환합니다.
+    이전 대화(Tool 호출/결과 포함)는 체크포인터에 있으므로 새 메시지만 전달합니다.
+    호출자가 반복을 중단하면(aclose) 그래프 실행도 취소됩니다.
+
+    Args:
+        message: 사용자 메시지
+        thread_id: 세션 ID
+        reset: True이면 이전 대화 상태를 지우고 새로 시작
+    """
+    agent_app = await get_agent_app()
+    session_store = await get_session_store()
+    
+    if reset:
+        await session_store.reset(thread_id)
+    await session_store.touch(thread_id)
+    config = {"configurable": {"thread_id": thread_id}}
+    
+    # 이번 턴 입력 (messages는 add_messages로 기존 대화 뒤에 추가됨)
+    initial_state = AgentState(
+        messages=[HumanMessage(content=message)],
+        lecture_index_status="READY",
+        long_term_memory_query=""
+    )
+    
+    # - "custom": llm_node가 보내는 토큰 단위 스트림
+    # - "updates": 노드 완료 이벤트 (Tool 호출 여부 확인)
+    async for mode, chunk in agent_app.astream(initial_state, config=config, stream_mode=["updates", "custom"]):
+        if mode == "custom" and "llm_token" in chunk:
+            yield {"type": "token", "content": chunk["llm_token"]}
+            continue
+        
+        if mode != "updates":
+            continue
+        
+        llm_update = chunk.get("llm_node")
+        if llm_update and llm_update["messages"][-1].tool_calls:
+            yield {
+                "type": "tool_call",
+                "tools": [tool_call["name"] for tool_call in llm_update["messages"][-1].tool_calls],
+            }
+        
+        tool_update = chunk.get("tool_node")
+        if tool_update:
+            yield {"type": "tool_result", "tools": [m.name for m in tool_update["messages"]]}
@@ -0,0 +1,116 @@
+"""
+Session Checkpointer
+LangGraph 대화 상태를 SQLite 체크포인터에 세션(thread_id)별로 저장
+
+- 매 턴마다 새 HumanMessage만 보내면 이전 턴의 Tool 호출/결과까지 서버에서 이어짐
+- 세션 사용 시각을 같은 DB에 기록하고, 오래된 세션(TTL)과 개수 초과분(LRU)의 체크포인트를 삭제
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+from app.graph.loop_local import LoopLocal
+from app.settings import SESSION_DB_PATH, SESSION_MAX_COUNT, SESSION_TTL_SECONDS
+
+
+class SessionStore:
+    """AsyncSqliteSaver + 세션 보존 정책 (TTL / LRU)"""
+
+    def __init__(
+        self,
+        path: str = SESSION_DB_PATH,
+        max_sessions: int = SESSION_MAX_COUNT,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+    ):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.checkpointer = None
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    async def open(self):
+        """SQLite 연결 및 체크포인터 테이블 준비"""
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = await aiosqlite.connect(self.path)
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS agent_sessions (thread_id TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+        )
+        await self._conn.commit()
+
+        self.checkpointer = AsyncSqliteSaver(self._conn)
+        await self.checkpointer.setup()
+
+    async def touch(self, thread_id: str):
+        """세션 사용 기록 후 보존 정책에 따라 오래된 세션 삭제"""
+        async with self._lock:
+            await self._conn.execute(
+                "INSERT INTO agent_sessions (thread_id, last_used) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET last_used = excluded.last_used",
+                (thread_id, time.time()),
+            )
+            await self._conn.commit()
+            await self._evict()
+
+    async def _evict(self):
+        expired_before = time.time() - self.ttl_seconds
+        async with self._conn.execute(
+            "SELECT thread_id FROM agent_sessions WHERE last_used < ? OR thread_id NOT IN "
+            "(SELECT thread_id FROM agent_sessions ORDER BY last_used DESC LIMIT ?)",
+            (expired_before, self.max_sessions),
+        ) as cursor:
+            evicted = [row[0] for row in await cursor.fetchall()]
+
+        for thread_id in evicted:
+            await self._delete(thread_id)
+        if evicted:
+            print(f"🧹 오래된 대화 세션 {len(evicted)}개 삭제")
+
+    async def _delete(self, thread_id: str):
+        await self.checkpointer.adelete_thread(thread_id)
+        await self._conn.execute("DELETE FROM agent_sessions WHERE thread_id = ?", (thread_id,))
+        await self._conn.commit()
+
+    async def reset(self, thread_id: str):
+        """세션 대화 상태 삭제 (UI에서 대화를 새로 시작한 경우)"""
+        async with self._lock:
+            await self._delete(thread_id)
+
+    async def count(self) -> int:
+        async with self._conn.execute("SELECT COUNT(*) FROM agent_sessions") as cursor:
+            (count,) = await cursor.fetchone()
+        return count
+
+    async def close(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+            self.checkpointer = None
+
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = LoopLocal(asyncio.Lock)
+
+
+async def get_session_store() -> SessionStore:
+    """공유 SessionStore 반환 (최초 호출 시 DB 연결)"""
+    global _session_store
+    if _session_store is None:
+        async with _session_store_lock.get():
+            if _session_store is None:
+                store = SessionStore()
+                await store.open()
+                _session_store = store
+    return _session_store
+
+
+async def close_session_store():
+    """서버 종료 시 DB 연결 정리"""
+    global _session_store
+    if _session_store is not None:
+        await _session_store.close()
+        _session_store = None
@@ -10,9 +10,13 @@ class AgentState(TypedDict):
     - messages: 채팅 히스토리 및 Tool 호출/결과를 포함하는 메시지 리스트 (단기 메모리 역할)
     - lecture_index_status: 강의 자료 색인 상태 (예: 'READY', 'PENDING')
     - long_term_memory_query: Reflection 노드에서 장기 메모리 저장에 사용할 쿼리 (선택 사항)
+    - turn_started_at: 이번 턴 시작 시각 (perf_counter, 답변 캐시의 절약 지연 계산용)
+    - answer_cache_hit: 답변 캐시에서 바로 응답했는지 여부
     """
     messages: Annotated[List[AnyMessage], add_messages]
     lecture_index_status: str
     long_term_memory_query: str
+    turn_started_at: float
+    answer_cache_hit: bool
 
 # LangGraph의 State는 messages 리스트를 자동으로 append 하도록 설정됩니다..
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Conversation History Compaction
+LLM 호출 전에 대화 기록을 토큰 예산 안으로 압축
+
+1. 최근 HISTORY_KEEP_RECENT_TURNS개 턴은 그대로 유지
+2. 그 이전 턴의 Tool 결과는 앞부분만 남기고 생략
+3. 그래도 예산을 넘으면 가장 오래된 턴부터 "이전 대화 요약" 메시지로 대체
+   (LLM 호출 없이 질문/답변 앞부분을 뽑는 추출 요약, 요약도 토큰 상한 안에서 오래된 줄부터 제거)
+"""
+from typing import Dict, List
+from app.tokenizer import count_message_tokens, count_messages_tokens, count_tokens
+from app.settings import (
+    HISTORY_TOKEN_BUDGET,
+    HISTORY_KEEP_RECENT_TURNS,
+    HISTORY_TOOL_RESULT_MAX_CHARS,
+    HISTORY_SUMMARY_MAX_TOKENS,
+)
+
+SUMMARY_HEADER = "이전 대화 요약 (오래된 대화는 요약만 남김):"
+SUMMARY_LINE_MAX_CHARS = 150
+
+
+def split_turns(messages: List[Dict]) -> List[List[Dict]]:
+    """user 메시지를 기준으로 턴 단위로 분할 (user → assistant/tool ... → 다음 user 전까지)"""
+    turns = []
+    for message in messages:
+        if message["role"] == "user" or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def collapse_tool_results(turn: List[Dict], max_chars: int = HISTORY_TOOL_RESULT_MAX_CHARS) -> List[Dict]:
+    """Tool 결과 내용을 앞부분만 남기고 생략 (tool_call_id 짝은 유지)"""
+    collapsed = []
+    for message in turn:
+        content = message.get("content") or ""
+        if message["role"] == "tool" and len(content) > max_chars:
+            message = {**message, "content": content[:max_chars] + "\n… (이전 Tool 결과 생략)"}
+        collapsed.append(message)
+    return collapsed
+
+
+def summarize_turn(turn: List[Dict]) -> str:
+    """턴 하나를 한 줄로 요약 (질문 + 사용한 Tool + 최종 답변 앞부분)"""
+    question = next((m.get("content") for m in turn if m["role"] == "user"), "")
+    answer = next(
+        (m.get("content") for m in reversed(turn) if m["role"] == "assistant" and m.get("content")),
+        "",
+    )
+    tools = [
+        tc["function"]["name"]
+        for m in turn if m["role"] == "assistant"
+        for tc in m.get("tool_calls") or []
+    ]
+
+    line = f"- 사용자: {_shorten(question, SUMMARY_LINE_MAX_CHARS)}"
+    if tools:
+        line += f" [Tool: {', '.join(dict.fromkeys(tools))}]"
+    if answer:
+        line += f" → 답변: {_shorten(answer, SUMMARY_LINE_MAX_CHARS)}"
+    return line
+
+
+def _build_summary(lines: List[str], max_tokens: int) -> Dict:
+    """요약 메시지 (토큰 상한을 넘으면 오래된 줄부터 제거)"""
+    while lines and count_tokens("\n".join([SUMMARY_HEADER] + lines)) > max_tokens:
+        lines = lines[1:]
+    return {"role": "system", "content": "\n".join([SUMMARY_HEADER] + lines)}
+
+
+def compact_history(
+    messages: List[Dict],
+    budget: int = HISTORY_TOKEN_BUDGET,
+    keep_recent_turns: int = HISTORY_KEEP_RECENT_TURNS,
+    summary_max_tokens: int = HISTORY_SUMMARY_MAX_TOKENS,
+) -> List[Dict]:
+    """
+    OpenAI 포맷 메시지를 토큰 예산 안으로 압축
+
+    Args:
+        messages: System Prompt가 포함된 OpenAI 포맷 메시지
+        budget: 전체 프롬프트 토큰 예산 (System Prompt 포함)
+
+    Returns:
+        압축된 메시지 리스트 (System Prompt → 요약 → 최근 턴 순서)
+    """
+    system = [m for m in messages[:1] if m["role"] == "system"]
+    turns = split_turns(messages[len(system):])
+    if not turns:
+        return messages
+
+    original_tokens = count_messages_tokens(messages)
+
+    # 1. 최근 턴을 제외한 Tool 결과 생략
+    recent_start = max(0, len(turns) - keep_recent_turns)
+    turns = [
+        collapse_tool_results(turn) if i < recent_start else turn
+        for i, turn in enumerate(turns)
+    ]
+
+    # 2. 예산을 넘으면 가장 오래된 턴부터 요약으로 대체 (최근 턴은 유지)
+    fixed_tokens = count_messages_tokens(system)
+    turn_tokens = [count_messages_tokens(turn) for turn in turns]
+    summary_lines = []
+    summary = None
+    while len(turns) > keep_recent_turns:
+        summary_tokens = count_message_tokens(summary) if summary else 0
+        if fixed_tokens + summary_tokens + sum(turn_tokens) <= budget:
+            break
+        summary_lines.append(summarize_turn(turns.pop(0)))
+        turn_tokens.pop(0)
+        summary = _build_summary(summary_lines, summary_max_tokens)
+
+    # 3. 최근 턴만으로도 넘으면 현재 턴을 제외한 Tool 결과까지 생략
+    summary_tokens = count_message_tokens(summary) if summary else 0
+    if fixed_tokens + summary_tokens + sum(turn_tokens) > budget:
+        turns = [collapse_tool_results(turn) for turn in turns[:-1]] + turns[-1:]
+
+    compacted = system + ([summary] if summary else []) + [m for turn in turns for m in turn]
+
+    if original_tokens > budget:
+        compacted_tokens = count_messages_tokens(compacted)
+        print(
+            f"🗜️ 대화 기록 압축: {original_tokens} → {compacted_tokens} 토큰 "
+            f"(요약된 턴 {len(summary_lines)}개)"
+        )
+    return compacted
@@ -0,0 +1,127 @@
+"""
+LLM Response Cache
+같은 요청(model, messages, tools, tool_choice, ...)에 대한 ChatCompletion 응답을 SQLite에 저장
+
+- 키: 요청 인자를 정렬된 JSON으로 직렬화한 sha256 (dict 키 순서와 무관)
+- TTL이 지난 항목은 조회 시 삭제, 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+- 평가/데모/회귀 테스트처럼 같은 메시지를 반복 호출할 때 네트워크 호출 없이 응답
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from app.settings import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+)
+
+# 응답에 영향을 주지 않는 인자는 키에서 제외
+_IGNORED_KWARGS = {"stream", "stream_options", "timeout"}
+
+
+def request_key(call_kwargs: Dict) -> str:
+    """chat.completions.create 인자의 정규화 해시"""
+    canonical = json.dumps(
+        {k: v for k, v in call_kwargs.items() if k not in _IGNORED_KWARGS},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """디스크 LLM 응답 캐시 (TTL + 크기 제한)"""
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """저장된 응답 (ChatCompletion dict) 반환, 없거나 만료되었으면 None"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Dict):
+        """응답 저장 (최대 개수를 넘으면 LRU 제거)"""
+        now = time.time()
+        data = json.dumps(response, ensure_ascii=False)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            # 정상 종료 시 COMMIT, 예외 시 ROLLBACK (열린 트랜잭션이 남으면 이후 BEGIN이 모두 실패)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created, last_used) VALUES (?, ?, ?, ?)",
+                    (key, data, now, now),
+                )
+                (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+                if count > self.max_entries:
+                    self._db.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {"entries": count, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """공유 LLM 응답 캐시 (LLM_CACHE_ENABLED가 아니면 None)"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
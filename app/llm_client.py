@@ -2,15 +2,89 @@
 OpenAI LLM Client
 B파트 LangChain Runnable 인터페이스 제공
 """
-from openai import OpenAI
+import asyncio
+import time
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from openai.types.chat import ChatCompletion
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import Runnable
-from app.settings import OPENAI_API_KEY, MODEL_NAME
+from app.history import compact_history
+from app.llm_cache import get_llm_cache, request_key
+from app.metrics import (
+    LLM_CACHE_HITS,
+    LLM_ERRORS,
+    LLM_FIRST_TOKEN_SECONDS,
+    LLM_SECONDS,
+    observe,
+    record_llm_usage,
+)
+from app.settings import (
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+    MODEL_NAME,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_TIMEOUT_SECONDS,
+)
 from typing import Dict, Any
 import json
 
 # OpenAI 클라이언트 초기화
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+
+# 비동기 클라이언트 (이벤트 루프 안에서 지연 생성, 커넥션 풀 공유)
+_async_client = None
+
+
+def get_async_client() -> AsyncOpenAI:
+    """커넥션 풀을 공유하는 AsyncOpenAI 클라이언트 반환"""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=OPENAI_BASE_URL,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=LLM_TIMEOUT_SECONDS,
+            ),
+        )
+    return _async_client
+
+
+def _cache_lookup(call_kwargs: Dict, bypass_cache: bool = False):
+    """
+    LLM 응답 캐시 조회
+
+    Returns:
+        (cache, key, 저장된 ChatCompletion 또는 None) - 캐시가 꺼져 있으면 (None, None, None)
+        bypass_cache이면 조회는 건너뛰고 새 응답으로 캐시를 갱신할 수 있게 key만 반환
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None, None
+
+    key = request_key(call_kwargs)
+    if bypass_cache:
+        return cache, key, None
+
+    data = cache.get(key)
+    if data is None:
+        return cache, key, None
+    print("💾 LLM 응답 캐시 hit")
+    LLM_CACHE_HITS.inc()
+    return cache, key, ChatCompletion.model_validate(data)
+
+
+async def aclose_async_client():
+    """서버 종료 시 비동기 클라이언트의 커넥션 풀 정리"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
 
 
 class OpenAILLMRunnable(Runnable):
@@ -18,8 +92,9 @@ class OpenAILLMRunnable(Runnable):
     OpenAI LLM을 LangChain Runnable 인터페이스로 래핑
     B파트의 nodes.py에서 직접 사용 가능
     """
-    def __init__(self, use_tools: bool = True):
+    def __init__(self, use_tools: bool = True, compact: bool = True):
         self.use_tools = use_tools
+        self.compact = compact  # 호출 전 대화 기록을 HISTORY_TOKEN_BUDGET 안으로 압축
     
     def invoke(self, input: Dict[str, Any], config: Dict = None) -> AIMessage:
         """
@@ -27,11 +102,48 @@ class OpenAILLMRunnable(Runnable):
         
         Args:
             input: {"messages": [HumanMessage, AIMessage, ...]}
-            config: {"tools": [...]} (선택)
+            config: {"tools": [...], "bypass_cache": bool} (선택)
+                    bypass_cache이면 LLM 응답 캐시를 조회하지 않고 새로 호출
+        
+        Returns:
+            AIMessage (content 또는 tool_calls 포함)
+        """
+        openai_messages, tools = self._prepare_request(input, config)
+        bypass_cache = bool(config and config.get("bypass_cache"))
+        
+        # OpenAI 호출
+        response = self._call_openai(openai_messages, tools, bypass_cache)
+        
+        # OpenAI 응답을 LangChain AIMessage로 변환
+        return self._convert_to_langchain_format(response)
+    
+    async def ainvoke(self, input: Dict[str, Any], config: Dict = None, **kwargs) -> AIMessage:
+        """
+        비동기 invoke (AsyncOpenAI 사용)
+        네트워크 대기 동안 이벤트 루프를 막지 않으므로 여러 세션이 동시에 진행될 수 있음
+        
+        Args:
+            input: {"messages": [HumanMessage, AIMessage, ...]}
+            config: {"tools": [...], "on_token": callable, "bypass_cache": bool} (선택)
+                    on_token이 있으면 스트리밍으로 호출하고 content 토큰마다 콜백
+                    bypass_cache이면 LLM 응답 캐시를 조회하지 않고 새로 호출
         
         Returns:
             AIMessage (content 또는 tool_calls 포함)
         """
+        openai_messages, tools = self._prepare_request(input, config)
+        bypass_cache = bool(config and config.get("bypass_cache"))
+        
+        on_token = config.get("on_token") if config else None
+        if on_token:
+            return await self._astream_openai(openai_messages, tools, on_token, bypass_cache)
+        
+        response = await self._acall_openai(openai_messages, tools, bypass_cache)
+        
+        return self._convert_to_langchain_format(response)
+    
+    def _prepare_request(self, input: Dict[str, Any], config: Dict = None):
+        """invoke/ainvoke 공통: 메시지 변환 + System Prompt + 기록 압축 + Tool Spec 준비"""
         messages = input.get("messages", [])
         
         # LangChain 메시지를 OpenAI 포맷으로 변환
@@ -40,16 +152,16 @@ class OpenAILLMRunnable(Runnable):
         # System Prompt 자동 추가
         openai_messages = self._add_system_prompt(openai_messages)
         
+        # 토큰 예산 안으로 대화 기록 압축 (최근 턴 유지, 오래된 턴은 요약)
+        if self.compact:
+            openai_messages = compact_history(openai_messages)
+        
         # Tool Spec 준비
         tools = None
         if self.use_tools and config and "tools" in config:
             tools = self._get_tool_specs()
         
-        # OpenAI 호출
-        response = self._call_openai(openai_messages, tools)
-        
-        # OpenAI 응답을 LangChain AIMessage로 변환
-        return self._convert_to_langchain_format(response)
+        return openai_messages, tools
     
     def _convert_to_openai_format(self, messages):
         """LangChain 메시지 → OpenAI 포맷"""
@@ -120,8 +232,8 @@ class OpenAILLMRunnable(Runnable):
         except ImportError:
             return []
     
-    def _call_openai(self, messages, tools):
-        """OpenAI API 호출"""
+    def _build_call_kwargs(self, messages, tools):
+        """chat.completions.create 인자 구성"""
         call_kwargs = {
             "model": MODEL_NAME,
             "messages": messages,
@@ -131,13 +243,160 @@ class OpenAILLMRunnable(Runnable):
             call_kwargs["tools"] = tools
             call_kwargs["tool_choice"] = "auto"
         
+        return call_kwargs
+    
+    def _call_openai(self, messages, tools, bypass_cache: bool = False):
+        """OpenAI API 호출 (LLM_CACHE_ENABLED이면 같은 요청은 캐시에서 응답)"""
+        call_kwargs = self._build_call_kwargs(messages, tools)
+        
+        cache, key, cached = _cache_lookup(call_kwargs, bypass_cache)
+        if cached is not None:
+            return cached
+        
         try:
-            response = client.chat.completions.create(**call_kwargs)
+            with observe(LLM_SECONDS, mode="sync"):
+                response = client.chat.completions.create(**call_kwargs)
+            record_llm_usage(response.usage)
+            if cache is not None:
+                cache.put(key, response.model_dump(mode="json"))
+            return response
+        except Exception as e:
+            LLM_ERRORS.labels(mode="sync").inc()
+            print(f"❌ LLM 호출 오류: {e}")
+            raise
+    
+    async def _acall_openai(self, messages, tools, bypass_cache: bool = False):
+        """OpenAI API 비동기 호출 (캐시 조회/저장은 스레드에서 실행)"""
+        call_kwargs = self._build_call_kwargs(messages, tools)
+        
+        cache, key, cached = await asyncio.to_thread(_cache_lookup, call_kwargs, bypass_cache)
+        if cached is not None:
+            return cached
+        
+        try:
+            with observe(LLM_SECONDS, mode="async"):
+                response = await get_async_client().chat.completions.create(**call_kwargs)
+            record_llm_usage(response.usage)
+            if cache is not None:
+                await asyncio.to_thread(cache.put, key, response.model_dump(mode="json"))
             return response
         except Exception as e:
+            LLM_ERRORS.labels(mode="async").inc()
             print(f"❌ LLM 호출 오류: {e}")
             raise
     
+    async def _astream_openai(self, messages, tools, on_token, bypass_cache: bool = False):
+        """
+        OpenAI API 스트리밍 호출
+        content 토큰은 도착 즉시 on_token으로 전달하고,
+        tool call 조각(delta)은 index별로 이어 붙여 완성된 AIMessage로 조립
+        캐시 hit이면 저장된 content를 한 번에 on_token으로 전달
+        """
+        call_kwargs = self._build_call_kwargs(messages, tools)
+        
+        cache, key, cached = await asyncio.to_thread(_cache_lookup, call_kwargs, bypass_cache)
+        if cached is not None:
+            if cached.choices[0].message.content:
+                on_token(cached.choices[0].message.content)
+            return self._convert_to_langchain_format(cached)
+        
+        call_kwargs["stream"] = True
+        call_kwargs["stream_options"] = {"include_usage": True}  # 마지막 청크에 토큰 사용량 포함
+        
+        started = time.perf_counter()
+        first_token_at = None
+        response_id = None
+        finish_reason = None
+        content_parts = []
+        tool_call_parts = {}  # index -> {"id", "name", "arguments"}
+        
+        try:
+            stream = await get_async_client().chat.completions.create(**call_kwargs)
+            # 중간에 취소(클라이언트 연결 종료)되거나 실패해도 응답을 닫아 HTTP 커넥션을 풀에 반납
+            async with stream:
+                async for chunk in stream:
+                    if chunk.usage:
+                        record_llm_usage(chunk.usage)
+                    if not chunk.choices:
+                        continue
+                    response_id = chunk.id
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta
+                    
+                    if first_token_at is None and (delta.content or delta.tool_calls):
+                        first_token_at = time.perf_counter()
+                        LLM_FIRST_TOKEN_SECONDS.observe(first_token_at - started)
+                    
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        on_token(delta.content)
+                    
+                    for tc in delta.tool_calls or []:
+                        part = tool_call_parts.setdefault(
+                            tc.index, {"id": None, "name": "", "arguments": ""}
+                        )
+                        if tc.id:
+                            part["id"] = tc.id
+                        if tc.function:
+                            if tc.function.name:
+                                part["name"] += tc.function.name
+                            if tc.function.arguments:
+                                part["arguments"] += tc.function.arguments
+        except Exception as e:
+            LLM_ERRORS.labels(mode="stream").inc()
+            print(f"❌ LLM 스트리밍 호출 오류: {e}")
+            raise
+        LLM_SECONDS.labels(mode="stream").observe(time.perf_counter() - started)
+        
+        content = "".join(content_parts)
+        
+        if cache is not None:
+            await asyncio.to_thread(
+                cache.put, key,
+                self._stream_to_completion(response_id, content, tool_call_parts, finish_reason)
+            )
+        
+        # Tool calls가 있으면
+        if tool_call_parts:
+            tool_calls = []
+            for _, part in sorted(tool_call_parts.items()):
+                tool_calls.append({
+                    "name": part["name"],
+                    "args": json.loads(part["arguments"] or "{}"),
+                    "id": part["id"]
+                })
+            
+            return AIMessage(content=content, tool_calls=tool_calls)
+        
+        # 일반 답변
+        return AIMessage(content=content)
+    
+    def _stream_to_completion(self, response_id, content, tool_call_parts, finish_reason) -> Dict:
+        """스트리밍으로 조립한 응답을 캐시 저장용 ChatCompletion dict로 변환"""
+        tool_calls = [
+            {
+                "id": part["id"],
+                "type": "function",
+                "function": {"name": part["name"], "arguments": part["arguments"] or "{}"},
+            }
+            for _, part in sorted(tool_call_parts.items())
+        ]
+        return {
+            "id": response_id or "stream",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": MODEL_NAME,
+            "choices": [{
+                "index": 0,
+                "finish_reason": finish_reason or ("tool_calls" if tool_calls else "stop"),
+                "message": {
+                    "role": "assistant",
+                    "content": content or None,
+                    "tool_calls": tool_calls or None,
+                },
+            }],
+        }
+    
     def _convert_to_langchain_format(self, response):
         """OpenAI 응답 → LangChain AIMessage"""
         assistant_message = response.choices[0].message
@@ -174,10 +433,13 @@ def call_llm(messages: list, tools: list = None, **kwargs):
     Args:
         messages: OpenAI 포맷 메시지
         tools: Tool spec 리스트
+        bypass_cache: True이면 LLM 응답 캐시를 조회하지 않고 새로 호출
     
     Returns:
         OpenAI ChatCompletion 객체
     """
+    bypass_cache = kwargs.pop("bypass_cache", False)
+    
     # System Prompt 추가
     try:
         from app.settings.prompts import SYSTEM_PROMPT
@@ -199,9 +461,19 @@ def call_llm(messages: list, tools: list = None, **kwargs):
     
     call_kwargs.update(kwargs)
     
+    # 스트리밍 호출은 캐시하지 않음
+    cache, key, cached = (None, None, None) if call_kwargs.get("stream") else _cache_lookup(call_kwargs, bypass_cache)
+    if cached is not None:
+        return cached
+    
     try:
-        response = client.chat.completions.create(**call_kwargs)
+        with observe(LLM_SECONDS, mode="sync"):
+            response = client.chat.completions.create(**call_kwargs)
+        record_llm_usage(getattr(response, "usage", None))  # 스트리밍 호출은 usage 없음
+        if cache is not None:
+            cache.put(key, response.model_dump(mode="json"))
         return response
     except Exception as e:
+        LLM_ERRORS.labels(mode="sync").inc()
         print(f"❌ LLM 호출 오류: {e}")
         raise
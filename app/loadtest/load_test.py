@@ -0,0 +1,125 @@
+"""
+Agent Load Test
+여러 세션을 동시에 컴파일된 LangGraph 그래프(run_agent와 같은 그래프)로 실행하고
+처리량과 노드별 p50/p95/p99 지연을 측정
+
+노드 지연은 stream_mode="updates" 이벤트 간격으로 계산합니다.
+(이 그래프는 노드가 순차 실행되므로 "이전 이벤트 → 노드 완료" 구간이 노드 실행 시간)
+
+사용법:
+    python -m app.loadtest.mock_openai --latency-ms 300 &
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock \\
+        python -m app.loadtest.load_test --sessions 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+import numpy as np
+
+QUESTIONS = [
+    "TCP 3-way handshake 과정을 설명해줘",
+    "페이지 교체 알고리즘 중 LRU의 장단점은?",
+    "프로세스와 스레드의 차이가 뭐야?",
+    "캐시 일관성 프로토콜 MESI를 설명해줘",
+    "데드락이 발생하는 네 가지 조건은?",
+]
+
+
+async def run_session(agent_app, question: str, node_latencies: Dict[str, List[float]]) -> float:
+    """세션 하나 실행 (첫 질문 1턴), 전체 지연(ms) 반환"""
+    from langchain_core.messages import HumanMessage
+
+    state = {
+        "messages": [HumanMessage(content=question)],
+        "lecture_index_status": "READY",
+        "long_term_memory_query": "",
+    }
+
+    started = last_event = time.perf_counter()
+    async for mode, chunk in agent_app.astream(state, stream_mode=["updates", "custom"]):
+        if mode != "updates":
+            continue
+        now = time.perf_counter()
+        for node_name in chunk:
+            node_latencies[node_name].append((now - last_event) * 1000)
+        last_event = now
+    return (time.perf_counter() - started) * 1000
+
+
+def percentiles(values: List[float]) -> str:
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return f"{p50:>9.1f} {p95:>9.1f} {p99:>9.1f}"
+
+
+async def run_load(sessions: int, concurrency: int, warmup: int) -> int:
+    from app.graph.app import create_agent_graph
+    from app.memory.reflection_queue import get_reflection_queue
+
+    agent_app = create_agent_graph()
+    reflection_queue = get_reflection_queue()
+    await reflection_queue.start()
+
+    # 워밍업 (임베딩 모델 로드 등 첫 호출 비용 제외)
+    for i in range(warmup):
+        await run_session(agent_app, f"워밍업 질문 {i}", defaultdict(list))
+
+    node_latencies: Dict[str, List[float]] = defaultdict(list)
+    session_latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker(i: int):
+        nonlocal errors
+        async with semaphore:
+            question = f"{QUESTIONS[i % len(QUESTIONS)]} (세션 {i})"
+            try:
+                session_latencies.append(await run_session(agent_app, question, node_latencies))
+            except Exception as e:
+                errors += 1
+                print(f"❌ 세션 {i} 실패: {e}")
+
+    print(f"🚀 세션 {sessions}개 실행 (동시 {concurrency})")
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    await reflection_queue.stop()
+
+    print(f"\n✅ 완료: {len(session_latencies)}개 성공, {errors}개 실패, {elapsed:.1f}s")
+    print(f"📈 처리량: {len(session_latencies) / elapsed:.2f} sessions/s")
+    if not session_latencies:
+        return 1
+
+    print(f"\n{'구간':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print(f"{'session (e2e)':<18} {len(session_latencies):>6} {percentiles(session_latencies)}")
+    for node_name in ("answer_cache_node", "llm_node", "tool_node", "reflection_node"):
+        values = node_latencies.get(node_name)
+        if values:
+            print(f"{node_name:<18} {len(values):>6} {percentiles(values)}")
+    return 0 if errors == 0 else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Agent 그래프 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=100, help="전체 세션 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 실행 세션 수")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 워밍업 세션 수")
+    parser.add_argument(
+        "--answer-cache", action="store_true",
+        help="의미 기반 답변 캐시 켜기 (ANSWER_CACHE_ENABLED 기본값도 꺼짐, "
+             "끄면 비슷한 질문도 LLM/Tool을 거쳐 지연이 측정됨)",
+    )
+    args = parser.parse_args(argv)
+
+    # settings가 import되기 전에 설정 (.env 값과 관계없이 플래그를 따름)
+    os.environ["ANSWER_CACHE_ENABLED"] = "true" if args.answer_cache else "false"
+
+    return asyncio.run(run_load(args.sessions, args.concurrency, args.warmup))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Mock OpenAI Server
+토큰 비용 없이 부하 테스트를 하기 위한 OpenAI 호환 /v1/chat/completions 서버
+
+스크립트된 응답:
+- tools가 있고 이번 턴에 아직 Tool 결과가 없으면 → --tools에 지정한 Tool 호출 (여러 개면 병렬 호출)
+- Tool 결과가 있거나 tools가 없으면 → --answer-tokens 단어 길이의 최종 답변
+응답 지연은 --latency-ms (첫 응답까지) + --token-delay-ms (스트리밍 청크 간격)로 조절
+
+사용법:
+    python -m app.loadtest.mock_openai [--port 8001] [--latency-ms 300] [--token-delay-ms 10] [--tools rag_search]
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=mock uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Dict, List
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Tool별 스크립트 인자 (질문 텍스트가 필요한 Tool은 query로 전달)
+SCRIPTED_TOOL_ARGS = {
+    "calculator": lambda question: {"expression": "2 + 2"},
+    "time_now": lambda question: {"action": "current"},
+    "write_memory": lambda question: {"summary": question[:100]},
+}
+
+
+class MockConfig:
+    latency_ms: float = 300.0
+    jitter_ms: float = 50.0
+    token_delay_ms: float = 10.0
+    answer_tokens: int = 60
+    tools: List[str] = ["rag_search"]
+
+
+config = MockConfig()
+app = FastAPI(title="Mock OpenAI")
+
+
+def _last_question(messages: List[Dict]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content") or ""
+    return ""
+
+
+def _script_response(body: Dict) -> Dict:
+    """요청에 대한 assistant 메시지 결정 ({"content", "tool_calls"})"""
+    messages = body.get("messages", [])
+    question = _last_question(messages)
+    offered = {tool["function"]["name"] for tool in body.get("tools") or []}
+
+    # 마지막 user 메시지 이후 Tool 결과가 없으면 Tool 호출
+    turn_has_tool_result = messages and messages[-1].get("role") == "tool"
+    scripted_tools = [name for name in config.tools if name in offered]
+    if scripted_tools and not turn_has_tool_result:
+        return {
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {
+                        "name": name,
+                        "arguments": json.dumps(
+                            SCRIPTED_TOOL_ARGS.get(name, lambda q: {"query": q})(question),
+                            ensure_ascii=False,
+                        ),
+                    },
+                }
+                for name in scripted_tools
+            ],
+        }
+
+    words = [f"(mock) '{question[:40]}'에 대한 답변입니다."]
+    words += [f"단어{i}" for i in range(max(0, config.answer_tokens - 1))]
+    return {"content": " ".join(words), "tool_calls": None}
+
+
+async def _first_byte_delay():
+    delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+    await asyncio.sleep(max(0.0, delay) / 1000)
+
+
+def _completion(model: str, message: Dict) -> Dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "tool_calls" if message["tool_calls"] else "stop",
+            "message": {"role": "assistant", **message},
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": config.answer_tokens, "total_tokens": config.answer_tokens},
+    }
+
+
+async def _stream(model: str, message: Dict):
+    """ChatCompletionChunk SSE 스트림"""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+    def chunk(delta: Dict, finish_reason=None) -> str:
+        data = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    await _first_byte_delay()
+    yield chunk({"role": "assistant", "content": ""})
+
+    if message["tool_calls"]:
+        yield chunk({
+            "tool_calls": [{"index": i, **tool_call} for i, tool_call in enumerate(message["tool_calls"])]
+        })
+        yield chunk({}, "tool_calls")
+    else:
+        for i, word in enumerate(message["content"].split(" ")):
+            yield chunk({"content": word if i == 0 else f" {word}"})
+            await asyncio.sleep(config.token_delay_ms / 1000)
+        yield chunk({}, "stop")
+
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "mock")
+    message = _script_response(body)
+
+    if body.get("stream"):
+        return StreamingResponse(_stream(model, message), media_type="text/event-stream")
+
+    await _first_byte_delay()
+    if not message["tool_calls"]:
+        await asyncio.sleep(config.token_delay_ms * config.answer_tokens / 1000)
+    return JSONResponse(_completion(model, message))
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="부하 테스트용 Mock OpenAI 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=config.latency_ms, help="첫 응답까지 지연")
+    parser.add_argument("--jitter-ms", type=float, default=config.jitter_ms, help="지연 랜덤 편차")
+    parser.add_argument("--token-delay-ms", type=float, default=config.token_delay_ms, help="답변 토큰 간 지연")
+    parser.add_argument("--answer-tokens", type=int, default=config.answer_tokens, help="최종 답변 단어 수")
+    parser.add_argument(
+        "--tools", default=",".join(config.tools),
+        help="턴마다 먼저 호출할 Tool (쉼표 구분, 빈 문자열이면 바로 답변)",
+    )
+    args = parser.parse_args(argv)
+
+    config.latency_ms = args.latency_ms
+    config.jitter_ms = args.jitter_ms
+    config.token_delay_ms = args.token_delay_ms
+    config.answer_tokens = args.answer_tokens
+    config.tools = [name.strip() for name in args.tools.split(",") if name.strip()]
+
+    print(f"🧪 Mock OpenAI 서버: http://{args.host}:{args.port}/v1 (tools={config.tools})")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Startup Benchmark
+서버 cold start 측정 (매번 새 Python 프로세스)
+
+- import: `import app.main` 시간 (--runs 회 중앙값) + 누적 import 시간이 큰 모듈 (-X importtime)
+- server: uvicorn 실행 → /healthz 응답까지 (요청 수신 가능) → /readyz 200까지 (워밍업 완료)
+          + 워밍업 단계별 소요 시간
+
+사용법:
+    python -m app.loadtest.startup_bench --runs 5
+    python -m app.loadtest.startup_bench --skip-server --top 20
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # OpenAI 클라이언트 생성에 키가 필요 (측정 중에는 LLM을 호출하지 않음)
+    env.setdefault("OPENAI_API_KEY", "mock")
+    return env
+
+
+def measure_import(runs: int) -> List[float]:
+    """새 프로세스에서 `import app.main` 시간 (초)"""
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            env=_env(), capture_output=True, text=True, check=True,
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def heaviest_imports(top: int) -> List[Tuple[str, float]]:
+    """
+    -X importtime 결과에서 app 코드가 직접 import한 외부 패키지별 누적 시간 (패키지 이름, ms)
+    (gradio가 내부에서 import한 fastapi 등은 gradio 시간에 포함)
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=_env(), capture_output=True, text=True, check=True,
+    ).stderr
+
+    # "import time: self [us] | cumulative | <들여쓰기><모듈>" (하위 import가 부모보다 먼저 출력됨)
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+
+    packages: Dict[str, float] = {}
+    ancestors: List[str] = []
+    for depth, name, ms in reversed(entries):
+        del ancestors[depth:]
+        package = name.split(".")[0]
+        if package != "app" and ancestors and all(a.split(".")[0] == "app" for a in ancestors):
+            packages[package] = packages.get(package, 0.0) + ms
+        ancestors.append(name)
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> Tuple[Optional[int], Optional[Dict]]:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None, None
+
+
+def measure_server(timeout: float) -> Dict:
+    """uvicorn 실행부터 /healthz, /readyz 응답까지 시간"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    started = time.perf_counter()
+    result = {"healthz_seconds": None, "readyz_seconds": None, "readiness": None}
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버 프로세스가 종료되었습니다 (exit code {process.returncode})")
+
+            if result["healthz_seconds"] is None:
+                status, _ = _get(f"{base_url}/healthz")
+                if status == 200:
+                    result["healthz_seconds"] = time.perf_counter() - started
+            else:
+                status, body = _get(f"{base_url}/readyz")
+                result["readiness"] = body
+                if status == 200:
+                    result["readyz_seconds"] = time.perf_counter() - started
+                    break
+                if body and body.get("status") == "failed":
+                    break
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="서버 cold start 측정")
+    parser.add_argument("--runs", type=int, default=3, help="import 측정 반복 횟수")
+    parser.add_argument("--top", type=int, default=10, help="출력할 무거운 import 개수")
+    parser.add_argument("--timeout", type=float, default=300.0, help="/readyz 대기 최대 시간 (초)")
+    parser.add_argument("--skip-server", action="store_true", help="import만 측정")
+    args = parser.parse_args(argv)
+
+    print(f"⏱️  import app.main ({args.runs}회)")
+    times = measure_import(args.runs)
+    print(f"   중앙값 {statistics.median(times):.2f}s (최소 {min(times):.2f}s, 최대 {max(times):.2f}s)")
+
+    print(f"\n📦 누적 import 시간 상위 {args.top}개")
+    for package, ms in heaviest_imports(args.top):
+        print(f"   {package:<28} {ms:>9.1f} ms")
+
+    if args.skip_server:
+        return 0
+
+    print("\n🚀 uvicorn 시작 → /healthz → /readyz")
+    result = measure_server(args.timeout)
+    if result["healthz_seconds"] is None:
+        print("❌ /healthz 응답 없음")
+        return 1
+    print(f"   /healthz 200: {result['healthz_seconds']:.2f}s")
+
+    readiness = result["readiness"] or {}
+    for step, seconds in readiness.get("steps", {}).items():
+        print(f"   워밍업 {step:<12} {seconds:.2f}s")
+    if result["readyz_seconds"] is None:
+        print(f"❌ 준비되지 않음 (status: {readiness.get('status')}, error: {readiness.get('error')})")
+        return 1
+    print(f"   /readyz 200: {result['readyz_seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,93 @@
-import uvicorn
-from fastapi import FastAPI
-from gradio.routes import mount_gradio_app
-from app.ui.gradio_app import create_gradio_interface
-
-# 1. FastAPI 애플리케이션 생성
-app = FastAPI(
-    title="AI Study Coach Agent Backend",
-    description="FastAPI server hosting the Gradio UI for the LangGraph Agent.",
-    version="1.0.0",
-)
-
-# 2. Gradio 인터페이스 생성
-gradio_app = create_gradio_interface()
-
-# 3. Gradio 애플리케이션을 FastAPI에 마운트
-# /gradio/ 경로로 접속하면 Gradio UI가 보입니다.
-app = mount_gradio_app(
-    app, 
-    gradio_app, 
-    path="/gradio"
-)
-
-# 루트 경로 ("/")로 접속하면 자동으로 Gradio UI로 리다이렉트되도록 설정 (선택 사항)
-@app.get("/")
-async def root():
-    return {"message": "Access the AI Study Coach UI at /gradio"}
-
-# 서버 실행 (개발 환경용)
-if __name__ == "__main__":
-    # `uvicorn.run()`을 사용하여 서버를 실행합니다.
-    # Gradio mount 시점과 uvicorn 실행 시점의 경로 처리가 중요합니다.
-    # uvicorn.run(app, host="0.0.0.0", port=8000)
-    print("FastAPI 서버 시작: http://127.0.0.1:8000/gradio")
-    print("LangGraph Agent가 준비되었습니다. 'uvicorn app.main:app --reload' 명령으로 실행하세요.")
+import asyncio
+import uvicorn
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from gradio.routes import mount_gradio_app
+from app import resources
+from app.api.chat import router as chat_router
+from app.api.index import router as index_router
+from app.graph.sessions import close_session_store
+from app.metrics import render_metrics
+from app.memory.reflection_queue import get_reflection_queue
+from app.rag.jobs import shutdown_index_job_queue
+from app.ui.gradio_app import create_gradio_interface
+from app.warmup import is_ready, readiness, warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 수명주기 훅
+    시작 시 Reflection 큐를 시작하고 워밍업(임베딩 모델, 컬렉션, 그래프 컴파일)을 백그라운드로 실행하며
+    (준비 완료는 /readyz로 확인), 종료 시 Reflection 큐를 flush하고 실행 중인 색인 작업을 마친 뒤
+    세션 DB, LLM 커넥션 풀과 공유 리소스를 해제합니다.
+    """
+    await get_reflection_queue().start()
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    if not warmup_task.done():
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    # 남은 Reflection을 먼저 저장한 뒤 LLM 커넥션과 공유 리소스를 해제
+    await get_reflection_queue().stop()
+    await asyncio.to_thread(shutdown_index_job_queue)
+    await close_session_store()
+    # LLM 클라이언트는 첫 사용 시 import되므로 종료 시에도 지연 import
+    from app.llm_client import aclose_async_client
+    await aclose_async_client()
+    resources.shutdown()
+
+
+# 1. FastAPI 애플리케이션 생성
+app = FastAPI(
+    title="AI Study Coach Agent Backend",
+    description="FastAPI server hosting the Gradio UI for the LangGraph Agent.",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Headless 채팅 API (POST /v1/chat, SSE 스트리밍)
+app.include_router(chat_router)
+# 백그라운드 PDF 색인 API (POST /v1/index, GET /v1/index/jobs/{job_id})
+app.include_router(index_router)
+
+# 2. Gradio 인터페이스 생성
+gradio_app = create_gradio_interface()
+
+# 3. Gradio 애플리케이션을 FastAPI에 마운트
+# /gradio/ 경로로 접속하면 Gradio UI가 보입니다.
+app = mount_gradio_app(
+    app, 
+    gradio_app, 
+    path="/gradio"
+)
+
+# 루트 경로 ("/")로 접속하면 자동으로 Gradio UI로 리다이렉트되도록 설정 (선택 사항)
+@app.get("/")
+async def root():
+    return {"message": "Access the AI Study Coach UI at /gradio"}
+
+# Liveness: 프로세스가 요청을 받을 수 있는지
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+# Readiness: 워밍업이 끝나 첫 요청도 로딩 지연 없이 처리할 수 있는지 (끝나기 전에는 503)
+@app.get("/readyz")
+async def readyz():
+    return JSONResponse(status_code=200 if is_ready() else 503, content=readiness())
+
+# Prometheus 메트릭 (노드 / Tool / 임베딩 / 벡터 검색 / LLM 지연)
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+# 서버 실행 (개발 환경용)
+if __name__ == "__main__":
+    # `uvicorn.run()`을 사용하여 서버를 실행합니다.
+    # Gradio mount 시점과 uvicorn 실행 시점의 경로 처리가 중요합니다.
+    # uvicorn.run(app, host="0.0.0.0", port=8000)
+    print("FastAPI 서버 시작: http://127.0.0.1:8000/gradio")
+    print("LangGraph Agent가 준비되었습니다. 'uvicorn app.main:app --reload' 명령으로 실행하세요.")
@@ -2,14 +2,14 @@
 Memory Reflection
 대화 내용을 분석하여 중요한 정보 추출
 """
-from app.memory.store import MemoryStore
+from app.resources import get_memory_store
 from typing import List, Dict
 
 class MemoryReflection:
     """메모리 반영 시스템"""
     
     def __init__(self):
-        self.store = MemoryStore()
+        self.store = get_memory_store()
     
     def reflect_and_save(self, summary: str, tags: List[str] = None) -> str:
         """
@@ -34,6 +34,31 @@ class MemoryReflection:
         
         return memory_id
     
+    def reflect_and_save_batch(self, items: List[Dict]) -> List[str]:
+        """
+        여러 Reflection 결과를 한 번에 저장 (백그라운드 Reflection 큐에서 사용)
+        
+        Args:
+            items: [{"summary": str, "tags": [...]}, ...]
+        
+        Returns:
+            저장된 메모리 ID 리스트
+        """
+        entries = []
+        for item in items:
+            metadata = {}
+            
+            if item.get("tags"):
+                metadata["tags"] = item["tags"]
+            
+            entries.append((item["summary"], metadata))
+        
+        memory_ids = self.store.add_memories(entries)
+        
+        print(f"💾 Reflection 일괄 저장 완료: {len(memory_ids)}건")
+        
+        return memory_ids
+    
     def get_relevant_context(self, query: str, top_k: int = 3) -> str:
         """
         현재 질문과 관련된 과거 메모리 가져오기
@@ -0,0 +1,177 @@
+"""
+Background Reflection Queue
+최종 답변 이후의 Reflection(LLM 요약 + 장기 메모리 저장)을 응답 경로 밖에서 처리
+"""
+import asyncio
+from typing import List, Optional
+from app.memory.reflection import MemoryReflection
+from app.settings import (
+    REFLECTION_QUEUE_SIZE,
+    REFLECTION_WORKERS,
+    REFLECTION_ENQUEUE_TIMEOUT_SECONDS,
+    REFLECTION_BATCH_SIZE,
+    REFLECTION_FLUSH_INTERVAL_SECONDS,
+    REFLECTION_SHUTDOWN_TIMEOUT_SECONDS,
+)
+
+
+class ReflectionQueue:
+    """
+    대화 기록을 받아 워커 풀에서 Reflection을 수행하는 bounded 큐
+
+    - submit: 큐가 가득 차면 최대 REFLECTION_ENQUEUE_TIMEOUT_SECONDS 동안 대기 (backpressure)
+    - workers: Reflection LLM 호출 후 저장할 요약을 쓰기 큐에 전달
+    - writer: 요약을 모아 MemoryStore.add_memories로 일괄 저장
+    """
+
+    def __init__(
+        self,
+        maxsize: int = REFLECTION_QUEUE_SIZE,
+        workers: int = REFLECTION_WORKERS,
+        batch_size: int = REFLECTION_BATCH_SIZE,
+        flush_interval: float = REFLECTION_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._writes: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.dropped = 0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """워커/라이터 태스크 시작 (실행 중인 이벤트 루프에서 호출)"""
+        if self.started:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._writes = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"reflection-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._writer(), name="reflection-writer"))
+        print(f"🪞 Reflection 큐 시작 (workers={self.workers}, maxsize={self.maxsize})")
+
+    async def submit(self, messages: list) -> bool:
+        """
+        완료된 대화 기록을 Reflection 큐에 추가
+
+        Args:
+            messages: LangChain 메시지 리스트 (대화 전체)
+
+        Returns:
+            큐에 들어갔으면 True, 큐가 계속 가득 차 있어 드롭했으면 False
+        """
+        if not self.started:
+            await self.start()
+
+        try:
+            await asyncio.wait_for(
+                self._queue.put(list(messages)),
+                timeout=REFLECTION_ENQUEUE_TIMEOUT_SECONDS,
+            )
+            return True
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            print(f"⚠️ Reflection 큐가 가득 차 대화를 건너뜁니다. (누적 드롭: {self.dropped})")
+            return False
+
+    async def stop(self, timeout: float = REFLECTION_SHUTDOWN_TIMEOUT_SECONDS):
+        """
+        남은 Reflection을 모두 처리(flush)한 뒤 태스크 종료
+
+        Args:
+            timeout: flush 최대 대기 시간 (초)
+        """
+        if not self.started:
+            return
+
+        try:
+            await asyncio.wait_for(self._flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Reflection flush 시간 초과: 대기 중 {self._queue.qsize()}건을 버립니다.")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print("🪞 Reflection 큐 종료")
+
+    async def _flush(self):
+        await self._queue.join()
+        await self._writes.join()
+
+    async def _worker(self):
+        while True:
+            messages = await self._queue.get()
+            try:
+                await self._reflect(messages)
+            except Exception as e:
+                print(f"❌ Reflection 실행 오류: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _reflect(self, messages: list):
+        """Reflection LLM 호출 후 write_memory 요청이 있으면 쓰기 큐에 전달"""
+        from app.llm_client import llm_for_reflection
+
+        reflection_response = await llm_for_reflection.ainvoke({"messages": messages})
+
+        for tool_call in reflection_response.tool_calls or []:
+            if tool_call["name"] != "write_memory":
+                continue
+
+            tool_args = tool_call["args"]
+            print(f"Reflection Tool 호출: write_memory with args: {tool_args}")
+            if tool_args.get("summary"):
+                await self._writes.put({
+                    "summary": tool_args["summary"],
+                    "tags": tool_args.get("tags"),
+                })
+            return
+
+        print("Reflection LLM이 'write_memory' Tool을 호출하지 않았습니다. 메모리 저장을 건너뜁니다.")
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._writes.get()]
+
+            # flush_interval 동안 batch_size까지 모아서 한 번에 저장
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._writes.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                # 임베딩 + Chroma 쓰기는 블로킹이므로 스레드에서 실행
+                await asyncio.to_thread(MemoryReflection().reflect_and_save_batch, batch)
+            except Exception as e:
+                print(f"❌ Reflection 메모리 저장 오류: {e}")
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+
+
+# 프로세스 전역 Reflection 큐
+_reflection_queue: Optional[ReflectionQueue] = None
+
+
+def get_reflection_queue() -> ReflectionQueue:
+    """공유 Reflection 큐 반환"""
+    global _reflection_queue
+    if _reflection_queue is None:
+        _reflection_queue = ReflectionQueue()
+    return _reflection_queue
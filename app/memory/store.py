@@ -2,30 +2,31 @@
 Long-term Memory Store
 Chroma DB를 사용한 장기 메모리 저장
 """
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-from app.settings import CHROMA_PERSIST_DIR, EMBEDDING_MODEL
-from typing import List, Dict
+from app.resources import (
+    get_collection,
+    reset_collection,
+    get_embedder,
+    get_collection_version,
+    bump_collection_version,
+    collection_write_lock,
+)
+from app.query_cache import encode_query, get_cached_results, put_cached_results
+from app.metrics import VECTOR_QUERY_SECONDS, observe
+from typing import List, Dict, Tuple
 from datetime import datetime
 import json
 import uuid
 
+COLLECTION_NAME = "long_term_memory"
+
 class MemoryStore:
     """장기 메모리 저장소"""
     
     def __init__(self):
-        self.client = chromadb.PersistentClient(
-            path=CHROMA_PERSIST_DIR,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # 프로세스 공유 컬렉션 / 임베딩 모델 사용 (백엔드는 VECTOR_BACKEND 설정)
+        self.collection = get_collection(COLLECTION_NAME)
         
-        self.collection = self.client.get_or_create_collection(
-            name="long_term_memory",
-            metadata={"hnsw:space": "cosine"}
-        )
-        
-        self.embedder = SentenceTransformer(EMBEDDING_MODEL)
+        self.embedder = get_embedder()
     
     def add_memory(self, content: str, metadata: dict = None) -> str:
         """
@@ -38,27 +39,49 @@ class MemoryStore:
         Returns:
             메모리 ID
         """
-        # Timestamp 자동 추가
-        if metadata is None:
-            metadata = {}
+        return self.add_memories([(content, metadata)])[0]
+    
+    def add_memories(self, items: List[Tuple[str, dict]]) -> List[str]:
+        """
+        메모리 일괄 추가 (한 번의 임베딩 배치 + 한 번의 Chroma 쓰기)
         
-        metadata["timestamp"] = datetime.now().isoformat()
+        Args:
+            items: [(content, metadata), ...]
+        
+        Returns:
+            메모리 ID 리스트
+        """
+        if not items:
+            return []
+        
+        timestamp = datetime.now().isoformat()
+        
+        contents = []
+        metadatas = []
+        for content, metadata in items:
+            # Timestamp 자동 추가
+            metadata = dict(metadata or {})
+            metadata["timestamp"] = timestamp
+            contents.append(content)
+            metadatas.append(metadata)
         
         # Embedding 생성
-        embedding = self.embedder.encode([content]).tolist()[0]
+        embeddings = self.embedder.encode(contents).tolist()
         
         # ID 생성 (UUID 사용)
-        memory_id = str(uuid.uuid4())
-        
-        # Chroma에 저장
-        self.collection.add(
-            ids=[memory_id],
-            embeddings=[embedding],
-            documents=[content],
-            metadatas=[metadata]
-        )
-        
-        return memory_id
+        memory_ids = [str(uuid.uuid4()) for _ in items]
+        
+        # Chroma에 저장 (여러 워커가 동시에 Reflection을 저장해도 덮어쓰지 않도록 lock)
+        with collection_write_lock(COLLECTION_NAME):
+            self.collection.add(
+                ids=memory_ids,
+                embeddings=embeddings,
+                documents=contents,
+                metadatas=metadatas
+            )
+            bump_collection_version(COLLECTION_NAME)
+        
+        return memory_ids
     
     def search_memory(self, query: str, top_k: int = 5) -> List[Dict]:
         """
@@ -71,14 +94,21 @@ class MemoryStore:
         Returns:
             관련 메모리 리스트
         """
-        # Query embedding
-        query_embedding = self.embedder.encode([query]).tolist()
+        # 같은 (쿼리, top_k, 컬렉션 버전)이면 캐시된 결과 반환
+        cache_key = (COLLECTION_NAME, get_collection_version(COLLECTION_NAME), query, top_k)
+        cached = get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Query embedding (LRU)
+        query_embedding = [encode_query(self.embedder, query)]
         
         # 검색
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=top_k
-        )
+        with observe(VECTOR_QUERY_SECONDS, collection=COLLECTION_NAME):
+            results = self.collection.query(
+                query_embeddings=query_embedding,
+                n_results=top_k
+            )
         
         # 결과 포맷팅
         memories = []
@@ -90,6 +120,7 @@ class MemoryStore:
                 "similarity": 1 - results["distances"][0][i]  # cosine similarity
             })
         
+        put_cached_results(cache_key, memories)
         return memories
     
     def get_recent_memories(self, limit: int = 10) -> List[Dict]:
@@ -127,8 +158,6 @@ class MemoryStore:
     
     def clear_all(self):
         """모든 메모리 삭제"""
-        self.client.delete_collection("long_term_memory")
-        self.collection = self.client.get_or_create_collection(
-            name="long_term_memory",
-            metadata={"hnsw:space": "cosine"}
-        )
\ No newline at end of file
+        with collection_write_lock(COLLECTION_NAME):
+            self.collection = reset_collection(COLLECTION_NAME)
+            bump_collection_version(COLLECTION_NAME)
\ No newline at end of file
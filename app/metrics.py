@@ -0,0 +1,86 @@
+"""
+Prometheus Metrics
+그래프 노드 / Tool / 임베딩 / 벡터 검색 / LLM 지연과 카운터 (FastAPI /metrics로 노출)
+"""
+import functools
+import time
+from contextlib import contextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+# 지연 bucket (초): 임베딩/검색처럼 ms 단위부터 LLM처럼 수십 초까지
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+GRAPH_NODE_SECONDS = Histogram(
+    "agent_graph_node_seconds", "LangGraph 노드 실행 시간", ["node"], buckets=LATENCY_BUCKETS
+)
+
+TOOL_SECONDS = Histogram(
+    "agent_tool_seconds", "execute_tool 실행 시간", ["tool"], buckets=LATENCY_BUCKETS
+)
+TOOL_CALLS = Counter(
+    "agent_tool_calls_total", "Tool 호출 수 (status: success / error / timeout)", ["tool", "status"]
+)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "embedding_batch_size", "모델 forward pass 한 번의 텍스트 수", ["backend"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+EMBEDDING_SECONDS = Histogram(
+    "embedding_seconds", "모델 forward pass 시간", ["backend"], buckets=LATENCY_BUCKETS
+)
+
+VECTOR_QUERY_SECONDS = Histogram(
+    "vector_query_seconds", "벡터 컬렉션 query 시간", ["collection"], buckets=LATENCY_BUCKETS
+)
+
+LLM_SECONDS = Histogram(
+    "llm_request_seconds", "LLM 호출 시간 (mode: sync / async / stream)", ["mode"], buckets=LATENCY_BUCKETS
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "llm_first_token_seconds", "스트리밍 LLM 호출의 첫 토큰까지 시간", buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "LLM 사용 토큰 수 (kind: prompt / completion)", ["kind"]
+)
+LLM_ERRORS = Counter("llm_errors_total", "LLM 호출 오류 수", ["mode"])
+LLM_CACHE_HITS = Counter("llm_cache_hits_total", "LLM 응답 캐시 hit 수")
+
+ANSWER_CACHE_LOOKUPS = Counter(
+    "answer_cache_lookups_total", "답변 캐시 조회 수 (result: hit / miss)", ["result"]
+)
+ANSWER_CACHE_SAVED_SECONDS = Counter(
+    "answer_cache_saved_seconds_total", "답변 캐시 hit으로 절약한 지연 합계"
+)
+
+
+@contextmanager
+def observe(histogram: Histogram, **labels):
+    """with 블록 실행 시간을 histogram에 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric = histogram.labels(**labels) if labels else histogram
+        metric.observe(time.perf_counter() - started)
+
+
+def timed_node(name: str, node):
+    """비동기 그래프 노드 실행 시간 기록 래퍼"""
+    @functools.wraps(node)
+    async def wrapper(state):
+        with observe(GRAPH_NODE_SECONDS, node=name):
+            return await node(state)
+    return wrapper
+
+
+def record_llm_usage(usage):
+    """OpenAI 응답의 usage(prompt/completion 토큰) 기록"""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(kind="prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(kind="completion").inc(usage.completion_tokens or 0)
+
+
+def render_metrics():
+    """Prometheus text format (body, content type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,79 @@
+"""
+Query Cache
+프로세스 내 쿼리 임베딩 LRU / 검색 결과 캐시
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List
+from app.settings import QUERY_EMBEDDING_CACHE_SIZE, SEARCH_RESULT_CACHE_SIZE
+
+
+class LRUCache:
+    """thread-safe LRU 캐시"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# 쿼리 임베딩: (모델 이름, 쿼리) → 벡터
+query_embeddings = LRUCache(QUERY_EMBEDDING_CACHE_SIZE)
+
+# 검색 결과: (컬렉션, 컬렉션 버전, 쿼리, top_k) → 결과 리스트
+search_results = LRUCache(SEARCH_RESULT_CACHE_SIZE)
+
+
+def encode_query(embedder, query: str) -> List[float]:
+    """
+    쿼리 임베딩 (같은 쿼리는 LRU에서 바로 반환)
+
+    Args:
+        embedder: get_embedder()가 반환한 임베딩 모델
+        query: 검색어
+
+    Returns:
+        임베딩 벡터 (list)
+    """
+    key = (embedder.model_name, query)
+    embedding = query_embeddings.get(key)
+    if embedding is None:
+        embedding = embedder.encode([query]).tolist()[0]
+        query_embeddings.put(key, embedding)
+    return embedding
+
+
+def get_cached_results(key: Hashable):
+    """캐시된 검색 결과 (호출자가 수정해도 캐시가 바뀌지 않도록 복사본 반환)"""
+    results = search_results.get(key)
+    return copy.deepcopy(results) if results is not None else None
+
+
+def put_cached_results(key: Hashable, results: list):
+    search_results.put(key, copy.deepcopy(results))
@@ -0,0 +1,214 @@
+"""
+Bulk PDF Indexer
+여러 PDF(디렉토리/glob)를 프로세스 풀에서 병렬 파싱하고, 단일 배치 임베딩 단계로 색인
+
+사용법:
+    python -m app.rag.bulk <디렉토리|glob|PDF> [...] [--workers N] [--batch-size N] [--force]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List
+import PyPDF2
+from app.rag.indexer import PDFIndexer, batched
+from app.rag.manifest import file_signature, get_index_manifest
+from app.resources import index_write_lock
+from app.settings import BULK_INDEX_WORKERS, BULK_EMBED_BATCH_SIZE
+
+# 워커 프로세스별 PDFIndexer (텍스트 분할기만 사용, 임베딩 모델은 로드하지 않음)
+_worker_indexer = None
+
+
+def _parse_pdf(pdf_path: str) -> Dict:
+    """
+    (워커 프로세스) PDF 한 개를 페이지 단위로 추출하고 청크로 분할
+
+    Returns:
+        {"path", "source", "pages", "documents"}
+    """
+    global _worker_indexer
+    if _worker_indexer is None:
+        _worker_indexer = PDFIndexer()
+
+    source = Path(pdf_path).name
+    with open(pdf_path, "rb") as file:
+        reader = PyPDF2.PdfReader(file)
+        pages = _worker_indexer.iter_pages(reader)
+        documents = list(_worker_indexer.iter_chunks(pages, source))
+        page_count = len(reader.pages)
+
+    return {"path": pdf_path, "source": source, "pages": page_count, "documents": documents}
+
+
+def resolve_pdf_paths(inputs: Iterable[str]) -> List[str]:
+    """디렉토리(재귀), glob 패턴, 파일 경로를 PDF 파일 목록으로 변환"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(
+                str(p) for p in Path(item).rglob("*")
+                if p.is_file() and p.suffix.lower() == ".pdf"
+            )
+        elif glob.has_magic(item):
+            paths.extend(
+                p for p in glob.glob(item, recursive=True)
+                if os.path.isfile(p) and p.lower().endswith(".pdf")
+            )
+        elif os.path.isfile(item):
+            paths.append(item)
+        else:
+            print(f"⚠️ 경로를 찾을 수 없습니다: {item}")
+
+    # 중복 제거 (같은 파일이 여러 입력에 걸린 경우)
+    return sorted({os.path.abspath(p) for p in paths})
+
+
+def bulk_index(
+    inputs: Iterable[str],
+    workers: int = BULK_INDEX_WORKERS,
+    batch_size: int = BULK_EMBED_BATCH_SIZE,
+    force: bool = False,
+) -> Dict:
+    """
+    PDF 일괄 색인
+
+    - 파싱/분할: 프로세스 풀 (CPU 코어 병렬)
+    - 임베딩/저장: 메인 프로세스에서 batch_size 단위로 ChromaStore에 추가
+    - 재개/증분: 파일 단위로 완료 시 내용 해시를 manifest에 기록, 다음 실행에서 건너뜀
+      청크 ID가 내용 기반이므로 바뀐 청크만 임베딩하고, 사라진 청크는 삭제
+
+    Args:
+        inputs: 디렉토리 / glob / PDF 경로 목록
+        workers: 파싱 프로세스 수
+        batch_size: 임베딩 배치 크기
+        force: manifest를 무시하고 모두 다시 색인
+
+    Returns:
+        {"files", "skipped", "failed", "pages", "chunks", "embedded", "seconds"}
+    """
+    pdf_paths = resolve_pdf_paths(inputs)
+    manifest = get_index_manifest()
+    store = PDFIndexer().store
+
+    stats = {
+        "files": 0, "skipped": 0, "failed": 0,
+        "pages": 0, "chunks": 0, "embedded": 0, "seconds": 0.0,
+    }
+
+    todo = []
+    seen_sources = set()
+    for path in pdf_paths:
+        source = Path(path).name
+        if source in seen_sources:
+            print(f"⚠️ 같은 파일 이름이 이미 있어 건너뜁니다: {path}")
+            stats["skipped"] += 1
+            continue
+        seen_sources.add(source)
+
+        signature = file_signature(path)
+        if not force and manifest.is_indexed(source, signature):
+            stats["skipped"] += 1
+            continue
+        todo.append((path, signature))
+
+    print(f"📚 PDF {len(pdf_paths)}개 발견 → 색인 {len(todo)}개, 건너뜀 {stats['skipped']}개")
+    if not todo:
+        return stats
+
+    started = time.perf_counter()
+    buffer: List[Dict] = []
+    pending: List[tuple] = []  # buffer에 청크가 모두 들어간 파일 (source, signature, chunk_ids)
+
+    def flush():
+        # 서버 워커의 색인 작업과 동시에 쓰지 않도록 flush 단위로 single writer lock
+        with index_write_lock():
+            with store.deferred_writes():
+                for batch in batched(buffer, batch_size):
+                    stats["embedded"] += store.upsert_documents(batch)["added"]
+                buffer.clear()
+
+                # buffer를 모두 저장했으므로 pending 파일은 색인 완료 → 이전 버전 청크 삭제
+                for source, signature, chunk_ids in pending:
+                    store.delete_ids(store.get_source_ids(source) - chunk_ids)
+
+            # 컬렉션 저장이 끝난 뒤 manifest에 완료 기록
+            for source, signature, chunk_ids in pending:
+                manifest.mark_indexed(source, signature, len(chunk_ids))
+            pending.clear()
+            store.save_lexical_index()
+            manifest.save()
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"⏱️  {stats['files']}/{len(todo)} 파일 | {stats['pages']} 페이지, {stats['chunks']} 청크 | "
+            f"{stats['pages'] / elapsed:.1f} pages/s, {stats['chunks'] / elapsed:.1f} chunks/s "
+            f"(새 임베딩 {stats['embedded']})"
+        )
+
+    # 파싱 결과가 임베딩보다 빨리 쌓이지 않도록 동시에 진행 중인 파일 수를 제한
+    max_in_flight = max(1, workers) * 2
+    queue = iter(todo)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+
+        def submit_next():
+            for path, signature in queue:
+                in_flight[pool.submit(_parse_pdf, path)] = (path, signature)
+                return
+
+        for _ in range(max_in_flight):
+            submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, signature = in_flight.pop(future)
+                submit_next()
+
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    print(f"❌ PDF 파싱 실패: {path} ({e})")
+                    stats["failed"] += 1
+                    continue
+
+                buffer.extend(parsed["documents"])
+                pending.append((
+                    parsed["source"],
+                    signature,
+                    {doc["id"] for doc in parsed["documents"]},
+                ))
+                stats["files"] += 1
+                stats["pages"] += parsed["pages"]
+                stats["chunks"] += len(parsed["documents"])
+
+                if len(buffer) >= batch_size:
+                    flush()
+
+    if buffer or pending:
+        flush()
+
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    print(
+        f"✅ 일괄 색인 완료: {stats['files']} 파일, {stats['pages']} 페이지, {stats['chunks']} 청크 "
+        f"({stats['seconds']}s, 실패 {stats['failed']}, 건너뜀 {stats['skipped']})"
+    )
+    return stats
+
+
+# CLI 사용
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="강의 PDF 일괄 색인")
+    parser.add_argument("inputs", nargs="+", help="PDF 파일, 디렉토리 또는 glob 패턴 (예: 'lectures/**/*.pdf')")
+    parser.add_argument("--workers", type=int, default=BULK_INDEX_WORKERS, help="파싱 프로세스 수")
+    parser.add_argument("--batch-size", type=int, default=BULK_EMBED_BATCH_SIZE, help="임베딩 배치 크기")
+    parser.add_argument("--force", action="store_true", help="이미 색인된 파일도 다시 색인")
+    args = parser.parse_args()
+
+    result = bulk_index(args.inputs, workers=args.workers, batch_size=args.batch_size, force=args.force)
+    sys.exit(1 if result["failed"] else 0)
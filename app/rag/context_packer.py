@@ -0,0 +1,131 @@
+"""
+RAG Context Packer
+검색된 청크를 토큰 예산 안에서 LLM 컨텍스트로 구성
+
+1. 검색 순위대로 청크를 통째로 담음 (예산을 넘는 청크는 건너뛰고 다음 청크 시도)
+2. 내용이 같거나 다른 청크에 포함되는 중복 청크 제거
+3. 같은 출처의 연속된 청크(chunk_id)는 하나로 합치고 50자 overlap 제거
+4. 합친 블록은 가장 높은 순위 청크의 순서대로 출력
+"""
+from typing import Dict, List
+from app.tokenizer import count_tokens
+from app.settings import RAG_CONTEXT_TOKEN_BUDGET
+
+# 청크 분할 overlap(50자)보다 넉넉하게 겹침 탐색
+MAX_OVERLAP_CHARS = 100
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _is_duplicate(content: str, selected: List[Dict]) -> bool:
+    """이미 담은 청크와 내용이 같거나 서로 포함 관계이면 중복"""
+    normalized = _normalize(content)
+    for doc in selected:
+        other = doc["normalized"]
+        if normalized in other or other in normalized:
+            return True
+    return False
+
+
+def _remove_overlap(previous: str, current: str) -> str:
+    """previous의 끝과 current의 시작이 겹치는 부분을 current에서 제거"""
+    limit = min(len(previous), len(current), MAX_OVERLAP_CHARS)
+    for size in range(limit, 0, -1):
+        if previous.endswith(current[:size]):
+            return current[size:]
+    return current
+
+
+def _source_label(metadata_list: List[Dict]) -> str:
+    source = metadata_list[0].get("source", "Unknown")
+    pages = sorted({m["page"] for m in metadata_list if m.get("page")})
+    if not pages:
+        return source
+    if len(pages) == 1:
+        return f"{source}, p.{pages[0]}"
+    return f"{source}, p.{pages[0]}-{pages[-1]}"
+
+
+def _merge_adjacent(selected: List[Dict]) -> List[Dict]:
+    """같은 출처의 연속된 청크를 블록으로 합침 (블록 순위 = 가장 높은 청크 순위)"""
+    by_source: Dict[str, List[Dict]] = {}
+    for doc in selected:
+        by_source.setdefault(doc["metadata"].get("source", "Unknown"), []).append(doc)
+
+    blocks = []
+    for docs in by_source.values():
+        docs.sort(key=lambda d: (d["metadata"].get("chunk_id") is None, d["metadata"].get("chunk_id", 0)))
+        current = None
+        for doc in docs:
+            chunk_id = doc["metadata"].get("chunk_id")
+            if (
+                current is not None
+                and chunk_id is not None
+                and current["last_chunk_id"] is not None
+                and chunk_id == current["last_chunk_id"] + 1
+            ):
+                current["content"] += _remove_overlap(current["content"], doc["content"])
+                current["metadatas"].append(doc["metadata"])
+                current["rank"] = min(current["rank"], doc["rank"])
+                current["last_chunk_id"] = chunk_id
+            else:
+                current = {
+                    "content": doc["content"],
+                    "metadatas": [doc["metadata"]],
+                    "rank": doc["rank"],
+                    "last_chunk_id": chunk_id,
+                }
+                blocks.append(current)
+
+    blocks.sort(key=lambda block: block["rank"])
+    return blocks
+
+
+def pack_context(documents: List[Dict], budget: int = RAG_CONTEXT_TOKEN_BUDGET) -> Dict:
+    """
+    검색 결과를 토큰 예산 안의 컨텍스트로 구성
+
+    Args:
+        documents: 관련도 순 검색 결과 [{"content", "metadata", ...}, ...]
+        budget: 청크 본문에 쓸 최대 토큰 수
+
+    Returns:
+        {
+            "blocks": [{"source": str, "content": str}, ...],
+            "tokens_used": int,
+            "chunks_used": int,
+            "chunks_skipped": int  # 중복 또는 예산 초과로 제외된 청크 수
+        }
+    """
+    selected = []
+    tokens_used = 0
+    for rank, doc in enumerate(documents):
+        content = doc.get("content") or ""
+        if not content.strip() or _is_duplicate(content, selected):
+            continue
+
+        tokens = count_tokens(content)
+        if tokens_used + tokens > budget:
+            continue
+
+        selected.append({
+            "content": content,
+            "normalized": _normalize(content),
+            "metadata": doc.get("metadata") or {},
+            "rank": rank,
+        })
+        tokens_used += tokens
+
+    blocks = [
+        {"source": _source_label(block["metadatas"]), "content": block["content"].strip()}
+        for block in _merge_adjacent(selected)
+    ]
+
+    return {
+        "blocks": blocks,
+        "tokens_used": sum(count_tokens(block["content"]) for block in blocks),
+        "chunks_used": len(selected),
+        "chunks_skipped": len(documents) - len(selected),
+    }
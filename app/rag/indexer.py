@@ -3,32 +3,57 @@ PDF Indexer
 PDF 파일을 읽어서 Chroma DB에 저장
 """
 import PyPDF2
+from itertools import islice
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from app.rag.store import ChromaStore
+from app.resources import get_lecture_store, index_write_lock
+from app.rag.manifest import chunk_document_id, file_signature, get_index_manifest
+from app.settings import INDEX_BATCH_SIZE
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """이터러블을 size 크기의 리스트 배치로 나눔 (마지막 배치는 더 작을 수 있음)"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class PDFIndexer:
     """PDF 색인"""
     
-    def __init__(self):
-        self.store = ChromaStore()
+    def __init__(self, batch_size: int = INDEX_BATCH_SIZE):
+        self._store = None
+        self.batch_size = batch_size
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=500,
             chunk_overlap=50,
             separators=["\n\n", "\n", " ", ""]
         )
     
+    @property
+    def store(self):
+        """공유 ChromaStore (텍스트 추출/분할만 하는 경우 로드하지 않음)"""
+        if self._store is None:
+            self._store = get_lecture_store()
+        return self._store
+    
+    def iter_pages(self, reader: PyPDF2.PdfReader) -> Iterator[Tuple[int, str]]:
+        """PDF 페이지 단위 텍스트 추출 (페이지 번호는 1부터)"""
+        for page_num, page in enumerate(reader.pages, 1):
+            yield page_num, page.extract_text() or ""
+    
     def extract_text(self, pdf_path: str) -> str:
         """PDF에서 텍스트 추출"""
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            text = ""
-            
-            for page_num, page in enumerate(reader.pages):
-                page_text = page.extract_text()
-                text += f"\n[페이지 {page_num + 1}]\n{page_text}"
-        
-        return text
+            return "".join(
+                f"\n[페이지 {page_num}]\n{page_text}"
+                for page_num, page_text in self.iter_pages(reader)
+            )
     
     def chunk_text(self, text: str, source: str) -> list:
         """텍스트를 청크로 분할"""
@@ -46,28 +71,112 @@ class PDFIndexer:
         
         return documents
     
-    def index_pdf(self, pdf_path: str) -> int:
+    def iter_chunks(self, pages: Iterable[Tuple[int, str]], source: str) -> Iterator[Dict]:
+        """
+        페이지 스트림을 청크 스트림으로 변환
+        페이지 번호를 메타데이터로 유지하고, 내용 기반의 결정적 ID를 부여합니다.
+        """
+        chunk_id = 0
+        occurrences: Dict[str, int] = {}
+        for page_num, page_text in pages:
+            for chunk in self.text_splitter.split_text(page_text):
+                occurrence = occurrences.get(chunk, 0)
+                occurrences[chunk] = occurrence + 1
+                yield {
+                    "id": chunk_document_id(source, chunk, occurrence),
+                    "content": chunk,
+                    "metadata": {
+                        "source": source,
+                        "chunk_id": chunk_id,
+                        "page": page_num
+                    }
+                }
+                chunk_id += 1
+    
+    def index_pdf(
+        self,
+        pdf_path: str,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        force: bool = False,
+    ) -> int:
         """
-        PDF 색인
+        PDF 색인 (스트리밍 + 증분 파이프라인)
+        페이지 추출 → 청크 분할 → batch_size 단위 임베딩 → Chroma 배치 추가
+        
+        - 파일 내용 해시가 manifest와 같으면 전체를 건너뜀
+        - 청크 ID가 내용 기반이므로 바뀐 청크만 새로 임베딩
+        - 이전 버전에만 있던 청크는 마지막에 삭제
+        - 색인 구간은 index_write_lock()으로 프로세스 간 직렬화
         
         Args:
             pdf_path: PDF 파일 경로
+            on_progress: 배치마다 호출되는 콜백
+                         {"source", "pages_done", "pages_total", "chunks_done", "chunks_embedded"}
+            force: 내용이 같아도 다시 색인
         
         Returns:
-            색인된 청크 개수
+            현재 버전 파일의 청크 개수
         """
-        print(f"📄 PDF 읽는 중: {pdf_path}")
-        text = self.extract_text(pdf_path)
-        
-        print(f"✂️  텍스트 분할 중...")
         source = Path(pdf_path).name
-        documents = self.chunk_text(text, source)
-        
-        print(f"💾 Chroma DB에 저장 중... ({len(documents)} 청크)")
-        self.store.add_documents(documents)
+        manifest = get_index_manifest()
+        signature = file_signature(pdf_path)
         
-        print(f"✅ 색인 완료!")
-        return len(documents)
+        # 다른 워커 프로세스 / 일괄 색인과 동시에 쓰지 않도록 single writer lock
+        with index_write_lock():
+            if not force and manifest.is_indexed(source, signature):
+                chunks = manifest.get(source)["chunks"]
+                print(f"⏭️  변경 없는 파일이라 색인을 건너뜁니다: {source} ({chunks} 청크)")
+                return chunks
+            
+            print(f"📄 PDF 색인 시작: {pdf_path}")
+            seen_ids = set()
+            
+            # NumPy 백엔드는 배치마다 파일을 다시 쓰지 않고 작업이 끝날 때 한 번 저장
+            with self.store.deferred_writes():
+                with open(pdf_path, 'rb') as file:
+                    reader = PyPDF2.PdfReader(file)
+                    progress = {
+                        "source": source,
+                        "pages_done": 0,
+                        "pages_total": len(reader.pages),
+                        "chunks_done": 0,
+                        "chunks_embedded": 0,
+                    }
+                    
+                    def pages():
+                        for page_num, page_text in self.iter_pages(reader):
+                            yield page_num, page_text
+                            progress["pages_done"] = page_num
+                    
+                    for batch in batched(self.iter_chunks(pages(), source), self.batch_size):
+                        counts = self.store.upsert_documents(batch)
+                        seen_ids.update(doc["id"] for doc in batch)
+                        progress["chunks_done"] += len(batch)
+                        progress["chunks_embedded"] += counts["added"]
+                        
+                        if on_progress:
+                            on_progress(dict(progress))
+                        else:
+                            print(
+                                f"💾 {progress['pages_done']}/{progress['pages_total']} 페이지, "
+                                f"{progress['chunks_done']} 청크 처리 (새 임베딩 {progress['chunks_embedded']})"
+                            )
+                
+                # 이전 버전에만 있던 청크 삭제
+                stale_ids = self.store.get_source_ids(source) - seen_ids
+                self.store.delete_ids(stale_ids)
+                
+                # Chroma 컬렉션 옆에 BM25 역색인 저장
+                self.store.save_lexical_index()
+            
+            manifest.mark_indexed(source, signature, progress["chunks_done"])
+            manifest.save()
+            
+            print(
+                f"✅ 색인 완료! 청크 {progress['chunks_done']}개 "
+                f"(새 임베딩 {progress['chunks_embedded']}, 삭제 {len(stale_ids)})"
+            )
+            return progress["chunks_done"]
 
 def index_pdf_file(file_path: str) -> bool:
     """
@@ -96,6 +205,7 @@ if __name__ == "__main__":
     
     if len(sys.argv) < 2:
         print("사용법: python -m app.rag.indexer <PDF 파일 경로>")
+        print("여러 파일/디렉토리 일괄 색인: python -m app.rag.bulk <디렉토리|glob> ...")
         sys.exit(1)
     
     pdf_path = sys.argv[1]
@@ -0,0 +1,183 @@
+"""
+Index Job Queue
+PDF 색인을 요청 경로 밖의 bounded 워커 풀에서 실행하고 진행 상황(페이지, 청크, ETA)을 조회
+
+- submit: 작업 ID를 바로 반환 (브라우저 연결이 끊겨도 색인은 계속 진행)
+- 같은 파일(내용 SHA-256)이 대기/실행 중이면 새 작업을 만들지 않고 기존 작업을 반환
+- 끝난 작업은 최근 INDEX_JOB_HISTORY개만 보관
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.rag.manifest import file_signature
+from app.settings import INDEX_JOB_WORKERS, INDEX_JOB_HISTORY
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class IndexJobQueue:
+    """PDF 색인 작업 큐 (스레드 풀, 파일 해시 기준 중복 병합)"""
+
+    def __init__(self, workers: int = INDEX_JOB_WORKERS, history: int = INDEX_JOB_HISTORY):
+        self.workers = workers
+        self.history = history
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._active_by_hash: Dict[str, str] = {}  # sha256 → 대기/실행 중인 job_id
+        self._lock = threading.Lock()
+
+    def submit(self, pdf_path: str, force: bool = False) -> Dict:
+        """
+        PDF 색인 작업 추가
+
+        Args:
+            pdf_path: PDF 파일 경로 (작업이 끝날 때까지 파일이 남아 있어야 함)
+            force: 내용이 같아도 다시 색인
+
+        Returns:
+            작업 상태 (status()와 같은 형식, 중복이면 기존 작업)
+        """
+        sha256 = file_signature(pdf_path)["sha256"]
+
+        with self._lock:
+            active_id = self._active_by_hash.get(sha256)
+            if active_id is not None:
+                print(f"🔁 같은 파일의 색인 작업이 이미 진행 중입니다: {active_id}")
+                return self._snapshot(self._jobs[active_id])
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "source": Path(pdf_path).name,
+                "sha256": sha256,
+                "status": QUEUED,
+                "pages_done": 0,
+                "pages_total": None,
+                "chunks_done": 0,
+                "chunks_embedded": 0,
+                "error": None,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+            }
+            self._jobs[job["job_id"]] = job
+            self._active_by_hash[sha256] = job["job_id"]
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="index-job")
+            self._executor.submit(self._run, job["job_id"], pdf_path, force)
+
+            print(f"📥 색인 작업 추가: {job['source']} ({job['job_id']})")
+            return self._snapshot(job)
+
+    def _run(self, job_id: str, pdf_path: str, force: bool):
+        """(워커 스레드) 색인 실행 및 진행 상황 기록"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = RUNNING
+            job["started_at"] = time.time()
+
+        def on_progress(progress: Dict):
+            with self._lock:
+                for key in ("pages_done", "pages_total", "chunks_done", "chunks_embedded"):
+                    job[key] = progress[key]
+
+        try:
+            # PyPDF2 / 텍스트 분할기는 첫 색인 작업에서 로드
+            from app.rag.indexer import PDFIndexer
+
+            chunks = PDFIndexer().index_pdf(pdf_path, on_progress=on_progress, force=force)
+            with self._lock:
+                job["status"] = DONE
+                job["chunks_done"] = chunks
+                if job["pages_total"] is not None:
+                    job["pages_done"] = job["pages_total"]
+            print(f"✅ 색인 작업 완료: {job['source']} ({chunks} 청크)")
+        except Exception as e:
+            with self._lock:
+                job["status"] = FAILED
+                job["error"] = str(e)
+            print(f"❌ 색인 작업 실패: {job['source']} ({e})")
+        finally:
+            with self._lock:
+                job["finished_at"] = time.time()
+                self._active_by_hash.pop(job["sha256"], None)
+                self._prune()
+
+    def _prune(self):
+        """끝난 작업 중 오래된 것부터 삭제 (lock 안에서 호출)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in (DONE, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def _snapshot(self, job: Dict) -> Dict:
+        """작업 상태 복사본 + 경과 시간 / ETA (lock 안에서 호출)"""
+        snapshot = dict(job)
+        now = time.time()
+        started_at = job["started_at"]
+        end = job["finished_at"] or now
+
+        snapshot["elapsed_seconds"] = round(end - started_at, 1) if started_at else 0.0
+        snapshot["eta_seconds"] = None
+        if job["status"] == RUNNING and job["pages_total"] and job["pages_done"]:
+            # 지금까지의 페이지 처리 속도로 남은 시간 추정
+            rate = (now - started_at) / job["pages_done"]
+            snapshot["eta_seconds"] = round(rate * (job["pages_total"] - job["pages_done"]), 1)
+        elif job["status"] in (DONE, FAILED):
+            snapshot["eta_seconds"] = 0.0
+        return snapshot
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """
+        작업 상태 조회
+
+        Returns:
+            {"job_id", "source", "sha256", "status", "pages_done", "pages_total",
+             "chunks_done", "chunks_embedded", "error", "elapsed_seconds", "eta_seconds", ...}
+            (없는 작업이면 None)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def list_jobs(self) -> List[Dict]:
+        """보관 중인 작업 목록 (최근 작업부터)"""
+        with self._lock:
+            return [self._snapshot(job) for job in reversed(self._jobs.values())]
+
+    def shutdown(self, wait: bool = True):
+        """워커 풀 종료 (대기 중인 작업은 취소)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# 프로세스 전역 작업 큐 (Gradio 업로드와 /v1/index API가 공유)
+_job_queue: Optional[IndexJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_index_job_queue() -> IndexJobQueue:
+    """공유 IndexJobQueue 반환"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = IndexJobQueue()
+    return _job_queue
+
+
+def shutdown_index_job_queue():
+    """서버 종료 시 워커 풀 정리 (실행 중인 작업은 끝날 때까지 대기)"""
+    global _job_queue
+    if _job_queue is not None:
+        _job_queue.shutdown()
+        _job_queue = None
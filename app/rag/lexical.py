@@ -0,0 +1,206 @@
+"""
+Lexical BM25 Index
+강의 청크에 대한 역색인 (정확한 용어 검색용, 임베딩 모델 불필요)
+"""
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 영문/숫자는 단어 단위, 한글/한자/가나는 문자 n-gram 단위로 토큰화
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\uac00-\ud7a3]+|[\u3040-\u30ff\u4e00-\u9fff]+")
+
+
+def tokenize(text: str, ngram: int = 2) -> List[str]:
+    """
+    BM25용 토큰화
+    - 영문/숫자: 소문자 단어 ("TCP 3-way" → tcp, 3, way)
+    - 한글 등: 문자 n-gram ("핸드셰이크" → 핸드, 드셰, 셰이, 이크)
+      조사/어미가 붙어도 어간 n-gram이 겹치므로 형태소 분석 없이 매칭됨
+    """
+    tokens = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if run.isascii():
+            # 한 글자 영문("Belady's"의 s 등)은 의미가 없어 제외, 숫자는 유지
+            if len(run) > 1 or run.isdigit():
+                tokens.append(run)
+        elif len(run) <= ngram:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + ngram] for i in range(len(run) - ngram + 1))
+    return tokens
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """색인 파일 상태 (mtime_ns, 크기, inode), 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class BM25Index:
+    """
+    디스크에 저장되는 BM25 역색인
+    문서(id, content, metadata)만 JSON으로 저장하고, 로드 시 역색인을 다시 만든다.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._loaded_stamp: Optional[Tuple[int, int, int]] = None
+        self._dirty = False
+        self.load()
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def load(self):
+        """디스크에서 로드 (다른 프로세스가 갱신했으면 다시 읽음)"""
+        with self._lock:
+            self._docs, self._postings, self._total_length = {}, {}, 0
+            stamp = _file_stamp(self.path)
+            if stamp is None:
+                self._loaded_stamp = None
+                return
+
+            with open(self.path, "r", encoding="utf-8") as f:
+                docs = json.load(f)
+            for doc_id, doc in docs.items():
+                self._index(doc_id, doc["content"], doc.get("metadata", {}))
+            self._loaded_stamp = stamp
+            self._dirty = False
+
+    def _reload_if_changed(self):
+        if self._dirty:
+            return
+        stamp = _file_stamp(self.path)
+        if stamp is not None and stamp != self._loaded_stamp:
+            self.load()
+
+    def _index(self, doc_id: str, content: str, metadata: Dict):
+        tf = Counter(tokenize(content))
+        length = sum(tf.values())
+        self._docs[doc_id] = {"content": content, "metadata": metadata, "length": length}
+        self._total_length += length
+        for term, count in tf.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+
+    def _unindex(self, doc_id: str):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc["length"]
+        for term in set(tokenize(doc["content"])):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def add(self, ids: List[str], contents: List[str], metadatas: List[Dict]):
+        """문서 추가 (같은 ID가 있으면 교체)"""
+        with self._lock:
+            self._reload_if_changed()
+            for doc_id, content, metadata in zip(ids, contents, metadatas):
+                self._unindex(doc_id)
+                self._index(doc_id, content, metadata or {})
+            self._dirty = True
+
+    def update_metadata(self, ids: List[str], metadatas: List[Dict]):
+        """내용은 그대로 두고 metadata만 갱신"""
+        with self._lock:
+            self._reload_if_changed()
+            for doc_id, metadata in zip(ids, metadatas):
+                if doc_id in self._docs:
+                    self._docs[doc_id]["metadata"] = metadata or {}
+            self._dirty = True
+
+    def remove(self, ids: Iterable[str]):
+        """문서 삭제"""
+        with self._lock:
+            self._reload_if_changed()
+            for doc_id in ids:
+                self._unindex(doc_id)
+            self._dirty = True
+
+    def clear(self):
+        """모든 문서 삭제"""
+        with self._lock:
+            self._docs, self._postings, self._total_length = {}, {}, 0
+            self._dirty = True
+
+    def save(self):
+        """변경 사항이 있으면 원자적으로 저장"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                doc_id: {"content": doc["content"], "metadata": doc["metadata"]}
+                for doc_id, doc in self._docs.items()
+            }
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            stamp = _file_stamp(tmp_path)
+            os.replace(tmp_path, self.path)
+            self._loaded_stamp = stamp
+            self._dirty = False
+
+    def search(self, query: str, top_k: int = 3) -> List[Dict]:
+        """
+        BM25 검색
+
+        Returns:
+            [{"id", "content", "metadata", "score", "coverage"}, ...]
+            coverage: 질의 토큰 중 문서에 등장한 비율 (1.0이면 모든 용어 일치)
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        with self._lock:
+            self._reload_if_changed()
+            n_docs = len(self._docs)
+            if n_docs == 0:
+                return []
+            avg_length = self._total_length / n_docs
+
+            scores: Dict[str, float] = {}
+            matched: Dict[str, int] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self._docs[doc_id]["length"]
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+                    matched[doc_id] = matched.get(doc_id, 0) + 1
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+            return [
+                {
+                    "id": doc_id,
+                    "content": self._docs[doc_id]["content"],
+                    "metadata": dict(self._docs[doc_id]["metadata"]),
+                    "score": score,
+                    "coverage": matched[doc_id] / len(query_terms),
+                }
+                for doc_id, score in ranked
+            ]
@@ -0,0 +1,161 @@
+"""
+Index Manifest
+색인이 끝난 PDF 파일 목록과 내용 해시를 디스크에 기록 (재개 / 변경 없는 파일 건너뛰기)
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from app.settings import CHROMA_PERSIST_DIR
+
+MANIFEST_PATH = os.path.join(CHROMA_PERSIST_DIR, "index_manifest.json")
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """manifest 파일 상태 (mtime_ns, 크기, inode) - save()가 파일을 교체하면 inode가 바뀜, 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class IndexManifest:
+    """
+    source(파일 이름) → 색인 정보 매핑을 JSON 파일로 관리
+    파일 단위로 색인이 "완료"된 뒤에만 기록하므로, 기록된 파일은 다시 색인할 필요가 없음
+    다른 프로세스(워커 / 일괄 색인)가 저장한 내용은 파일이 교체되면 (mtime_ns / 크기 / inode) 다시 읽음
+    """
+
+    def __init__(self, path: str = MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded_stamp: Optional[Tuple[int, int, int]] = None
+        self._dirty = False
+        self._entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        stamp = _file_stamp(self.path)
+        if stamp is None:
+            self._loaded_stamp = None
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            self._loaded_stamp = stamp
+            return entries
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 색인 manifest를 읽을 수 없어 새로 시작합니다: {e}")
+            return {}
+
+    def _reload_if_changed(self):
+        """(lock 안에서 호출) 저장하지 않은 변경이 없고 파일이 바뀌었으면 다시 읽기"""
+        if self._dirty:
+            return
+        stamp = _file_stamp(self.path)
+        if stamp is not None and stamp != self._loaded_stamp:
+            self._entries = self._load()
+
+    def get(self, source: str) -> Optional[Dict]:
+        """source의 색인 정보 반환 (없으면 None)"""
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(source)
+            return dict(entry) if entry else None
+
+    def is_indexed(self, source: str, signature: Dict) -> bool:
+        """같은 signature로 색인이 완료된 파일인지 확인"""
+        entry = self.get(source)
+        return bool(entry) and entry.get("signature") == signature
+
+    def mark_indexed(self, source: str, signature: Dict, chunks: int):
+        """파일 색인 완료 기록"""
+        with self._lock:
+            self._reload_if_changed()
+            self._dirty = True
+            self._entries[source] = {
+                "signature": signature,
+                "chunks": chunks,
+                "indexed_at": datetime.now().isoformat(),
+            }
+
+    def remove(self, source: str):
+        """파일 색인 기록 삭제"""
+        with self._lock:
+            self._reload_if_changed()
+            self._dirty = True
+            self._entries.pop(source, None)
+
+    def clear(self):
+        """모든 기록 삭제"""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+        self.save()
+
+    def fingerprint(self) -> str:
+        """색인된 파일 목록 + 내용 해시의 요약 (강의 색인 내용이 바뀌면 달라짐)"""
+        with self._lock:
+            self._reload_if_changed()
+            items = sorted(
+                (source, entry.get("signature", {}).get("sha256", ""))
+                for source, entry in self._entries.items()
+            )
+        return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()[:16]
+
+    def save(self):
+        """
+        원자적으로 디스크에 저장 (임시 파일 작성 후 교체)
+        여러 프로세스가 색인하는 경우 index_write_lock() 안에서 호출해야 다른 프로세스의 기록을 덮어쓰지 않음
+        """
+        with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False, indent=2)
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            stamp = _file_stamp(tmp_path)
+            os.replace(tmp_path, self.path)
+            self._loaded_stamp = stamp
+            self._dirty = False
+
+
+def file_signature(path: str) -> Dict:
+    """파일 변경 여부 판단용 signature (내용 SHA-256)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return {"sha256": digest.hexdigest()}
+
+
+def chunk_document_id(source: str, content: str, occurrence: int = 0) -> str:
+    """
+    청크의 결정적(deterministic) ID
+    같은 파일의 같은 내용이면 재색인해도 같은 ID가 나오므로, 바뀐 청크만 다시 임베딩할 수 있음
+
+    Args:
+        source: 파일 이름
+        content: 청크 내용
+        occurrence: 같은 파일 안에서 동일한 내용이 반복될 때의 순번
+    """
+    key = f"{source}\x00{occurrence}\x00{content}".encode("utf-8")
+    return hashlib.sha256(key).hexdigest()[:32]
+
+
+# 프로세스 전역 manifest (UI 업로드와 일괄 색인이 같은 기록을 공유)
+_manifest: Optional[IndexManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_index_manifest() -> IndexManifest:
+    """공유 IndexManifest 반환"""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = IndexManifest()
+    return _manifest
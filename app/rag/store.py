@@ -2,35 +2,70 @@
 Chroma DB Store
 벡터 DB 저장 및 검색
 """
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-from app.settings import CHROMA_PERSIST_DIR, EMBEDDING_MODEL
-from typing import List, Dict
+from app.resources import (
+    get_collection,
+    reset_collection,
+    get_embedder,
+    get_collection_version,
+    bump_collection_version,
+    index_write_lock,
+)
+from app.rag.manifest import get_index_manifest
+from app.rag.lexical import BM25Index
+from app.query_cache import encode_query, get_cached_results, put_cached_results
+from app.metrics import VECTOR_QUERY_SECONDS, observe
+from app.settings import (
+    CHROMA_PERSIST_DIR,
+    RAG_SEARCH_MODE,
+    LEXICAL_FAST_PATH_MIN_COVERAGE,
+    RRF_K,
+)
+from contextlib import nullcontext
+from typing import List, Dict, Set
+import os
+import time
 import uuid
 
+COLLECTION_NAME = "lecture_materials"
+LEXICAL_INDEX_PATH = os.path.join(CHROMA_PERSIST_DIR, f"bm25_{COLLECTION_NAME}.json")
+
 class ChromaStore:
     """Chroma DB 래퍼"""
     
     def __init__(self):
-        self.client = chromadb.PersistentClient(
-            path=CHROMA_PERSIST_DIR,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # 프로세스 공유 컬렉션 / 임베딩 모델 사용 (백엔드는 VECTOR_BACKEND 설정)
+        self.collection = get_collection(COLLECTION_NAME)
         
-        self.collection = self.client.get_or_create_collection(
-            name="lecture_materials",
-            metadata={"hnsw:space": "cosine"}
-        )
+        # Chroma 컬렉션 옆에 저장되는 BM25 역색인
+        self.lexical = BM25Index(LEXICAL_INDEX_PATH)
+        if not self.lexical.exists and self.collection.count() > 0:
+            # 여러 워커가 동시에 시작해도 한 프로세스만 생성
+            with index_write_lock():
+                self.lexical.load()
+                if not self.lexical.exists:
+                    self.rebuild_lexical_index()
         
-        self.embedder = SentenceTransformer(EMBEDDING_MODEL)
+        # 검색 경로별 호출 수 / 누적 시간 (lexical fast path로 절약한 지연 측정용)
+        self.search_stats = {
+            mode: {"count": 0, "total_ms": 0.0}
+            for mode in ("vector", "lexical", "hybrid", "lexical_fast_path")
+        }
+        
+        self._embedder = None
+    
+    @property
+    def embedder(self):
+        """공유 임베딩 모델 (lexical 검색만 하는 경우 로드하지 않음)"""
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
     
     def add_documents(self, documents: List[Dict]) -> int:
         """
         문서 추가
         
         Args:
-            documents: [{"content": str, "metadata": dict}, ...]
+            documents: [{"content": str, "metadata": dict, "id": str(선택)}, ...]
         
         Returns:
             추가된 문서 개수
@@ -42,22 +77,86 @@ class ChromaStore:
         texts = [doc["content"] for doc in documents]
         embeddings = self.embedder.encode(texts).tolist()
         
-        # ID 생성 (UUID로 충돌 방지)
-        ids = [str(uuid.uuid4()) for _ in documents]
+        # ID 준비 (지정된 ID가 없으면 UUID로 충돌 방지)
+        ids = [doc.get("id") or str(uuid.uuid4()) for doc in documents]
         
         # Metadata 준비
         metadatas = [doc.get("metadata", {}) for doc in documents]
         
-        # Chroma에 추가
+        # Chroma + BM25 역색인에 추가
         self.collection.add(
             ids=ids,
             embeddings=embeddings,
             documents=texts,
             metadatas=metadatas
         )
+        self.lexical.add(ids, texts, metadatas)
+        bump_collection_version(COLLECTION_NAME)
         
         return len(documents)
     
+    def upsert_documents(self, documents: List[Dict]) -> Dict[str, int]:
+        """
+        ID가 지정된 문서 추가/갱신
+        이미 있는 ID는 임베딩을 다시 계산하지 않고 metadata만 갱신합니다.
+        
+        Args:
+            documents: [{"id": str, "content": str, "metadata": dict}, ...]
+        
+        Returns:
+            {"added": 새로 임베딩한 개수, "updated": 재사용한 개수}
+        """
+        if not documents:
+            return {"added": 0, "updated": 0}
+        
+        ids = [doc["id"] for doc in documents]
+        existing = set(self.collection.get(ids=ids, include=[])["ids"])
+        
+        new_documents = [doc for doc in documents if doc["id"] not in existing]
+        old_documents = [doc for doc in documents if doc["id"] in existing]
+        
+        self.add_documents(new_documents)
+        
+        if old_documents:
+            old_ids = [doc["id"] for doc in old_documents]
+            old_metadatas = [doc.get("metadata", {}) for doc in old_documents]
+            self.collection.update(ids=old_ids, metadatas=old_metadatas)
+            self.lexical.update_metadata(old_ids, old_metadatas)
+            bump_collection_version(COLLECTION_NAME)
+        
+        return {"added": len(new_documents), "updated": len(old_documents)}
+    
+    def get_source_ids(self, source: str) -> Set[str]:
+        """특정 파일(source)에 속한 청크 ID 집합"""
+        return set(self.collection.get(where={"source": source}, include=[])["ids"])
+    
+    def delete_ids(self, ids: List[str]):
+        """청크 ID로 삭제"""
+        if ids:
+            self.collection.delete(ids=list(ids))
+            self.lexical.remove(ids)
+            bump_collection_version(COLLECTION_NAME)
+    
+    def deferred_writes(self):
+        """
+        색인 작업 동안의 컬렉션 쓰기를 모아 작업이 끝날 때 한 번 저장 (NumPy 백엔드)
+        Chroma 컬렉션은 쓰기마다 저장하므로 아무것도 하지 않음
+        """
+        deferred = getattr(self.collection, "deferred_writes", None)
+        return deferred() if deferred else nullcontext()
+    
+    def save_lexical_index(self):
+        """BM25 역색인을 디스크에 저장 (색인 작업 마지막에 호출)"""
+        self.lexical.save()
+    
+    def rebuild_lexical_index(self):
+        """Chroma 컬렉션 전체로 BM25 역색인 재생성 (기존 색인 데이터 마이그레이션용)"""
+        print("🔤 BM25 역색인 생성 중...")
+        data = self.collection.get(include=["documents", "metadatas"])
+        self.lexical.clear()
+        self.lexical.add(data["ids"], data["documents"], data["metadatas"])
+        self.lexical.save()
+    
     def search_documents(self, query: str, top_k: int = 3) -> List[Dict]:
         """
         문서 검색
@@ -69,30 +168,99 @@ class ChromaStore:
         Returns:
             [{"content": str, "metadata": dict, "distance": float}, ...]
         """
-        # Query embedding
-        query_embedding = self.embedder.encode([query]).tolist()
+        # 같은 (쿼리, top_k, 컬렉션 버전)이면 캐시된 결과 반환
+        cache_key = (COLLECTION_NAME, get_collection_version(COLLECTION_NAME), query, top_k)
+        cached = get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Query embedding (LRU)
+        query_embedding = [encode_query(self.embedder, query)]
         
         # 검색
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=top_k
-        )
+        with observe(VECTOR_QUERY_SECONDS, collection=COLLECTION_NAME):
+            results = self.collection.query(
+                query_embeddings=query_embedding,
+                n_results=top_k
+            )
         
         # 결과 포맷팅
         documents = []
         for i in range(len(results["ids"][0])):
             documents.append({
+                "id": results["ids"][0][i],
                 "content": results["documents"][0][i],
                 "metadata": results["metadatas"][0][i],
                 "distance": results["distances"][0][i]
             })
         
+        put_cached_results(cache_key, documents)
+        return documents
+    
+    def search(self, query: str, top_k: int = 3, mode: str = None) -> List[Dict]:
+        """
+        검색 모드에 따른 문서 검색
+        
+        Args:
+            query: 검색어
+            top_k: 결과 개수
+            mode: "vector" | "lexical" | "hybrid" (기본값: settings.RAG_SEARCH_MODE)
+                  hybrid는 BM25 결과가 질의 용어를 모두 포함하면 벡터 검색을 생략하고(lexical fast path),
+                  아니면 BM25 + 벡터 순위를 Reciprocal Rank Fusion으로 합칩니다.
+        
+        Returns:
+            관련도 순 [{"id", "content", "metadata", "distance" 또는 "score"}, ...]
+        """
+        mode = mode or RAG_SEARCH_MODE
+        started = time.perf_counter()
+        
+        if mode == "vector":
+            documents = self.search_documents(query, top_k=top_k)
+        elif mode == "lexical":
+            documents = self.lexical.search(query, top_k=top_k)
+        elif mode == "hybrid":
+            documents, mode = self._search_hybrid(query, top_k)
+        else:
+            raise ValueError(f"알 수 없는 검색 모드: {mode}")
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self.search_stats[mode]
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        print(f"🔎 검색 완료 ({mode}, {elapsed_ms:.1f}ms)")
+        
         return documents
     
+    def _search_hybrid(self, query: str, top_k: int):
+        """BM25 + 벡터 검색 결합 (실제로 사용된 경로 이름도 함께 반환)"""
+        candidates = top_k * 2
+        lexical_docs = self.lexical.search(query, top_k=candidates)
+        
+        # Fast path: 정확한 용어 질의는 임베딩 없이 BM25 결과만 사용
+        top_lexical = lexical_docs[:top_k]
+        if len(top_lexical) == top_k and all(
+            doc["coverage"] >= LEXICAL_FAST_PATH_MIN_COVERAGE for doc in top_lexical
+        ):
+            return top_lexical, "lexical_fast_path"
+        
+        vector_docs = self.search_documents(query, top_k=candidates)
+        
+        # Reciprocal Rank Fusion
+        fused: Dict[str, Dict] = {}
+        scores: Dict[str, float] = {}
+        for ranking in (lexical_docs, vector_docs):
+            for rank, doc in enumerate(ranking):
+                scores[doc["id"]] = scores.get(doc["id"], 0.0) + 1.0 / (RRF_K + rank + 1)
+                fused.setdefault(doc["id"], {}).update(doc)
+        
+        ranked_ids = sorted(scores, key=scores.get, reverse=True)[:top_k]
+        return [fused[doc_id] for doc_id in ranked_ids], "hybrid"
+    
     def clear(self):
-        """모든 문서 삭제"""
-        self.client.delete_collection("lecture_materials")
-        self.collection = self.client.get_or_create_collection(
-            name="lecture_materials",
-            metadata={"hnsw:space": "cosine"}
-        )
\ No newline at end of file
+        """모든 문서 삭제 (색인 manifest도 함께 초기화)"""
+        with index_write_lock():
+            get_index_manifest().clear()
+            self.collection = reset_collection(COLLECTION_NAME)
+            self.lexical.clear()
+            self.lexical.save()
+            bump_collection_version(COLLECTION_NAME)
\ No newline at end of file
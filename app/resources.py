@@ -0,0 +1,288 @@
+"""
+Shared Resources Registry
+프로세스 전역에서 공유하는 임베딩 모델 / 벡터 컬렉션 / Store 관리
+"""
+import os
+import threading
+from typing import Dict, List
+from app.settings import (
+    CHROMA_PERSIST_DIR,
+    CHROMA_MODE,
+    CHROMA_HOST,
+    CHROMA_PORT,
+    VECTOR_SYNC_DIR,
+    EMBEDDING_MODEL,
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_ENABLED,
+    EMBED_BATCHING_ENABLED,
+    VECTOR_BACKEND,
+)
+
+_lock = threading.RLock()
+_embedder = None
+_clients: Dict[str, object] = {}
+_collections: Dict[str, object] = {}
+_stores: Dict[str, object] = {}
+_file_locks: Dict[str, object] = {}
+
+# reset_collection에서 한 번에 삭제하는 ID 수
+RESET_BATCH_SIZE = 1000
+
+
+class SharedEmbedder:
+    """
+    SentenceTransformer 래퍼
+    프로세스당 한 번만 모델을 로드하고, 여러 스레드의 encode 호출을 직렬화
+    """
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self._lock = threading.Lock()
+
+    def encode(self, texts: List[str], **kwargs):
+        """
+        텍스트 임베딩 (thread-safe)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            numpy 배열 (len(texts) x dim)
+        """
+        from app.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_SECONDS, observe
+
+        EMBEDDING_BATCH_SIZE.labels(backend="torch").observe(len(texts))
+        with self._lock, observe(EMBEDDING_SECONDS, backend="torch"):
+            return self.model.encode(texts, **kwargs)
+
+
+def get_embedder():
+    """
+    공유 임베딩 모델 반환 (최초 호출 시 로드)
+    EMBEDDING_BACKEND에 따라 SharedEmbedder(PyTorch) 또는 OnnxEmbedder(ONNX Runtime)
+    EMBED_BATCHING_ENABLED이면 동시 요청을 micro-batch로 묶는 BatchingEmbedder를,
+    EMBEDDING_CACHE_ENABLED이면 그 앞에 디스크 임베딩 캐시(CachedEmbedder)를 둔다.
+    (CachedEmbedder → BatchingEmbedder → 모델)
+    """
+    global _embedder
+    if _embedder is None:
+        with _lock:
+            if _embedder is None:
+                print(f"🧠 임베딩 모델 로드 중: {EMBEDDING_MODEL} ({EMBEDDING_BACKEND})")
+                if EMBEDDING_BACKEND == "onnx":
+                    from app.embeddings.onnx_backend import OnnxEmbedder
+                    embedder = OnnxEmbedder(EMBEDDING_MODEL)
+                elif EMBEDDING_BACKEND == "torch":
+                    embedder = SharedEmbedder(EMBEDDING_MODEL)
+                else:
+                    raise ValueError(f"지원하지 않는 EMBEDDING_BACKEND: {EMBEDDING_BACKEND}")
+
+                if EMBED_BATCHING_ENABLED:
+                    from app.embeddings.batcher import BatchingEmbedder
+                    embedder = BatchingEmbedder(embedder)
+
+                if EMBEDDING_CACHE_ENABLED:
+                    from app.embeddings.cache import CachedEmbedder, EmbeddingCache
+                    cache = EmbeddingCache(embedder.model_name, embedder.dimension)
+                    embedder = CachedEmbedder(embedder, cache)
+
+                _embedder = embedder
+    return _embedder
+
+
+def get_chroma_client(persist_dir: str = CHROMA_PERSIST_DIR):
+    """
+    Chroma 클라이언트 반환
+    - CHROMA_MODE="persistent": persist 디렉토리당 하나의 PersistentClient (단일 프로세스 전용)
+    - CHROMA_MODE="http": CHROMA_HOST:CHROMA_PORT의 Chroma 서버에 접속하는 HttpClient
+      (서버 한 프로세스만 데이터를 열기 때문에 여러 uvicorn 워커가 동시에 검색/색인 가능)
+    """
+    if CHROMA_MODE == "http":
+        key = f"http://{CHROMA_HOST}:{CHROMA_PORT}"
+    elif CHROMA_MODE == "persistent":
+        key = os.path.abspath(persist_dir)
+    else:
+        raise ValueError(f"지원하지 않는 CHROMA_MODE: {CHROMA_MODE}")
+
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                import chromadb
+                from chromadb.config import Settings
+
+                if CHROMA_MODE == "http":
+                    client = chromadb.HttpClient(
+                        host=CHROMA_HOST,
+                        port=CHROMA_PORT,
+                        settings=Settings(anonymized_telemetry=False)
+                    )
+                    try:
+                        client.heartbeat()
+                    except Exception as e:
+                        raise RuntimeError(
+                            f"Chroma 서버({key})에 연결할 수 없습니다. "
+                            f"'python -m app.vectordb.chroma_server'로 서버를 먼저 실행하세요: {e}"
+                        ) from e
+                    print(f"🔌 Chroma 서버 연결: {key}")
+                else:
+                    client = chromadb.PersistentClient(
+                        path=persist_dir,
+                        settings=Settings(anonymized_telemetry=False)
+                    )
+                _clients[key] = client
+    return client
+
+
+def get_collection(name: str):
+    """
+    이름별 공유 벡터 컬렉션 반환 (VectorCollection, app/vectordb/base.py)
+    VECTOR_BACKEND 설정에 따라 Chroma 컬렉션 또는 NumpyCollection
+    """
+    collection = _collections.get(name)
+    if collection is None:
+        with _lock:
+            collection = _collections.get(name)
+            if collection is None:
+                if VECTOR_BACKEND == "numpy":
+                    from app.vectordb.numpy_backend import NumpyCollection
+                    collection = NumpyCollection(name)
+                elif VECTOR_BACKEND == "chroma":
+                    collection = get_chroma_client().get_or_create_collection(
+                        name=name,
+                        metadata={"hnsw:space": "cosine"}
+                    )
+                else:
+                    raise ValueError(f"지원하지 않는 VECTOR_BACKEND: {VECTOR_BACKEND}")
+                _collections[name] = collection
+    return collection
+
+
+def reset_collection(name: str):
+    """
+    컬렉션의 모든 데이터를 삭제하고 빈 컬렉션 반환
+    Chroma 컬렉션은 지웠다가 다시 만들지 않고 그대로 비우므로,
+    다른 워커 프로세스가 들고 있는 컬렉션 핸들도 계속 유효함
+    (NumPy 컬렉션은 파일 삭제를 다른 프로세스가 감지해 빈 상태로 다시 로드)
+    """
+    with _lock:
+        collection = get_collection(name)
+        if VECTOR_BACKEND == "numpy":
+            collection.drop()
+        else:
+            while True:
+                ids = collection.get(include=[], limit=RESET_BATCH_SIZE)["ids"]
+                if not ids:
+                    break
+                collection.delete(ids=ids)
+    return collection
+
+
+def get_lecture_store():
+    """공유 강의 자료 Store (ChromaStore) 반환"""
+    store = _stores.get("lecture")
+    if store is None:
+        with _lock:
+            store = _stores.get("lecture")
+            if store is None:
+                from app.rag.store import ChromaStore
+                store = _stores["lecture"] = ChromaStore()
+    return store
+
+
+def get_memory_store():
+    """공유 장기 메모리 Store (MemoryStore) 반환"""
+    store = _stores.get("memory")
+    if store is None:
+        with _lock:
+            store = _stores.get("memory")
+            if store is None:
+                from app.memory.store import MemoryStore
+                store = _stores["memory"] = MemoryStore()
+    return store
+
+
+def _file_lock(name: str):
+    """VECTOR_SYNC_DIR 아래 이름별 프로세스 간 파일 lock (같은 스레드에서는 재진입 가능)"""
+    lock = _file_locks.get(name)
+    if lock is None:
+        with _lock:
+            lock = _file_locks.get(name)
+            if lock is None:
+                from filelock import FileLock
+
+                os.makedirs(VECTOR_SYNC_DIR, exist_ok=True)
+                lock = _file_locks[name] = FileLock(os.path.join(VECTOR_SYNC_DIR, f"{name}.lock"))
+    return lock
+
+
+def index_write_lock():
+    """
+    색인 쓰기 lock (single writer)
+    색인 작업 / 일괄 색인 / 초기화처럼 컬렉션과 BM25 역색인, manifest를 바꾸는 구간을
+    모든 워커 프로세스에서 한 번에 하나만 실행 (검색은 lock 없이 동시에 실행)
+
+    사용법:
+        with index_write_lock():
+            ...
+    """
+    return _file_lock("index_write")
+
+
+def collection_write_lock(name: str):
+    """
+    컬렉션 쓰기 lock (프로세스 간)
+    여러 워커가 같은 컬렉션에 쓰는 경우 (예: Reflection의 장기 메모리 저장)
+    NumPy 백엔드의 read-modify-write나 PersistentClient 쓰기가 서로 덮어쓰지 않도록 직렬화
+    """
+    return _file_lock(f"{name}.write")
+
+
+def _version_path(name: str) -> str:
+    return os.path.join(VECTOR_SYNC_DIR, f"{name}.version")
+
+
+def get_collection_version(name: str) -> int:
+    """
+    컬렉션 버전 (쓰기/삭제가 일어날 때마다 증가, 검색 결과 캐시 무효화용)
+    파일에 기록되므로 다른 워커 프로세스의 색인도 반영됨
+    """
+    try:
+        with open(_version_path(name), "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_collection_version(name: str) -> int:
+    """컬렉션 버전 증가 - 색인 쓰기, clear() 등 내용이 바뀌는 모든 경로에서 호출"""
+    with _file_lock(f"{name}.version"):
+        version = get_collection_version(name) + 1
+        path = _version_path(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(version))
+        os.replace(tmp_path, path)
+    return version
+
+
+def shutdown():
+    """서버 종료 시 호출 - 공유 리소스 해제"""
+    global _embedder
+    with _lock:
+        _stores.clear()
+        _collections.clear()
+        for client in _clients.values():
+            clear_cache = getattr(client, "clear_system_cache", None)
+            if clear_cache:
+                clear_cache()
+        _clients.clear()
+        close = getattr(_embedder, "close", None)
+        if close:
+            close()
+        _embedder = None
+    print("🧹 공유 리소스 해제 완료")
@@ -8,12 +8,120 @@ load_dotenv()
 
 # OpenAI API 설정 (필수!)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# OpenAI 호환 서버 주소 (None이면 api.openai.com, 부하 테스트 시 app/loadtest/mock_openai.py 주소)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 MODEL_NAME = "gpt-4o-mini"
 
+# OpenAI 비동기 클라이언트 HTTP 커넥션 풀 설정
+LLM_MAX_CONNECTIONS = 100
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_TIMEOUT_SECONDS = 60.0
+
+# LLM 응답 캐시 (같은 요청이면 디스크에 저장된 응답 재사용, 평가/데모 반복 실행용)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = "./llm_cache/responses.sqlite"
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600  # 0이면 만료 없음
+LLM_CACHE_MAX_ENTRIES = 10_000         # 초과 시 가장 오래 사용되지 않은 응답부터 제거
+
+# LLM 호출 전 대화 기록 압축 (app/history.py)
+HISTORY_TOKEN_BUDGET = 6000          # System Prompt 포함 프롬프트 토큰 예산 (Tool spec 제외)
+HISTORY_KEEP_RECENT_TURNS = 3        # 그대로 유지하는 최근 턴 수 (user 메시지 기준)
+HISTORY_TOOL_RESULT_MAX_CHARS = 300  # 오래된 턴의 Tool 결과는 이 길이까지만 유지
+HISTORY_SUMMARY_MAX_TOKENS = 800     # 오래된 턴 요약 메시지의 최대 토큰 수
+
+# Tool 동시 실행 설정 (tool_node)
+TOOL_MAX_WORKERS = 8
+TOOL_MAX_ABANDONED = 4               # 타임아웃으로 포기했지만 아직 끝나지 않은 Tool 스레드를 위한 여유 스레드 수
+TOOL_TIMEOUT_SECONDS = 30.0
+TOOL_TIMEOUT_GRACE_SECONDS = 2.0     # deadline 뒤 Tool이 스스로 중단하기를 기다리는 시간
+TOOL_TIMEOUTS = {  # Tool별 타임아웃 (초), 없으면 TOOL_TIMEOUT_SECONDS 사용
+    "calculator": 5.0,
+    "time_now": 5.0,
+    "google_search": 10.0,
+}
+
+# 대화 세션 체크포인터 (LangGraph thread별 대화 상태를 SQLite에 저장)
+SESSION_DB_PATH = "./sessions/checkpoints.sqlite"
+SESSION_MAX_COUNT = 1000           # 보관하는 최대 세션 수 (초과 시 가장 오래 사용되지 않은 세션 삭제)
+SESSION_TTL_SECONDS = 24 * 3600    # 마지막 사용 후 이 시간이 지나면 세션 삭제
+
+# 채팅 API (POST /v1/chat)
+CHAT_DISCONNECT_POLL_SECONDS = 1.0  # 이벤트가 없는 동안 클라이언트 연결 종료를 확인하는 간격
+
+# 백그라운드 Reflection 큐 설정
+REFLECTION_QUEUE_SIZE = 100             # 대기 가능한 대화 수 (초과 시 backpressure)
+REFLECTION_WORKERS = 2                  # 동시에 실행되는 Reflection LLM 호출 수
+REFLECTION_ENQUEUE_TIMEOUT_SECONDS = 1.0  # 큐가 가득 찼을 때 기다리는 최대 시간 (초과 시 드롭)
+REFLECTION_BATCH_SIZE = 16              # 메모리 저장 배치 크기
+REFLECTION_FLUSH_INTERVAL_SECONDS = 2.0   # 배치가 차지 않아도 저장하는 간격
+REFLECTION_SHUTDOWN_TIMEOUT_SECONDS = 30.0
+
 # Google Search API 설정 (현재 미사용 - Mock 버전 사용 중)
 # GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 # GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
 
 # Chroma DB 설정
 CHROMA_PERSIST_DIR = "./chroma_db"
-EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
\ No newline at end of file
+# Chroma 접속 방식: "persistent" (기본, 프로세스 안에서 직접 열기 - 워커 1개 전용)
+#                  | "http" (Chroma 서버에 접속 - uvicorn --workers N, 서버 실행: python -m app.vectordb.chroma_server)
+CHROMA_MODE = os.getenv("CHROMA_MODE", "persistent")
+CHROMA_HOST = os.getenv("CHROMA_HOST", "127.0.0.1")
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8100"))
+# 프로세스 간 색인 쓰기 lock / 컬렉션 버전 파일 위치 (모든 워커가 같은 디렉토리를 봐야 함)
+VECTOR_SYNC_DIR = os.path.join(CHROMA_PERSIST_DIR, "sync")
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# 임베딩 실행 백엔드: "torch" (기본, SentenceTransformer) | "onnx" (ONNX Runtime, CPU 전용 배포용)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_DIR = "./onnx_models"  # 내보낸 ONNX 모델 / 토크나이저 저장 위치
+ONNX_QUANTIZE = True  # dynamic int8 양자화 사용
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0이면 onnxruntime 기본값 (물리 코어 수)
+
+# 벡터 저장소 백엔드: "chroma" (기본, 영속 HNSW) | "numpy" (메모리 brute-force, 소규모 컬렉션용)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+NUMPY_STORE_DIR = os.path.join(CHROMA_PERSIST_DIR, "numpy")
+NUMPY_VECTOR_DTYPE = "float32"  # "float16"이면 디스크 절반 (검색용 float32 행렬은 로드 시 한 번 변환해 메모리에 유지)
+
+# 동시 임베딩 요청 micro-batching (쿼리 임베딩을 모아 한 번의 forward pass로 처리)
+EMBED_BATCHING_ENABLED = True
+EMBED_BATCH_MAX_SIZE = 32      # 한 배치의 최대 텍스트 수
+EMBED_BATCH_MAX_WAIT_MS = 5.0  # 첫 요청 이후 다른 요청을 기다리는 최대 시간
+
+# 임베딩 디스크 캐시 설정 ((모델, 텍스트 해시) → 벡터)
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_DIR = "./embedding_cache"
+EMBEDDING_CACHE_MAX_ENTRIES = 100_000  # 초과 시 가장 오래 사용되지 않은 항목부터 제거
+EMBEDDING_CACHE_TOUCH_FLUSH_SECONDS = 30.0  # 조회 시각(LRU) 갱신을 메모리에 모았다가 디스크에 쓰는 간격
+EMBEDDING_CACHE_TOUCH_FLUSH_SIZE = 1000     # 모인 갱신이 이 개수를 넘으면 간격과 관계없이 쓰기
+
+# 프로세스 내 검색 캐시 설정 (LRU)
+QUERY_EMBEDDING_CACHE_SIZE = 1024  # 쿼리 임베딩
+SEARCH_RESULT_CACHE_SIZE = 1024    # (쿼리, top_k, 컬렉션 버전) → 검색 결과
+
+# rag_search 검색 모드: "vector" | "lexical" | "hybrid"
+RAG_SEARCH_MODE = "hybrid"
+LEXICAL_FAST_PATH_MIN_COVERAGE = 1.0  # hybrid에서 BM25 결과가 질의 용어를 이 비율 이상 포함하면 벡터 검색 생략
+RRF_K = 60  # Reciprocal Rank Fusion 상수
+
+# rag_search 컨텍스트 구성 (app/rag/context_packer.py)
+RAG_CANDIDATE_K = 12             # 한 번의 검색에서 가져오는 후보 청크 수
+RAG_CONTEXT_TOKEN_BUDGET = 1500  # Tool 결과에 담을 청크 본문 최대 토큰 수
+
+# 의미 기반 답변 캐시 (같은 강의 질문의 paraphrase는 그래프 실행 없이 응답)
+# 기본 꺼짐: 비슷하지만 다른 질문에 이전 답변이 나갈 수 있으므로 배포 환경에서 검증 후 켜기
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+ANSWER_CACHE_THRESHOLD = 0.92       # 질문 임베딩 코사인 유사도가 이 값 이상이면 hit
+ANSWER_CACHE_MAX_ENTRIES = 1000
+ANSWER_CACHE_TOOLS = ("rag_search",)  # 이 Tool만 사용한 답변을 저장 (시간/계산/개인 메모리 답변 제외)
+
+# PDF 색인 설정
+INDEX_BATCH_SIZE = 64  # 한 번에 임베딩 + Chroma에 추가하는 청크 수
+
+# 백그라운드 색인 작업 큐 (UI 업로드 / POST /v1/index, app/rag/jobs.py)
+INDEX_JOB_WORKERS = 1        # 동시에 색인하는 PDF 수 (임베딩이 CPU를 나눠 쓰므로 작게 유지)
+INDEX_JOB_HISTORY = 100      # 상태 조회용으로 보관하는 끝난 작업 수
+INDEX_UPLOAD_DIR = "./uploads"  # API로 업로드된 PDF 저장 위치
+
+# PDF 일괄 색인 설정 (python -m app.rag.bulk)
+BULK_INDEX_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # PDF 파싱 프로세스 수
+BULK_EMBED_BATCH_SIZE = 256
\ No newline at end of file
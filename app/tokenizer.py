@@ -0,0 +1,49 @@
+"""
+Local Tokenizer
+프롬프트 토큰 수 계산 (tiktoken, 설치되지 않았으면 문자 수 기반 추정)
+"""
+from functools import lru_cache
+from typing import Dict, List
+from app.settings import MODEL_NAME
+
+# 메시지마다 붙는 role/구분자 토큰 (OpenAI chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(MODEL_NAME)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    # 추정: 영문/숫자는 약 4글자당 1토큰, 한글 등은 글자당 1토큰
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_message_tokens(message: Dict) -> int:
+    """OpenAI 포맷 메시지 하나의 토큰 수 (tool_calls 포함)"""
+    tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(message.get("content") or "")
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function", {})
+        tokens += count_tokens(function.get("name", "")) + count_tokens(function.get("arguments", ""))
+    return tokens
+
+
+def count_messages_tokens(messages: List[Dict]) -> int:
+    """OpenAI 포맷 메시지 리스트의 토큰 수"""
+    return sum(count_message_tokens(message) for message in messages)
@@ -6,15 +6,22 @@ B파트와의 통합 인터페이스
 # A파트 Tool Registry export
 from app.tools.registry import execute_tool, ALL_TOOL_SPECS
 
-from app.rag.indexer import index_pdf_file
+
+def index_pdf_file(file_path: str) -> bool:
+    """
+    PDF 색인 (app.rag.indexer.index_pdf_file)
+    PyPDF2 / 텍스트 분할기는 색인할 때만 로드되도록 지연 import
+    """
+    from app.rag.indexer import index_pdf_file as _index_pdf_file
+    return _index_pdf_file(file_path)
 
 # B파트 호환 함수들
-def run_tool(tool_name: str, tool_args: dict) -> dict:
+def run_tool(tool_name: str, tool_args: dict, budget=None) -> dict:
     """
     B파트 호환용 tool 실행 함수
-    app.tools.run_tool로 import 가능
+    app.tools.run_tool로 import 가능 (budget: app.tools.budget.ToolBudget, 실행 시간 예산)
     """
-    result = execute_tool(tool_name, tool_args)
+    result = execute_tool(tool_name, tool_args, budget)
     
     # B파트가 기대하는 형식으로 변환
     if result.get("success"):
@@ -0,0 +1,62 @@
+"""
+Tool Time Budget
+Tool 실행 시간 예산 (협력적 타임아웃)
+
+스레드에서 실행 중인 Tool은 밖에서 강제로 멈출 수 없으므로,
+tool_node가 정한 deadline을 Tool 실행 컨텍스트에 두고 Tool이 단계 사이(검색 후, 쓰기 전 등)에서
+check_deadline()으로 확인해 스스로 중단합니다.
+네트워크 호출은 remaining_seconds()를 요청 timeout으로 넘기면 됩니다.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+
+class ToolTimeout(Exception):
+    """Tool 실행 시간 예산 초과"""
+
+
+class ToolBudget:
+    """Tool 호출 하나의 deadline과 상태"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        # tool_node가 기다리기를 포기한 호출 (이후 결과/메트릭은 버림)
+        self.abandoned = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+_current_budget: ContextVar[Optional[ToolBudget]] = ContextVar("tool_budget", default=None)
+
+
+def current_budget() -> Optional[ToolBudget]:
+    """현재 Tool 실행의 예산 (예산 없이 실행 중이면 None)"""
+    return _current_budget.get()
+
+
+def remaining_seconds(default: Optional[float] = None) -> Optional[float]:
+    """남은 시간 (초), 예산이 없으면 default"""
+    budget = _current_budget.get()
+    return budget.remaining() if budget else default
+
+
+def check_deadline():
+    """예산을 넘겼으면 ToolTimeout 발생 (Tool의 단계 사이에서 호출)"""
+    budget = _current_budget.get()
+    if budget is not None and (budget.abandoned or budget.expired()):
+        raise ToolTimeout(f"Tool 실행 시간 초과 ({budget.timeout}s)")
+
+
+def set_budget(budget: Optional[ToolBudget]):
+    """실행 컨텍스트에 예산 설정 (반환된 token으로 reset_budget)"""
+    return _current_budget.set(budget)
+
+
+def reset_budget(token):
+    _current_budget.reset(token)
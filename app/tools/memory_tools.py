@@ -2,6 +2,7 @@
 Memory Tools
 read_memory, write_memory Tool 구현
 """
+from app.tools.budget import ToolTimeout, check_deadline
 
 # Read Memory Tool Spec
 READ_MEMORY_TOOL_SPEC = {
@@ -58,10 +59,11 @@ def execute_read_memory(query: str, top_k: int = 3) -> dict:
     메모리 읽기 실행
     """
     try:
-        from app.memory.store import MemoryStore
+        from app.resources import get_memory_store
         
-        store = MemoryStore()
+        store = get_memory_store()
         memories = store.search_memory(query, top_k=top_k)
+        check_deadline()
         
         if not memories:
             return {
@@ -82,6 +84,9 @@ def execute_read_memory(query: str, top_k: int = 3) -> dict:
             "error": None
         }
     
+    except ToolTimeout:
+        raise
+    
     except Exception as e:
         return {
             "success": False,
@@ -98,6 +103,8 @@ def execute_write_memory(summary: str, tags: list = None) -> dict:
         from app.memory.reflection import MemoryReflection
         
         reflection = MemoryReflection()
+        # 호출자가 이미 포기한 호출이면 저장하지 않음 (실패로 보고된 뒤 기록되는 것 방지)
+        check_deadline()
         memory_id = reflection.reflect_and_save(summary, tags)
         
         return {
@@ -106,6 +113,9 @@ def execute_write_memory(summary: str, tags: list = None) -> dict:
             "error": None
         }
     
+    except ToolTimeout:
+        raise
+    
     except Exception as e:
         return {
             "success": False,
@@ -2,6 +2,7 @@
 RAG Search Tool
 Chroma DB에서 강의 자료 검색
 """
+from app.tools.budget import ToolTimeout, check_deadline
 
 TOOL_SPEC = {
     "type": "function",
@@ -17,8 +18,13 @@ TOOL_SPEC = {
                 },
                 "top_k": {
                     "type": "integer",
-                    "description": "반환할 결과 개수 (기본값: 3)",
+                    "description": "최소 검색 후보 개수 (결과는 토큰 예산 안에서 관련도 순으로 채워짐, 기본값: 3)",
                     "default": 3
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["hybrid", "lexical", "vector"],
+                    "description": "검색 방식 (hybrid: 용어+의미 결합(기본), lexical: 정확한 용어 일치, vector: 의미 유사도)"
                 }
             },
             "required": ["query"]
@@ -27,22 +33,28 @@ TOOL_SPEC = {
 }
 
 
-def execute(query: str, top_k: int = 3) -> dict:
+def execute(query: str, top_k: int = 3, mode: str = None) -> dict:
     """
     RAG 검색 실행
+    후보 청크를 넉넉히 가져온 뒤 토큰 예산 안에서 통째로 담아 한 번의 검색으로 답할 수 있게 함
     
     Args:
         query: 검색어
-        top_k: 결과 개수
+        top_k: 최소 후보 개수 (실제 후보 수는 max(top_k, RAG_CANDIDATE_K))
+        mode: 검색 방식 (hybrid / lexical / vector, 기본값은 settings.RAG_SEARCH_MODE)
     
     Returns:
-        {"success": bool, "result": list, "error": str}
+        {"success": bool, "result": str, "error": str}
     """
     try:
-        from app.rag.store import ChromaStore
+        from app.resources import get_lecture_store
+        from app.rag.context_packer import pack_context
+        from app.settings import RAG_CANDIDATE_K
         
-        store = ChromaStore()
-        documents = store.search_documents(query, top_k=top_k)
+        store = get_lecture_store()
+        documents = store.search(query, top_k=max(top_k, RAG_CANDIDATE_K), mode=mode)
+        # 검색이 예산을 넘겼으면 컨텍스트 구성(토큰 계산) 전에 중단
+        check_deadline()
         
         if not documents:
             return {
@@ -51,18 +63,30 @@ def execute(query: str, top_k: int = 3) -> dict:
                 "error": None
             }
         
+        # 토큰 예산 안에서 컨텍스트 구성 (연속 청크 병합, 중복 제거)
+        packed = pack_context(documents)
+        print(
+            f"📦 컨텍스트 구성: 청크 {packed['chunks_used']}개 → 블록 {len(packed['blocks'])}개, "
+            f"{packed['tokens_used']} 토큰"
+        )
+        
         # 결과 포맷팅
-        result_text = f"📚 '{query}'와 관련된 강의 내용:\n\n"
-        for i, doc in enumerate(documents, 1):
-            result_text += f"{i}. {doc['content'][:200]}...\n"
-            result_text += f"   (출처: {doc['metadata'].get('source', 'Unknown')})\n\n"
+        result_text = (
+            f"📚 '{query}'와 관련된 강의 내용 "
+            f"(블록 {len(packed['blocks'])}개, 약 {packed['tokens_used']} 토큰):\n\n"
+        )
+        for i, block in enumerate(packed["blocks"], 1):
+            result_text += f"[{i}] 출처: {block['source']}\n{block['content']}\n\n"
         
         return {
             "success": True,
-            "result": result_text,
+            "result": result_text.rstrip(),
             "error": None
         }
     
+    except ToolTimeout:
+        raise
+    
     except Exception as e:
         return {
             "success": False,
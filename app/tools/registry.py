@@ -3,6 +3,8 @@ Tool Registry
 모든 Tool을 중앙에서 관리
 """
 from app.tools import calculator, time_tool, google_search, rag_tool, memory_tools
+from app.tools.budget import ToolBudget, ToolTimeout, set_budget, reset_budget
+from app.metrics import TOOL_CALLS, TOOL_SECONDS, observe
 
 # Tool Spec 수집 (6개)
 ALL_TOOL_SPECS = [
@@ -24,13 +26,14 @@ TOOL_EXECUTORS = {
 }
 
 
-def execute_tool(tool_name: str, tool_args: dict) -> dict:
+def execute_tool(tool_name: str, tool_args: dict, budget: ToolBudget = None) -> dict:
     """
     Tool 실행
     
     Args:
         tool_name: Tool 이름
         tool_args: Tool 인자
+        budget: 실행 시간 예산 (Tool이 check_deadline()으로 확인, None이면 제한 없음)
     
     Returns:
         {"success": bool, "result": any, "error": str}
@@ -44,13 +47,32 @@ def execute_tool(tool_name: str, tool_args: dict) -> dict:
             "error": f"알 수 없는 tool: {tool_name}"
         }
     
+    token = set_budget(budget)
     try:
-        result = executor(**tool_args)
-        return result
+        with observe(TOOL_SECONDS, tool=tool_name):
+            result = executor(**tool_args)
+        status = "success" if result.get("success") else "error"
+    
+    except ToolTimeout as e:
+        status = "timeout"
+        result = {
+            "success": False,
+            "result": None,
+            "error": f"Tool 실행 시간 초과: {str(e)}"
+        }
     
     except Exception as e:
-        return {
+        status = "error"
+        result = {
             "success": False,
             "result": None,
             "error": f"Tool 실행 오류: {str(e)}"
-        }
\ No newline at end of file
+        }
+    
+    finally:
+        reset_budget(token)
+    
+    # 호출자가 이미 포기한 호출은 호출자 쪽에서 timeout으로 집계됨
+    if budget is None or not budget.abandoned:
+        TOOL_CALLS.labels(tool=tool_name, status=status).inc()
+    return result
\ No newline at end of file
@@ -1,115 +1,91 @@
+import asyncio
 import gradio as gr
 from typing import List, Tuple
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from app.graph.app import create_agent_graph
-from app.graph.state import AgentState 
-from app.tools import index_pdf_file
-import asyncio
+from app.rag.jobs import get_index_job_queue
 
-# 에이전트 그래프를 한 번만 초기화하는 전역 변수 (지연 초기화)
-_agent_app = None
-
-def get_agent_app():
-    """에이전트 그래프를 초기화하고 반환합니다."""
-    global _agent_app
-    if _agent_app is None:
-        _agent_app = create_agent_graph()
-    return _agent_app
+# 색인 진행 상황 갱신 주기 (초)
+INDEX_STATUS_POLL_SECONDS = 1.0
 
 
 # LangGraph 실행 및 채팅 기록 관리 함수
-async def run_agent(message: str, history: List[Tuple[str, str]]):
+async def run_agent(message: str, history: List[Tuple[str, str]], request: gr.Request):
     """
     사용자 메시지를 받아 LangGraph Agent를 실행하고 결과를 반환합니다.
+    이전 대화(Tool 호출/결과 포함)는 체크포인터에 세션별로 저장되어 있으므로 새 메시지만 전달합니다.
     """
-    agent_app = get_agent_app()
-    chat_history = []
-    # Gradio history의 튜플 메시지를 LangChain 메시지 객체로 변환
-    for item in history:
-        user_msg = None
-        ai_msg = None
-        
-        # 1. 항목이 튜플(이전 방식)인 경우 처리
-        if isinstance(item, tuple) and len(item) == 2:
-            user_msg, ai_msg = item
-            
-        # 2. 항목이 딕셔너리(Gradio ChatMessage)인 경우 처리 (주로 발생하는 문제)
-        elif isinstance(item, dict):
-            # 'content'가 리스트이고 딕셔너리를 포함하는지 확인하여 텍스트 추출
-            if item.get('role') == 'user' and item.get('content') and isinstance(item['content'][0], dict):
-                user_msg = item['content'][0].get('text')
-            elif item.get('role') == 'assistant' and item.get('content') and isinstance(item['content'][0], dict):
-                ai_msg = item['content'][0].get('text')
-        
-        # 3. 튜플도 딕셔너리도 아니거나 유효한 텍스트를 찾지 못한 경우 건너뜁니다.
-        if user_msg is None and ai_msg is None:
-            # 유효하지 않은 항목에 대한 경고 로그를 남깁니다.
-            # print(f"경고: Gradio history 항목이 유효하지 않습니다: {item}") # 이미 출력되었으므로 제거 가능
-            continue
+    # LangGraph / LLM 클라이언트는 서버 시작 시 워밍업 단계에서 로드 (UI 모듈 import를 가볍게 유지)
+    from app.graph.runner import stream_agent
 
-        # 4. LangChain 메시지 객체 생성 (user_msg와 ai_msg 모두 None이 아닌 경우에만)
-        if user_msg:
-            chat_history.append(HumanMessage(content=user_msg))
-        if ai_msg:
-            chat_history.append(AIMessage(content=ai_msg))
+    # 1. Gradio 세션 = LangGraph thread
+    # 화면의 대화가 비어 있으면 (새로 시작 / Clear) 이전 서버 상태도 초기화
+    thread_id = request.session_hash if request and request.session_hash else "default"
 
-    # 현재 사용자 메시지 추가
-    chat_history.append(HumanMessage(content=message))
-    
-    # 2. 초기 State 정의
-    initial_state = AgentState(
-        messages=chat_history,
-        lecture_index_status="READY", 
-        long_term_memory_query="" 
-    )
-
-    # 3. Agent 실행 (astream 사용)
+    # 2. Agent 실행 (Gradio는 매번 전체 응답 문자열을 표시하므로 누적해서 yield)
     current_response = ""
     tool_status_message = "" # Tool 실행 중 메시지 관리를 위한 변수
     
-    # LangGraph의 astream을 사용하여 비동기로 실행
-    async for chunk in agent_app.astream(initial_state): 
+    async for event in stream_agent(message, thread_id, reset=not history):
         
-        # LLM 노드 처리 (답변 스트리밍)
-        if "llm_node" in chunk:
-            ai_message = chunk["llm_node"]["messages"][-1]
-            
-            # 최종 답변 스트리밍
-            if ai_message.content and not ai_message.tool_calls:
-                # Tool 상태 메시지를 제거하고 새 응답을 추가
+        # LLM 토큰 처리 (답변 스트리밍)
+        if event["type"] == "token":
+            # Tool 상태 메시지를 제거하고 새 토큰을 추가
+            if tool_status_message:
                 current_response = current_response.replace(tool_status_message, "")
-                current_response += ai_message.content
-                yield current_response
                 tool_status_message = "" # Tool 상태 초기화
+            current_response += event["content"]
+            yield current_response
 
-        # Tool 노드 처리 (Tool 실행 알림)
-        if "tool_node" in chunk:
-            # Tool 실행 중임을 알리는 임시 메시지를 추가합니다.
-            if not tool_status_message:
-                tool_status_message = "\n\n**... Tool 실행 중. 잠시만 기다려주세요...**"
-                if current_response and not current_response.endswith('\n\n'):
-                     current_response += "\n\n"
-                current_response += tool_status_message
-                yield current_response
+        # LLM 노드가 Tool 호출을 결정한 경우 (Tool 실행 알림)
+        elif event["type"] == "tool_call":
+            # Tool 호출 전에 스트리밍된 문장은 최종 답변이 아니므로 버리고,
+            # Tool 실행 중임을 알리는 임시 메시지만 표시합니다.
+            tool_status_message = "**... Tool 실행 중. 잠시만 기다려주세요...**"
+            current_response = tool_status_message
+            yield current_response
 
 # PDF 업로드 및 색인 기능
-def handle_pdf_upload(file):
+def _format_index_status(job: dict) -> str:
+    """색인 작업 상태를 화면 표시용 문자열로 변환"""
+    if job["status"] == "done":
+        return f"✅ '{job['source']}' 파일 색인 완료 ({job['chunks_done']} 청크). 이제 강의 내용에 대해 질문할 수 있습니다."
+    if job["status"] == "failed":
+        return f"❌ 파일 색인 중 오류 발생: {job['error']}"
+    if job["status"] == "queued":
+        return f"⏳ '{job['source']}' 색인 대기 중... (작업 ID: {job['job_id']})"
+
+    pages = f"{job['pages_done']}/{job['pages_total']}" if job["pages_total"] else f"{job['pages_done']}"
+    eta = f", 남은 시간 약 {job['eta_seconds']:.0f}초" if job["eta_seconds"] is not None else ""
+    return (
+        f"⚙️ '{job['source']}' 색인 중: {pages} 페이지, "
+        f"{job['chunks_done']} 청크 (새 임베딩 {job['chunks_embedded']}){eta}"
+    )
+
+
+async def handle_pdf_upload(file):
     """
-    PDF 파일을 받아 RAG 색인 파이프라인을 실행합니다.
-    (A 역할의 'index_pdf_file' 함수를 호출하는 것으로 가정)
+    PDF 파일을 백그라운드 색인 작업 큐에 등록하고 진행 상황을 표시합니다.
+    색인은 작업 큐의 워커에서 실행되므로 브라우저 연결이 끊겨도 계속 진행됩니다.
     """
     if file is None:
-        return "PDF 파일을 업로드해주세요."
+        yield "PDF 파일을 업로드해주세요."
+        return
     
-    file_path = file.name
+    file_path = file.name if hasattr(file, "name") else file
     
-    # 1. A 역할의 RAG 색인 함수 호출
     try:
-        # A 역할이 구현한 RAG 색인 함수 (청크, 임베딩, Chroma DB 저장)
-        index_pdf_file(file_path)
-        return f"✅ '{file_path}' 파일 색인 완료. 이제 강의 내용에 대해 질문할 수 있습니다."
+        queue = get_index_job_queue()
+        job = await asyncio.to_thread(queue.submit, file_path)
     except Exception as e:
-        return f"❌ 파일 색인 중 오류 발생: {e}"
+        yield f"❌ 파일 색인 중 오류 발생: {e}"
+        return
+
+    # 작업이 끝날 때까지 진행 상황 polling
+    while True:
+        yield _format_index_status(job)
+        if job["status"] in ("done", "failed"):
+            return
+        await asyncio.sleep(INDEX_STATUS_POLL_SECONDS)
+        job = queue.status(job["job_id"]) or job
 
 def create_gradio_interface():
     """
@@ -0,0 +1,43 @@
+"""
+Vector Backend Interface
+ChromaStore / MemoryStore가 사용하는 컬렉션 인터페이스
+
+Chroma Collection API 중 Store에서 쓰는 부분만 정의하므로,
+Chroma 컬렉션은 그대로, 다른 백엔드(NumPy 등)는 같은 형태로 구현하면 됩니다.
+"""
+from typing import Dict, List, Optional, Protocol
+
+
+class VectorCollection(Protocol):
+    """벡터 컬렉션 프로토콜 (반환 형식은 chromadb와 동일)"""
+
+    def count(self) -> int:
+        ...
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict],
+    ):
+        ...
+
+    def update(self, ids: List[str], metadatas: List[Dict]):
+        ...
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        ...
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict:
+        """{"ids": [...], "documents": [...], "metadatas": [...]}"""
+        ...
+
+    def query(self, query_embeddings: List[List[float]], n_results: int = 10) -> Dict:
+        """{"ids": [[...]], "documents": [[...]], "metadatas": [[...]], "distances": [[...]]}"""
+        ...
@@ -0,0 +1,40 @@
+"""
+Local Chroma Server
+CHROMA_MODE="http"용 로컬 Chroma 서버 실행
+CHROMA_PERSIST_DIR 데이터는 이 서버 프로세스만 열고, 모든 uvicorn 워커 / 일괄 색인은 HttpClient로 접속
+
+사용법:
+    python -m app.vectordb.chroma_server &
+    CHROMA_MODE=http uvicorn app.main:app --workers 4
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+from app.settings import CHROMA_PERSIST_DIR, CHROMA_HOST, CHROMA_PORT
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 Chroma 서버 실행 (CHROMA_MODE=http)")
+    parser.add_argument("--path", default=CHROMA_PERSIST_DIR, help="Chroma 데이터 디렉토리")
+    parser.add_argument("--host", default=CHROMA_HOST)
+    parser.add_argument("--port", type=int, default=CHROMA_PORT)
+    args = parser.parse_args(argv)
+
+    # chromadb 패키지가 설치하는 CLI
+    chroma = shutil.which("chroma")
+    if chroma is None:
+        print("❌ 'chroma' 명령을 찾을 수 없습니다. chromadb가 설치된 환경에서 실행하세요.")
+        return 1
+
+    command = [chroma, "run", "--path", args.path, "--host", args.host, "--port", str(args.port)]
+    print(f"🗄️  Chroma 서버 시작: http://{args.host}:{args.port} (데이터: {args.path})")
+    try:
+        return subprocess.call(command)
+    except KeyboardInterrupt:
+        print("🛑 Chroma 서버 종료")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+NumPy Vector Backend
+연속된 NumPy 행렬 + brute-force 코사인 검색 (수천 청크 규모에서 HNSW보다 빠름)
+
+저장 형식 (컬렉션마다 디렉토리 하나):
+- vectors.npy: 정규화된 임베딩 행렬 (memory-mapped로 로드)
+- meta.json: ids / documents / metadatas (행 순서와 동일)
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.settings import NUMPY_STORE_DIR, NUMPY_VECTOR_DTYPE
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    파일 변경 감지용 (mtime_ns, 크기, inode), 파일이 없으면 None
+    임시 파일을 os.replace로 교체해 저장하므로 같은 mtime 안에 두 번 저장되어도 inode로 구분됨
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _matches(metadata: Dict, where: Optional[Dict]) -> bool:
+    """Chroma where 필터 중 equality / $eq / $and 지원"""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            if "$eq" not in condition or metadata.get(key) != condition["$eq"]:
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class NumpyCollection:
+    """
+    VectorCollection 구현 (app/vectordb/base.py)
+    쓰기는 파일을 원자적으로 다시 저장하고, 다른 프로세스가 갱신(또는 삭제)하면 다시 로드합니다.
+
+    - update(metadata만 변경)는 meta.json만 다시 저장
+    - deferred_writes() 블록 안의 쓰기는 메모리에만 반영하고 블록이 끝날 때 한 번 저장
+      (색인 작업처럼 배치가 이어지는 경우 배치마다 전체 행렬을 다시 쓰지 않음)
+    """
+
+    def __init__(self, name: str, root: str = NUMPY_STORE_DIR, dtype: str = NUMPY_VECTOR_DTYPE):
+        self.name = name
+        self.path = os.path.join(root, name)
+        self.dtype = np.dtype(dtype)
+        self._vectors_path = os.path.join(self.path, "vectors.npy")
+        self._meta_path = os.path.join(self.path, "meta.json")
+        self._lock = threading.RLock()
+
+        self._vectors = np.zeros((0, 0), dtype=self.dtype)
+        self._pending: List[np.ndarray] = []  # 아직 _vectors에 합치지 않은 추가 행
+        self._search_vectors: Optional[np.ndarray] = None  # 검색용 float32 행렬 (로드/변경 시 한 번 변환)
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._positions: Dict[str, int] = {}
+        self._loaded_stamp: Optional[Tuple[int, int, int]] = None
+
+        self._deferred = 0
+        self._dirty_vectors = False  # 저장하지 않은 행렬 변경 (add / delete)
+        self._dirty_meta = False     # 저장하지 않은 meta 변경
+        self._load()
+
+    # ---------- 영속화 ----------
+
+    def _reset(self):
+        self._vectors = np.zeros((0, 0), dtype=self.dtype)
+        self._pending = []
+        self._search_vectors = None
+        self._ids, self._documents, self._metadatas = [], [], []
+        self._positions = {}
+        self._loaded_stamp = None
+
+    def _load(self):
+        # 읽기 전에 기록 (읽는 도중 교체되면 다음 확인에서 다시 읽음)
+        stamp = _file_stamp(self._meta_path)
+        if stamp is None:
+            return
+
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        vectors = self._open_vectors()
+
+        # 다른 프로세스가 저장하는 중이면 (행 수 불일치) 기존 상태 유지
+        if vectors.shape[0] != len(meta["ids"]):
+            return
+
+        self._vectors = vectors
+        self._pending = []
+        self._search_vectors = None
+        self._ids = meta["ids"]
+        self._documents = meta["documents"]
+        self._metadatas = meta["metadatas"]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._loaded_stamp = stamp
+
+    def _open_vectors(self) -> np.ndarray:
+        """vectors.npy를 memory-map으로 열기 (빈 행렬은 mmap할 수 없으므로 일반 로드)"""
+        vectors = np.load(self._vectors_path, mmap_mode="r")
+        if vectors.size == 0:
+            return np.zeros((0, 0), dtype=self.dtype)
+        return vectors
+
+    def _reload_if_changed(self):
+        # 저장하지 않은 변경이 있으면 (deferred_writes 중) 다시 읽지 않음
+        if self._dirty_vectors or self._dirty_meta:
+            return
+        stamp = _file_stamp(self._meta_path)
+        if stamp is None:
+            # 다른 프로세스가 drop()한 경우 삭제된 문서를 계속 반환하지 않도록 비움
+            if self._loaded_stamp is not None:
+                self._reset()
+            return
+        if stamp != self._loaded_stamp:
+            self._load()
+
+    def _matrix(self) -> np.ndarray:
+        """대기 중인 추가 행을 합친 전체 행렬"""
+        if self._pending:
+            parts = ([self._vectors] if len(self._vectors) else []) + self._pending
+            self._vectors = np.concatenate(parts)
+            self._pending = []
+        return self._vectors
+
+    def _save(self):
+        """변경된 파일만 저장 (deferred_writes 중이면 블록이 끝날 때까지 미룸)"""
+        if self._deferred or not (self._dirty_vectors or self._dirty_meta):
+            return
+        os.makedirs(self.path, exist_ok=True)
+
+        if self._dirty_vectors:
+            # 기존 memory-map을 놓은 뒤 파일 교체
+            vectors = np.array(self._matrix())
+            self._vectors = vectors
+            tmp_vectors = f"{self._vectors_path}.tmp.npy"
+            np.save(tmp_vectors, vectors)
+            os.replace(tmp_vectors, self._vectors_path)
+
+        tmp_meta = f"{self._meta_path}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(
+                {"ids": self._ids, "documents": self._documents, "metadatas": self._metadatas},
+                f,
+                ensure_ascii=False,
+            )
+        # 교체 전 임시 파일 기준으로 기록 (os.replace는 inode / mtime 유지, 교체 직후 다른 프로세스의 저장과 구분)
+        stamp = _file_stamp(tmp_meta)
+        os.replace(tmp_meta, self._meta_path)
+
+        if self._dirty_vectors:
+            self._vectors = self._open_vectors()
+            self._search_vectors = None
+        self._loaded_stamp = stamp
+        self._dirty_vectors = self._dirty_meta = False
+
+    @contextmanager
+    def deferred_writes(self):
+        """
+        블록 안의 add / update / delete를 메모리에만 반영하고, 블록이 끝날 때 한 번만 저장
+        (다른 프로세스에는 블록이 끝난 뒤에 보임, 중첩 가능)
+        """
+        with self._lock:
+            self._reload_if_changed()
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                self._save()
+
+    # ---------- VectorCollection ----------
+
+    def count(self) -> int:
+        with self._lock:
+            self._reload_if_changed()
+            return len(self._ids)
+
+    def add(self, ids, embeddings, documents, metadatas):
+        with self._lock:
+            self._reload_if_changed()
+            duplicated = [doc_id for doc_id in ids if doc_id in self._positions]
+            if duplicated:
+                raise ValueError(f"이미 존재하는 ID: {duplicated[:3]}")
+
+            new_vectors = np.asarray(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+            new_vectors = (new_vectors / np.maximum(norms, 1e-12)).astype(self.dtype)
+
+            start = len(self._ids)
+            self._pending.append(new_vectors)
+            self._search_vectors = None
+            self._ids = self._ids + list(ids)
+            self._documents = self._documents + list(documents)
+            self._metadatas = self._metadatas + [dict(m or {}) for m in metadatas]
+            self._positions.update({doc_id: start + i for i, doc_id in enumerate(ids)})
+            self._dirty_vectors = self._dirty_meta = True
+            self._save()
+
+    def update(self, ids, metadatas):
+        with self._lock:
+            self._reload_if_changed()
+            metadatas_copy = list(self._metadatas)
+            for doc_id, metadata in zip(ids, metadatas):
+                position = self._positions.get(doc_id)
+                if position is not None:
+                    metadatas_copy[position] = dict(metadata or {})
+            self._metadatas = metadatas_copy
+            # 행렬은 그대로이므로 meta.json만 저장
+            self._dirty_meta = True
+            self._save()
+
+    def delete(self, ids=None, where=None):
+        with self._lock:
+            self._reload_if_changed()
+            targets = set(ids or [])
+            keep = [
+                i for i, doc_id in enumerate(self._ids)
+                if not (doc_id in targets or (where and _matches(self._metadatas[i], where)))
+            ]
+            if len(keep) == len(self._ids):
+                return
+
+            self._vectors = self._matrix()[keep] if keep else np.zeros((0, 0), dtype=self.dtype)
+            self._search_vectors = None
+            self._ids = [self._ids[i] for i in keep]
+            self._documents = [self._documents[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+            self._dirty_vectors = self._dirty_meta = True
+            self._save()
+
+    def get(self, ids=None, where=None, include=None):
+        include = ["documents", "metadatas"] if include is None else include
+        with self._lock:
+            self._reload_if_changed()
+            if ids is not None:
+                positions = [self._positions[doc_id] for doc_id in ids if doc_id in self._positions]
+            else:
+                positions = range(len(self._ids))
+            positions = [i for i in positions if _matches(self._metadatas[i], where)]
+
+            result = {"ids": [self._ids[i] for i in positions]}
+            result["documents"] = [self._documents[i] for i in positions] if "documents" in include else None
+            result["metadatas"] = [dict(self._metadatas[i]) for i in positions] if "metadatas" in include else None
+            return result
+
+    def _float32_matrix(self) -> np.ndarray:
+        """
+        검색용 float32 행렬 (lock 안에서 호출)
+        float16 저장이면 로드/변경 후 한 번만 변환해 두고 쿼리마다 전체 복사본을 만들지 않음
+        """
+        if self._search_vectors is None:
+            self._search_vectors = self._matrix().astype(np.float32, copy=False)
+        return self._search_vectors
+
+    def query(self, query_embeddings, n_results=10):
+        with self._lock:
+            self._reload_if_changed()
+            vectors, ids = self._float32_matrix(), self._ids
+            documents, metadatas = self._documents, self._metadatas
+
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query in query_embeddings:
+            k = min(n_results, len(ids))
+            if k == 0:
+                for key in result:
+                    result[key].append([])
+                continue
+
+            q = np.asarray(query, dtype=np.float32)
+            q /= max(float(np.linalg.norm(q)), 1e-12)
+
+            # 행렬-벡터 곱 한 번으로 전체 코사인 유사도 계산 후 top-k만 부분 정렬
+            similarities = vectors @ q
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+
+            result["ids"].append([ids[i] for i in top])
+            result["documents"].append([documents[i] for i in top])
+            result["metadatas"].append([dict(metadatas[i]) for i in top])
+            result["distances"].append([float(1.0 - similarities[i]) for i in top])
+        return result
+
+    def drop(self):
+        """컬렉션 파일 삭제"""
+        with self._lock:
+            for path in (self._meta_path, self._vectors_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._reset()
+            self._dirty_vectors = self._dirty_meta = False
@@ -0,0 +1,91 @@
+"""
+Startup Warm-up
+서버 시작 직후 백그라운드에서 무거운 리소스를 미리 준비하고, 준비 상태(/readyz)를 관리
+
+단계 (순서대로 실행, 단계별 소요 시간 기록):
+- embedder:    임베딩 모델 로드 + 첫 forward pass
+- collections: 강의 / 메모리 컬렉션과 BM25 역색인 열기
+- tokenizer:   tiktoken 인코딩 로드
+- graph:       LangGraph / LLM 클라이언트 / Tool import, 세션 DB 연결, 그래프 컴파일
+
+준비가 끝나기 전에 들어온 요청도 처리되지만(각 리소스는 지연 초기화), 첫 요청이 로딩 비용을 떠안으므로
+로드밸런서는 /readyz가 200이 된 뒤에 트래픽을 보내야 합니다.
+"""
+import asyncio
+import time
+from typing import Dict
+
+
+_state: Dict = {
+    "status": "starting",   # starting → warming_up → ready | failed
+    "steps": {},            # 단계 이름 → 소요 시간(초)
+    "error": None,
+    "seconds": None,        # 워밍업 전체 소요 시간
+}
+
+
+def _load_embedder():
+    from app.resources import get_embedder
+
+    # 모델 로드 후 한 번 실행해 두어야 첫 검색에서 초기화 비용이 생기지 않음
+    get_embedder().encode(["워밍업"])
+
+
+def _open_collections():
+    from app.resources import get_lecture_store, get_memory_store
+
+    get_lecture_store()
+    get_memory_store()
+
+
+def _load_tokenizer():
+    from app.tokenizer import count_tokens
+
+    count_tokens("워밍업")
+
+
+async def _compile_graph():
+    import app.tools  # noqa: F401 (Tool 모듈 import)
+    from app.graph.runner import get_agent_app
+
+    await get_agent_app()
+
+
+async def warm_up():
+    """워밍업 단계를 순서대로 실행 (블로킹 단계는 스레드에서 실행)"""
+    steps = [
+        ("embedder", _load_embedder),
+        ("collections", _open_collections),
+        ("tokenizer", _load_tokenizer),
+        ("graph", _compile_graph),
+    ]
+
+    _state["status"] = "warming_up"
+    started = time.perf_counter()
+    try:
+        for name, step in steps:
+            step_started = time.perf_counter()
+            if asyncio.iscoroutinefunction(step):
+                await step()
+            else:
+                await asyncio.to_thread(step)
+            _state["steps"][name] = round(time.perf_counter() - step_started, 3)
+            print(f"🔥 워밍업 {name}: {_state['steps'][name]:.2f}s")
+    except Exception as e:
+        _state["status"] = "failed"
+        _state["error"] = str(e)
+        print(f"❌ 워밍업 실패: {e}")
+        return
+
+    _state["seconds"] = round(time.perf_counter() - started, 3)
+    _state["status"] = "ready"
+    print(f"✅ 워밍업 완료 ({_state['seconds']:.2f}s)")
+
+
+def is_ready() -> bool:
+    return _state["status"] == "ready"
+
+
+def readiness() -> Dict:
+    """준비 상태 복사본 {"status", "steps", "error", "seconds"}"""
+    return {**_state, "steps": dict(_state["steps"])}
@@ -0,0 +1,65 @@
+"""SemanticAnswerCache: 조회 전 저렴한 조건 확인, scope 분리, 저장 조건"""
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from app import answer_cache
+from app.answer_cache import SemanticAnswerCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    scope = {"value": "v1"}
+    embedded = []
+    monkeypatch.setattr(answer_cache, "lecture_index_scope", lambda: scope["value"])
+
+    cache = SemanticAnswerCache(threshold=0.9)
+
+    def embed(question):
+        embedded.append(question)
+        vector = np.array([1.0, 0.1 if "다시" in question else 0.0], dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    monkeypatch.setattr(cache, "_embed", embed)
+    cache.scope = scope
+    cache.embedded = embedded
+    return cache
+
+
+def test_empty_cache_skips_embedding(cache):
+    assert cache.lookup("질문") is None
+    assert cache.embedded == []
+
+
+def test_other_scope_skips_embedding(cache):
+    cache.store("질문", "답", latency_ms=100)
+    cache.embedded.clear()
+    cache.scope["value"] = "v2"
+
+    assert cache.lookup("질문") is None
+    assert cache.embedded == []
+
+
+def test_paraphrase_hits_in_same_scope(cache):
+    cache.store("질문", "답", latency_ms=100)
+
+    hit = cache.lookup("질문 다시")
+
+    assert hit["answer"] == "답" and hit["matched_question"] == "질문"
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_only_rag_answers_are_stored(cache):
+    rag_call = {"name": "rag_search", "args": {}, "id": "1"}
+    time_call = {"name": "time_now", "args": {}, "id": "1"}
+
+    def conversation(tool_call):
+        return [
+            HumanMessage(content="질문"),
+            AIMessage(content="", tool_calls=[tool_call]),
+            ToolMessage(content="결과", tool_call_id="1"),
+            AIMessage(content="답"),
+        ]
+
+    assert not cache.store_from_messages(conversation(time_call), latency_ms=1)
+    assert cache.embedded == []
+    assert cache.store_from_messages(conversation(rag_call), latency_ms=1)
@@ -0,0 +1,83 @@
+"""pack_context: 중복 제거, 연속 청크 병합(overlap 제거), 순위 / 토큰 예산"""
+from app.rag.context_packer import pack_context
+from app.tokenizer import count_tokens
+
+
+def _doc(content, source="lecture.pdf", chunk_id=None, page=None):
+    metadata = {"source": source}
+    if chunk_id is not None:
+        metadata["chunk_id"] = chunk_id
+    if page is not None:
+        metadata["page"] = page
+    return {"content": content, "metadata": metadata}
+
+
+def test_duplicate_and_contained_chunks_are_dropped():
+    documents = [
+        _doc("gradient descent updates weights", chunk_id=1),
+        _doc("gradient   descent updates weights", chunk_id=7),  # 공백만 다름
+        _doc("descent updates", chunk_id=9),                    # 포함됨
+        _doc(""),
+    ]
+
+    packed = pack_context(documents)
+
+    assert packed["chunks_used"] == 1
+    assert packed["chunks_skipped"] == 3
+    assert [b["content"] for b in packed["blocks"]] == ["gradient descent updates weights"]
+
+
+def test_adjacent_chunks_merge_without_overlap():
+    documents = [
+        _doc("world of learning rates.", chunk_id=2, page=4),
+        _doc("Hello world of", chunk_id=1, page=3),
+    ]
+
+    packed = pack_context(documents)
+
+    assert packed["blocks"] == [
+        {"source": "lecture.pdf, p.3-4", "content": "Hello world of learning rates."},
+    ]
+
+
+def test_non_adjacent_and_other_sources_stay_separate_in_rank_order():
+    documents = [
+        _doc("third chunk text", chunk_id=3),
+        _doc("other file text", source="other.pdf", chunk_id=4),
+        _doc("first chunk text", chunk_id=1),
+    ]
+
+    packed = pack_context(documents)
+
+    assert [b["content"] for b in packed["blocks"]] == [
+        "third chunk text", "other file text", "first chunk text",
+    ]
+    assert packed["blocks"][1]["source"] == "other.pdf"
+
+
+def test_merged_block_takes_best_rank():
+    documents = [
+        _doc("alpha text", source="a.pdf", chunk_id=1),
+        _doc("beta two", source="b.pdf", chunk_id=6),
+        _doc("beta one", source="b.pdf", chunk_id=5),
+    ]
+
+    packed = pack_context(documents)
+
+    assert [b["source"] for b in packed["blocks"]] == ["a.pdf", "b.pdf"]
+    assert packed["blocks"][1]["content"] == "beta onebeta two"
+
+
+def test_chunks_over_budget_are_skipped_not_truncated():
+    small = "short answer chunk"
+    documents = [
+        _doc("long chunk text " * 100, chunk_id=1),
+        _doc(small, chunk_id=10),
+    ]
+    budget = count_tokens(small) + 5
+
+    packed = pack_context(documents, budget=budget)
+
+    assert [b["content"] for b in packed["blocks"]] == [small]
+    assert packed["tokens_used"] <= budget
+    assert packed["chunks_skipped"] == 1
@@ -0,0 +1,66 @@
+"""프로세스 간 쓰기 lock / 컬렉션 버전 (여러 uvicorn 워커가 같은 데이터를 쓰는 경우)"""
+import multiprocessing
+import pytest
+from app import resources
+from app.vectordb.numpy_backend import NumpyCollection
+
+WRITES_PER_PROCESS = 15
+
+
+@pytest.fixture
+def sync_dir(tmp_path, monkeypatch):
+    path = str(tmp_path / "sync")
+    monkeypatch.setattr(resources, "VECTOR_SYNC_DIR", path)
+    monkeypatch.setattr(resources, "_file_locks", {})
+    return path
+
+
+def _append_memories(sync_dir: str, root: str, worker: int):
+    resources.VECTOR_SYNC_DIR = sync_dir
+    resources._file_locks = {}
+    collection = NumpyCollection("memory", root=root)
+    for i in range(WRITES_PER_PROCESS):
+        with resources.collection_write_lock("memory"):
+            collection.add(
+                ids=[f"{worker}-{i}"],
+                embeddings=[[1.0, float(i)]],
+                documents=[f"memory {worker}-{i}"],
+                metadatas=[{"worker": worker}],
+            )
+            resources.bump_collection_version("memory")
+
+
+def _run_workers(target, args_list):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+
+def test_collection_version_is_shared_through_files(sync_dir):
+    assert resources.get_collection_version("lecture") == 0
+    assert resources.bump_collection_version("lecture") == 1
+    assert resources.bump_collection_version("lecture") == 2
+
+    # 다른 프로세스의 캐시 상태와 상관없이 파일에서 읽음
+    resources._file_locks = {}
+    assert resources.get_collection_version("lecture") == 2
+    assert resources.get_collection_version("memory") == 0
+
+
+def test_concurrent_writers_do_not_lose_writes(sync_dir, tmp_path):
+    root = str(tmp_path / "numpy")
+    _run_workers(_append_memories, [(sync_dir, root, worker) for worker in range(3)])
+
+    collection = NumpyCollection("memory", root=root)
+    assert collection.count() == 3 * WRITES_PER_PROCESS
+    assert resources.get_collection_version("memory") == 3 * WRITES_PER_PROCESS
+
+
+def test_index_write_lock_is_reentrant_in_same_thread(sync_dir):
+    with resources.index_write_lock():
+        with resources.index_write_lock():
+            assert resources.index_write_lock().is_locked
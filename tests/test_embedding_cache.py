@@ -0,0 +1,152 @@
+"""EmbeddingCache / CachedEmbedder: 저장 / 조회, LRU 제거, 조회 시각 일괄 기록"""
+import sqlite3
+import time
+import numpy as np
+import pytest
+from app.embeddings.cache import CachedEmbedder, EmbeddingCache, text_key
+
+
+class FakeEmbedder:
+    model_name = "fake/model"
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0, 0.0] for text in texts], dtype=np.float32)
+
+
+def _vector(value):
+    return np.array([value, 0.0, 0.0], dtype=np.float32)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(max_entries=3):
+        cache = EmbeddingCache("fake/model", dim=3, cache_dir=str(tmp_path), max_entries=max_entries)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        try:
+            cache.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+
+def _last_used(cache, key):
+    with sqlite3.connect(f"{cache.path}/index.sqlite") as db:
+        return db.execute("SELECT last_used FROM entries WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_cached_embedder_computes_only_missing_texts(make_cache):
+    embedder = FakeEmbedder()
+    cached = CachedEmbedder(embedder, make_cache())
+
+    first = cached.encode(["a", "bb"])
+    second = cached.encode(["bb", "ccc", "a"])
+
+    assert embedder.calls == [["a", "bb"], ["ccc"]]
+    np.testing.assert_array_equal(second[0], first[1])
+    np.testing.assert_array_equal(second[2], first[0])
+    assert cached.cache.stats()["hits"] == 2
+
+
+def test_entries_survive_reopen(make_cache):
+    cache = make_cache()
+    cache.put_many({"k": _vector(7)})
+    cache.close()
+
+    reopened = make_cache()
+
+    np.testing.assert_array_equal(reopened.get_many(["k"])["k"], _vector(7))
+
+
+def test_hits_do_not_write_to_disk(make_cache):
+    cache = make_cache()
+    cache.put_many({"a": _vector(1), "b": _vector(2)})
+    changes = cache._db.total_changes
+
+    for _ in range(10):
+        cache.get_many(["a", "b"])
+
+    assert cache._db.total_changes == changes
+
+
+def test_eviction_uses_buffered_touches(make_cache):
+    cache = make_cache(max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.put_many({key: _vector(ord(key))})
+        time.sleep(0.01)
+    # "a"의 조회 시각은 아직 메모리에만 있음
+    cache.get_many(["a"])
+
+    cache.put_many({"d": _vector(4)})
+
+    assert set(cache.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+
+
+def test_close_flushes_touches(make_cache):
+    cache = make_cache()
+    cache.put_many({"a": _vector(1)})
+    stored = _last_used(cache, "a")
+    time.sleep(0.01)
+    cache.get_many(["a"])
+
+    cache.close()
+
+    assert _last_used(cache, "a") > stored
+
+
+def test_text_key_is_stable():
+    assert text_key("강의") == text_key("강의")
+    assert text_key("강의") != text_key("강의 ")
+
+
+class _FailingInsert:
+    """sqlite 연결 대역: 슬롯 벡터를 쓴 뒤의 INSERT에서 실패 (→ ROLLBACK)"""
+
+    def __init__(self, db):
+        self._db = db
+
+    def executemany(self, sql, params):
+        if sql.startswith("INSERT INTO entries"):
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._db.executemany(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def test_rolled_back_write_does_not_leak_into_evicted_key(make_cache):
+    cache = make_cache(max_entries=1)
+    cache.put_many({"old": _vector(1)})
+    db = cache._db
+    cache._db = _FailingInsert(db)
+
+    with pytest.raises(sqlite3.OperationalError):
+        cache.put_many({"new": _vector(2)})
+    cache._db = db
+
+    # "old"의 슬롯에는 "new" 벡터가 쓰였지만 ROLLBACK으로 여전히 "old"에 매핑됨 → miss
+    assert cache.get_many(["old", "new"]) == {}
+    # 다시 저장하면 같은 슬롯을 올바른 벡터로 복구
+    cache.put_many({"old": _vector(1)})
+    np.testing.assert_array_equal(cache.get_many(["old"])["old"], _vector(1))
+
+
+def test_slot_being_rewritten_by_other_process_reads_as_miss(make_cache):
+    cache = make_cache()
+    cache.put_many({"a": _vector(1)})
+    other = make_cache()
+    slot = other._db.execute("SELECT slot FROM entries WHERE key = 'a'").fetchone()[0]
+
+    # 다른 프로세스가 슬롯을 재사용하는 중 (태그를 비우고 벡터를 쓰는 사이)
+    other._tags[slot] = 0
+    other._vectors[slot] = _vector(9)
+
+    assert cache.get_many(["a"]) == {}
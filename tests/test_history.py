@@ -0,0 +1,81 @@
+"""compact_history: 토큰 예산, 최근 턴 유지, Tool 결과 생략, 오래된 턴 요약"""
+from app.history import SUMMARY_HEADER, compact_history, split_turns
+from app.tokenizer import count_messages_tokens
+
+SYSTEM = {"role": "system", "content": "You are a tutor."}
+
+
+def _turn(i, tool_result_chars=0):
+    messages = [{"role": "user", "content": f"question {i} " + "q" * 40}]
+    if tool_result_chars:
+        call_id = f"call_{i}"
+        messages += [
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{"id": call_id, "type": "function",
+                                "function": {"name": "rag_search", "arguments": "{}"}}],
+            },
+            {"role": "tool", "tool_call_id": call_id, "content": "r" * tool_result_chars},
+        ]
+    messages.append({"role": "assistant", "content": f"answer {i} " + "a" * 40})
+    return messages
+
+
+def _conversation(turns, tool_result_chars=0):
+    messages = [SYSTEM]
+    for i in range(turns):
+        messages += _turn(i, tool_result_chars)
+    return messages
+
+
+def test_split_turns_starts_each_turn_at_user():
+    turns = split_turns(_conversation(3, tool_result_chars=10)[1:])
+
+    assert len(turns) == 3
+    assert all(turn[0]["role"] == "user" for turn in turns)
+
+
+def test_within_budget_is_unchanged():
+    messages = _conversation(5)
+
+    assert compact_history(messages, budget=100_000, keep_recent_turns=3) == messages
+
+
+def test_old_tool_results_are_collapsed():
+    messages = _conversation(5, tool_result_chars=2000)
+
+    compacted = compact_history(messages, budget=100_000, keep_recent_turns=2)
+
+    tool_messages = [m for m in compacted if m["role"] == "tool"]
+    assert [len(m["content"]) < 2000 for m in tool_messages] == [True, True, True, False, False]
+    # tool_call_id 짝은 유지
+    assert [m["tool_call_id"] for m in tool_messages] == [f"call_{i}" for i in range(5)]
+
+
+def test_over_budget_summarizes_oldest_turns_and_keeps_recent():
+    messages = _conversation(20, tool_result_chars=300)
+    budget = 400
+
+    compacted = compact_history(messages, budget=budget, keep_recent_turns=2, summary_max_tokens=150)
+
+    assert compacted[0] == SYSTEM
+    assert compacted[1]["role"] == "system" and compacted[1]["content"].startswith(SUMMARY_HEADER)
+    assert count_messages_tokens(compacted) <= budget
+    # 최근 2턴은 그대로 (현재 턴의 Tool 결과 포함)
+    assert compacted[-len(_turn(19, 300)):] == _turn(19, 300)
+    assert [m["content"] for m in compacted if m["role"] == "user"][-2:] == [
+        _turn(18)[0]["content"], _turn(19)[0]["content"],
+    ]
+
+
+def test_summary_respects_its_token_cap():
+    messages = _conversation(40)
+
+    compacted = compact_history(messages, budget=200, keep_recent_turns=1, summary_max_tokens=60)
+
+    summary = compacted[1]["content"]
+    assert count_messages_tokens([{"role": "system", "content": summary}]) <= 60 + 4
+    # 오래된 줄부터 제거되므로 유지된 턴 바로 앞 턴의 요약은 남음
+    first_kept = int(compacted[2]["content"].split()[1])
+    assert f"question {first_kept - 1} " in summary and "question 0 " not in summary
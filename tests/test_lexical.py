@@ -0,0 +1,92 @@
+"""BM25Index: 토큰화, 검색 순위 / coverage, 교체 / 삭제, 저장 후 다른 인스턴스에서 조회"""
+import os
+import pytest
+from app.rag.lexical import BM25Index, tokenize
+
+
+def test_tokenize_english_words_and_digits():
+    assert tokenize("TCP 3-way Handshake, Belady's anomaly") == [
+        "tcp", "3", "way", "handshake", "belady", "anomaly",
+    ]
+
+
+def test_tokenize_korean_bigrams():
+    assert tokenize("핸드셰이크") == ["핸드", "드셰", "셰이", "이크"]
+    assert tokenize("큐") == ["큐"]
+    # 조사가 붙어도 어간 bigram은 같음
+    assert set(tokenize("스케줄링")) <= set(tokenize("스케줄링은"))
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = BM25Index(str(tmp_path / "bm25.json"))
+    index.add(
+        ["a", "b", "c"],
+        [
+            "TCP 3-way handshake opens a connection",
+            "UDP has no handshake and no connection",
+            "페이지 교체 알고리즘: LRU와 Belady 이상 현상",
+        ],
+        [{"source": "net.pdf"}, {"source": "net.pdf"}, {"source": "os.pdf"}],
+    )
+    return index
+
+
+def test_search_ranks_by_term_match(index):
+    results = index.search("tcp handshake", top_k=3)
+
+    assert [r["id"] for r in results] == ["a", "b"]
+    assert results[0]["coverage"] == 1.0
+    assert results[1]["coverage"] == 0.5
+    assert results[0]["metadata"] == {"source": "net.pdf"}
+
+
+def test_search_korean_with_particles(index):
+    results = index.search("페이지 교체는")
+
+    assert results[0]["id"] == "c"
+
+
+def test_search_without_matching_terms(index):
+    assert index.search("quantum") == []
+    assert index.search("!!!") == []
+
+
+def test_add_replaces_and_remove_deletes(index):
+    index.add(["a"], ["quantum computing"], [{"source": "new.pdf"}])
+    index.remove(["b"])
+
+    assert [r["id"] for r in index.search("handshake")] == []
+    assert index.search("quantum")[0]["metadata"] == {"source": "new.pdf"}
+    assert len(index) == 2
+
+
+def test_update_metadata_keeps_content(index):
+    index.update_metadata(["a"], [{"source": "renamed.pdf"}])
+
+    result = index.search("tcp")[0]
+    assert result["metadata"] == {"source": "renamed.pdf"}
+    assert result["content"].startswith("TCP")
+
+
+def test_saved_index_is_visible_to_other_instance(index):
+    index.save()
+
+    other = BM25Index(index.path)
+
+    assert len(other) == 3
+    assert other.search("handshake")[0]["id"] == "a"
+
+
+def test_same_size_save_within_one_mtime_tick_is_visible(index):
+    index.save()
+    other = BM25Index(index.path)
+    before = os.stat(index.path)
+
+    # 크기가 같은 변경을 저장하고 mtime을 되돌려 타임스탬프 해상도가 낮은 파일 시스템을 재현
+    index.update_metadata(["c"], [{"source": "xx.pdf"}])
+    index.save()
+    os.utime(index.path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert os.stat(index.path).st_size == before.st_size
+
+    assert other.search("페이지")[0]["metadata"] == {"source": "xx.pdf"}
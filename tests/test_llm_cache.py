@@ -0,0 +1,76 @@
+"""LLMResponseCache: 저장 / 조회, TTL, LRU 제거, 실패한 쓰기의 ROLLBACK"""
+import time
+import pytest
+from app.llm_cache import LLMResponseCache, request_key
+
+RESPONSE = {"id": "chatcmpl-1", "choices": [{"message": {"role": "assistant", "content": "안녕하세요"}}]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"), ttl_seconds=0, max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_request_key_ignores_dict_order_and_stream_args():
+    a = request_key({"model": "m", "messages": [{"role": "user", "content": "hi"}], "stream": True})
+    b = request_key({"messages": [{"content": "hi", "role": "user"}], "model": "m"})
+
+    assert a == b
+    assert a != request_key({"model": "other", "messages": [{"role": "user", "content": "hi"}]})
+
+
+def test_round_trip(cache):
+    assert cache.get("k") is None
+
+    cache.put("k", RESPONSE)
+
+    assert cache.get("k") == RESPONSE
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_round_trip_survives_reopen(cache):
+    cache.put("k", RESPONSE)
+
+    reopened = LLMResponseCache(path=cache.path, ttl_seconds=0)
+    try:
+        assert reopened.get("k") == RESPONSE
+    finally:
+        reopened.close()
+
+
+def test_expired_entry_is_removed(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"), ttl_seconds=0.01)
+    cache.put("k", RESPONSE)
+    time.sleep(0.02)
+
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_least_recently_used_is_evicted(cache):
+    for key in ("a", "b", "c"):
+        cache.put(key, RESPONSE)
+        time.sleep(0.01)
+    cache.get("a")
+
+    cache.put("d", RESPONSE)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) for key in ("a", "c", "d"))
+
+
+def test_failed_put_rolls_back(cache):
+    cache.put("a", RESPONSE)
+    # 트랜잭션 안에서 실패 (개수 비교)
+    cache.max_entries = None
+
+    with pytest.raises(TypeError):
+        cache.put("b", RESPONSE)
+
+    cache.max_entries = 3
+    assert cache.get("b") is None
+    cache.put("c", RESPONSE)
+    assert cache.get("c") == RESPONSE
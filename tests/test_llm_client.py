@@ -0,0 +1,90 @@
+"""OpenAILLMRunnable 스트리밍: 중단(취소 / 실패) 시 응답 스트림 정리"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    # OpenAI 클라이언트 생성에 키가 필요 (네트워크 호출은 하지 않음)
+    monkeypatch.setattr("app.settings.OPENAI_API_KEY", "mock")
+    from app import llm_client
+
+    monkeypatch.setattr(llm_client, "_cache_lookup", lambda call_kwargs, bypass_cache=False: (None, None, None))
+    return llm_client
+
+
+class FakeStream:
+    """AsyncStream 대역: 토큰 청크를 천천히 내보내고 close 여부 기록"""
+
+    def __init__(self, tokens, delay=0.0):
+        self.tokens = tokens
+        self.delay = delay
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def __aiter__(self):
+        for token in self.tokens:
+            await asyncio.sleep(self.delay)
+            delta = SimpleNamespace(content=token, tool_calls=None)
+            yield SimpleNamespace(
+                id="chatcmpl-1", usage=None,
+                choices=[SimpleNamespace(delta=delta, finish_reason=None)],
+            )
+
+
+def _use_stream(monkeypatch, llm_client, stream):
+    async def create(**kwargs):
+        return stream
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm_client, "get_async_client", lambda: fake_client)
+
+
+def test_stream_assembles_content_and_closes(llm_client, monkeypatch):
+    stream = FakeStream(["안녕", "하세요"])
+    _use_stream(monkeypatch, llm_client, stream)
+    tokens = []
+
+    message = asyncio.run(
+        llm_client.OpenAILLMRunnable()._astream_openai([], None, tokens.append)
+    )
+
+    assert message.content == "안녕하세요" and tokens == ["안녕", "하세요"]
+    assert stream.closed
+
+
+def test_stream_is_closed_when_cancelled(llm_client, monkeypatch):
+    stream = FakeStream(["a"] * 100, delay=0.01)
+    _use_stream(monkeypatch, llm_client, stream)
+
+    async def cancel_midway():
+        task = asyncio.create_task(
+            llm_client.OpenAILLMRunnable()._astream_openai([], None, lambda token: None)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+
+    assert stream.closed
+
+
+def test_stream_is_closed_when_consumer_fails(llm_client, monkeypatch):
+    stream = FakeStream(["a", "b"])
+    _use_stream(monkeypatch, llm_client, stream)
+
+    def on_token(token):
+        raise RuntimeError("writer gone")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(llm_client.OpenAILLMRunnable()._astream_openai([], None, on_token))
+
+    assert stream.closed
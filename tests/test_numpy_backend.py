@@ -0,0 +1,136 @@
+"""NumpyCollection: 쓰기 / 조회 / 다른 인스턴스(프로세스)와의 동기화"""
+import os
+import numpy as np
+import pytest
+from app.vectordb.numpy_backend import NumpyCollection
+
+
+def _add(collection, ids, vectors, source="a.pdf"):
+    collection.add(
+        ids=ids,
+        embeddings=vectors,
+        documents=[f"doc {doc_id}" for doc_id in ids],
+        metadatas=[{"source": source, "n": i} for i, _ in enumerate(ids)],
+    )
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path)
+
+
+def test_add_query_returns_nearest_first(root):
+    collection = NumpyCollection("c", root=root)
+    _add(collection, ["x", "y", "z"], [[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]])
+
+    result = collection.query([[1, 0, 0]], n_results=2)
+
+    assert result["ids"] == [["x", "z"]]
+    assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+    assert collection.count() == 3
+
+
+def test_duplicate_id_is_rejected(root):
+    collection = NumpyCollection("c", root=root)
+    _add(collection, ["x"], [[1, 0]])
+    with pytest.raises(ValueError):
+        _add(collection, ["x"], [[0, 1]])
+
+
+def test_update_rewrites_only_metadata(root):
+    collection = NumpyCollection("c", root=root)
+    _add(collection, ["x", "y"], [[1, 0], [0, 1]])
+    vectors_path = os.path.join(root, "c", "vectors.npy")
+    vectors_stat = os.stat(vectors_path)
+
+    collection.update(ids=["y"], metadatas=[{"source": "b.pdf"}])
+
+    # 다시 저장했으면 os.replace로 inode가 바뀜
+    assert os.stat(vectors_path).st_ino == vectors_stat.st_ino
+    assert os.stat(vectors_path).st_mtime_ns == vectors_stat.st_mtime_ns
+    assert collection.get(ids=["y"])["metadatas"] == [{"source": "b.pdf"}]
+    assert NumpyCollection("c", root=root).get(where={"source": "b.pdf"})["ids"] == ["y"]
+
+
+def test_delete_by_ids_and_where(root):
+    collection = NumpyCollection("c", root=root)
+    _add(collection, ["x", "y"], [[1, 0], [0, 1]], source="a.pdf")
+    _add(collection, ["z"], [[1, 1]], source="b.pdf")
+
+    collection.delete(ids=["x"])
+    collection.delete(where={"source": {"$eq": "b.pdf"}})
+
+    assert collection.get(include=[])["ids"] == ["y"]
+    assert collection.query([[0, 1]], n_results=5)["ids"] == [["y"]]
+
+
+def test_changes_are_visible_to_another_instance(root):
+    writer = NumpyCollection("c", root=root)
+    reader = NumpyCollection("c", root=root)
+    _add(writer, ["x"], [[1, 0]])
+    assert reader.count() == 1
+
+    _add(writer, ["y"], [[0, 1]])
+    assert reader.query([[0, 1]], n_results=1)["ids"] == [["y"]]
+
+    writer.delete(ids=["x"])
+    assert reader.get(include=[])["ids"] == ["y"]
+
+
+def test_same_size_save_within_one_mtime_tick_is_visible(root):
+    writer = NumpyCollection("c", root=root)
+    reader = NumpyCollection("c", root=root)
+    _add(writer, ["x"], [[1, 0]])
+    assert reader.get(ids=["x"])["metadatas"] == [{"source": "a.pdf", "n": 0}]
+    meta_path = os.path.join(root, "c", "meta.json")
+    before = os.stat(meta_path)
+
+    # 크기가 같은 변경을 저장하고 mtime을 되돌려 타임스탬프 해상도가 낮은 파일 시스템을 재현
+    writer.update(ids=["x"], metadatas=[{"source": "b.pdf", "n": 0}])
+    os.utime(meta_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert os.stat(meta_path).st_size == before.st_size
+
+    assert reader.get(ids=["x"])["metadatas"] == [{"source": "b.pdf", "n": 0}]
+
+
+def test_drop_is_visible_to_another_instance(root):
+    writer = NumpyCollection("c", root=root)
+    reader = NumpyCollection("c", root=root)
+    _add(writer, ["x", "y"], [[1, 0], [0, 1]])
+    assert reader.count() == 2
+
+    writer.drop()
+
+    # 삭제된 문서를 계속 반환하거나, 다음 쓰기에서 되살리지 않아야 함
+    assert reader.count() == 0
+    assert reader.query([[1, 0]], n_results=2)["ids"] == [[]]
+    _add(reader, ["z"], [[1, 1]])
+    assert NumpyCollection("c", root=root).get(include=[])["ids"] == ["z"]
+
+
+def test_deferred_writes_save_once_at_end(root):
+    collection = NumpyCollection("c", root=root)
+    reader = NumpyCollection("c", root=root)
+
+    with collection.deferred_writes():
+        _add(collection, ["x"], [[1, 0]])
+        _add(collection, ["y"], [[0, 1]])
+        collection.update(ids=["x"], metadatas=[{"source": "b.pdf"}])
+        # 블록 안에서는 같은 인스턴스에서만 보이고 파일은 아직 없음
+        assert collection.get(ids=["x", "y"], include=[])["ids"] == ["x", "y"]
+        assert not os.path.exists(os.path.join(root, "c", "meta.json"))
+        assert reader.count() == 0
+
+    assert reader.count() == 2
+    assert reader.get(ids=["x"])["metadatas"] == [{"source": "b.pdf"}]
+
+
+def test_float16_storage_queries_in_float32(root):
+    collection = NumpyCollection("c", root=root, dtype="float16")
+    _add(collection, ["x", "y"], [[1, 0], [0, 1]])
+
+    result = collection.query([[0.2, 1.0]], n_results=1)
+
+    assert result["ids"] == [["y"]]
+    stored = np.load(os.path.join(root, "c", "vectors.npy"))
+    assert stored.dtype == np.float16
@@ -0,0 +1,163 @@
+"""Tool 실행: 실행 시간 예산(협력적 타임아웃), 메트릭 집계, tool_node 동시 실행 / 순서 보존"""
+import asyncio
+import threading
+import time
+import pytest
+from app.metrics import TOOL_CALLS
+from app.tools import registry
+from app.tools.budget import ToolBudget, check_deadline, remaining_seconds
+
+
+def _count(tool, status):
+    return TOOL_CALLS.labels(tool=tool, status=status)._value.get()
+
+
+@pytest.fixture
+def fake_tools(monkeypatch):
+    tools = {}
+    monkeypatch.setattr(registry, "TOOL_EXECUTORS", tools)
+    return tools
+
+
+def test_tool_without_budget_runs_unbounded(fake_tools):
+    fake_tools["t_plain"] = lambda: {"success": True, "result": remaining_seconds("none"), "error": None}
+
+    result = registry.execute_tool("t_plain", {})
+
+    assert result["result"] == "none"
+
+
+def test_expired_budget_stops_tool_at_checkpoint(fake_tools):
+    reached = []
+
+    def slow():
+        time.sleep(0.05)
+        check_deadline()
+        reached.append(True)
+        return {"success": True, "result": "ok", "error": None}
+
+    fake_tools["t_slow"] = slow
+    before = _count("t_slow", "timeout")
+
+    result = registry.execute_tool("t_slow", {}, ToolBudget(0.01))
+
+    assert not result["success"] and "시간 초과" in result["error"]
+    assert reached == []
+    assert _count("t_slow", "timeout") == before + 1
+
+
+def test_abandoned_call_is_not_counted_again(fake_tools):
+    def abandoned():
+        check_deadline()
+        return {"success": True, "result": "ok", "error": None}
+
+    fake_tools["t_abandoned"] = abandoned
+    budget = ToolBudget(10)
+    budget.abandoned = True
+    before = {status: _count("t_abandoned", status) for status in ("success", "error", "timeout")}
+
+    result = registry.execute_tool("t_abandoned", {}, budget)
+
+    assert not result["success"]
+    assert {status: _count("t_abandoned", status) for status in before} == before
+
+
+def test_tool_exception_counts_error(fake_tools):
+    def broken():
+        raise ValueError("boom")
+
+    fake_tools["t_broken"] = broken
+    before = _count("t_broken", "error")
+
+    result = registry.execute_tool("t_broken", {})
+
+    assert "boom" in result["error"]
+    assert _count("t_broken", "error") == before + 1
+
+
+# tool_node (langgraph 필요)
+
+@pytest.fixture
+def nodes(monkeypatch):
+    pytest.importorskip("langgraph")
+    # OpenAI 클라이언트 생성에 키가 필요 (LLM은 호출하지 않음)
+    monkeypatch.setattr("app.settings.OPENAI_API_KEY", "mock")
+    from app.graph import nodes
+
+    monkeypatch.setattr(nodes, "TOOL_TIMEOUT_GRACE_SECONDS", 0.05)
+    return nodes
+
+
+def _tool_calls(*names):
+    from langchain_core.messages import AIMessage
+
+    calls = [{"name": name, "args": {}, "id": f"call_{i}"} for i, name in enumerate(names)]
+    return {"messages": [AIMessage(content="", tool_calls=calls)]}
+
+
+def test_tool_node_runs_concurrently_in_order(nodes, monkeypatch):
+    barrier = threading.Barrier(2, timeout=2)
+
+    def run_tool(tool_name, tool_args, budget=None):
+        # 두 호출이 동시에 실행되지 않으면 barrier에서 타임아웃
+        barrier.wait()
+        if tool_name == "first":
+            time.sleep(0.05)
+        return {"result": tool_name, "error": None}
+
+    monkeypatch.setattr(nodes, "run_tool", run_tool)
+
+    result = asyncio.run(nodes.tool_node(_tool_calls("first", "second")))
+
+    assert [m.content for m in result["messages"]] == ["first", "second"]
+    assert [m.tool_call_id for m in result["messages"]] == ["call_0", "call_1"]
+
+
+def test_tool_node_abandons_unresponsive_tool(nodes, monkeypatch):
+    release = threading.Event()
+    budgets = []
+
+    def run_tool(tool_name, tool_args, budget=None):
+        budgets.append(budget)
+        release.wait(2)
+        return {"result": "late", "error": None}
+
+    monkeypatch.setattr(nodes, "run_tool", run_tool)
+    monkeypatch.setitem(nodes.TOOL_TIMEOUTS, "t_hung", 0.05)
+    before = _count("t_hung", "timeout")
+
+    result = asyncio.run(nodes.tool_node(_tool_calls("t_hung")))
+    release.set()
+
+    assert "timed out" in result["messages"][0].content
+    assert budgets[0].abandoned
+    assert _count("t_hung", "timeout") == before + 1
+
+
+def test_tool_node_counts_unexpected_failure(nodes, monkeypatch):
+    def run_tool(tool_name, tool_args, budget=None):
+        raise RuntimeError("executor broken")
+
+    monkeypatch.setattr(nodes, "run_tool", run_tool)
+    before = _count("t_fail", "error")
+
+    result = asyncio.run(nodes.tool_node(_tool_calls("t_fail")))
+
+    assert "executor broken" in result["messages"][0].content
+    assert _count("t_fail", "error") == before + 1
+
+
+def test_tool_slots_work_across_event_loops(nodes, monkeypatch):
+    # 슬롯 1개로 경합시켜 Semaphore가 루프에 묶이게 한 뒤 다른 루프에서 다시 실행
+    monkeypatch.setattr(nodes, "TOOL_MAX_WORKERS", 1)
+    monkeypatch.setattr(nodes, "_tool_slots", nodes.LoopLocal(lambda: asyncio.Semaphore(nodes.TOOL_MAX_WORKERS)))
+
+    def run_tool(tool_name, tool_args, budget=None):
+        time.sleep(0.01)
+        return {"result": tool_name, "error": None}
+
+    monkeypatch.setattr(nodes, "run_tool", run_tool)
+
+    for _ in range(2):
+        result = asyncio.run(nodes.tool_node(_tool_calls("a", "b", "c")))
+        assert [m.content for m in result["messages"]] == ["a", "b", "c"]